@@ -0,0 +1,43 @@
+from botocore.config import Config
+
+# Named botocore client configurations, chosen per call to match how a client will be used
+# Info on the options: https://botocore.amazonaws.com/v1/documentation/api/latest/reference/config.html
+CLIENT_CONFIG_PROFILES: dict[str, Config] = {
+    # One request at a time with a person waiting on it - fail fast rather than retrying for minutes
+    "interactive": Config(
+        max_pool_connections=10,
+        retries={"mode": "standard", "max_attempts": 3},
+        connect_timeout=5,
+        read_timeout=30,
+        tcp_keepalive=True,
+    ),
+    # Many segments scanning at once - enough connections for every segment, and adaptive retries
+    # so the client backs off by itself when the table is throttled
+    "parallel-scan": Config(
+        max_pool_connections=64,
+        retries={"mode": "adaptive", "max_attempts": 10},
+        connect_timeout=10,
+        read_timeout=60,
+        tcp_keepalive=True,
+    ),
+    # Many batch writes in flight from a thread pool - as above, with shorter reads as writes return quickly
+    "bulk-write": Config(
+        max_pool_connections=64,
+        retries={"mode": "adaptive", "max_attempts": 10},
+        connect_timeout=10,
+        read_timeout=30,
+        tcp_keepalive=True,
+    ),
+}
+
+
+def client_config(profile: str | None) -> Config | None:
+    """
+    :param profile: A name from CLIENT_CONFIG_PROFILES, or None for botocore's defaults
+    :return: The botocore Config to create the client with
+    """
+    if profile is None:
+        return None
+    if profile not in CLIENT_CONFIG_PROFILES:
+        raise ValueError(f"Unknown client config profile {profile} - valid profiles are {list(CLIENT_CONFIG_PROFILES)}")
+    return CLIENT_CONFIG_PROFILES[profile]
@@ -1,19 +1,52 @@
 import subprocess
+import threading
 import boto3
 import botocore.exceptions
 from boto3 import Session
 from boto3.resources.base import ServiceResource
-from typing import Any
+from typing import Any, Callable
 
+from aws.authentication.client_config import client_config
 from enums.enums import Stage
 
+# Sessions and services are created (and credentials checked) once per stage, then reused for the whole process
+_cache_lock = threading.RLock()
+_sessions: dict[str, Session] = {}
+_services: dict[tuple[str, str, str | None], Any] = {}
+# Caches built on top of these services (e.g. checked DynamoDB tables), cleared along with them
+_dependent_cache_clears: list[Callable[[], None]] = []
+
+
+def _stage_profile(stage: Stage | str) -> str:
+    return stage.value.lower() if isinstance(stage, Stage) else stage.lower()
+
+
+def register_cache_clear(clear: Callable[[], None]):
+    """
+    :param clear: Called by clear_aws_cache, for a cache holding objects made from the cached services
+    """
+    with _cache_lock:
+        _dependent_cache_clears.append(clear)
+
+
+def clear_aws_cache():
+    """Forget every cached session and service, e.g. after logging in again with different credentials"""
+    with _cache_lock:
+        _sessions.clear()
+        _services.clear()
+        for clear in _dependent_cache_clears:
+            clear()
+
 
 def get_session_for_stage(stage: Stage | str) -> Session:
-    if isinstance(stage, Stage):
-        stage_profile = stage.value.lower()
-    else:
-        stage_profile = stage.lower()
+    stage_profile = _stage_profile(stage)
+    with _cache_lock:
+        if stage_profile not in _sessions:
+            _sessions[stage_profile] = _create_validated_session(stage_profile)
+        return _sessions[stage_profile]
 
+
+def _create_validated_session(stage_profile: str) -> Session:
     # Get and validate credentials
     while True:
         try:
@@ -49,25 +82,33 @@ def get_session_for_stage(stage: Stage | str) -> Session:
     return session
 
 
-def generate_aws_service(service_name: str, stage: Stage) -> Any:
+def generate_aws_service(service_name: str, stage: Stage, config_profile: str | None = None) -> Any:
     """
     :param service_name: The name of the service to get, e.g. "dynamodb"
     :param stage: The stage to get credentials for
+    :param config_profile: A client config from CLIENT_CONFIG_PROFILES, e.g. "parallel-scan" - botocore's defaults if None
     :return: The service object
     """
-    session: Session = get_session_for_stage(stage)
     service_name = service_name.lower().strip()
 
     # Info on resources: https://boto3.amazonaws.com/v1/documentation/api/latest/guide/resources.html
     # Info on clients: https://boto3.amazonaws.com/v1/documentation/api/latest/guide/clients.html
     valid_resources = ["dynamodb"]
     valid_clients = ["ssm", "rds", "es", "opensearch"]
-    if service_name in valid_resources:
-        service: ServiceResource = session.resource(service_name) # type: ignore
-    elif service_name in valid_clients:
-        service: ServiceResource = session.client(service_name) # type: ignore
-    else:
+    if service_name not in valid_resources + valid_clients:
         raise ValueError(f"Valid service names are {valid_resources + valid_clients}")
+
+    config = client_config(config_profile)
+    cache_key = (_stage_profile(stage), service_name, config_profile)
+    with _cache_lock:
+        if cache_key in _services:
+            return _services[cache_key]
+        session: Session = get_session_for_stage(stage)
+        if service_name in valid_resources:
+            service: ServiceResource = session.resource(service_name, config=config) # type: ignore
+        else:
+            service: ServiceResource = session.client(service_name, config=config) # type: ignore
+        _services[cache_key] = service
     return service
 
 
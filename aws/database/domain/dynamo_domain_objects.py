@@ -6,9 +6,10 @@ from aws.utils.safe_object_from_dict import safe_object_from_dict
 
 T = TypeVar("T")
 
+# Slotted dataclasses have no per-instance __dict__, which matters when a whole table export is loaded
 
 # --- Tenure Table ---
-@dataclass
+@dataclass(slots=True)
 class TenuredAsset:
     id: str
     fullAddress: str | None
@@ -21,7 +22,7 @@ class TenuredAsset:
         return safe_object_from_dict(cls, data)
 
 
-@dataclass
+@dataclass(slots=True)
 class HouseholdMember:
     id: str
     fullName: str | None
@@ -34,7 +35,7 @@ class HouseholdMember:
     def from_data(cls, data: dict | T):
         return safe_object_from_dict(cls, data)
 
-@dataclass
+@dataclass(slots=True)
 class Tenure:
     id: str
     charges: dict | None
@@ -77,7 +78,7 @@ class Tenure:
 
 
 # --- Person Table ---
-@dataclass
+@dataclass(slots=True)
 class PersonTenure:
     id: str
     assetId: str | None
@@ -94,7 +95,7 @@ class PersonTenure:
         return safe_object_from_dict(cls, data)
 
 
-@dataclass
+@dataclass(slots=True)
 class Person:
     id: str
     title: str | None
@@ -119,7 +120,7 @@ class Person:
 
 
 # --- Asset Table ---
-@dataclass
+@dataclass(slots=True)
 class ResponsibleEntityContactDetails:
     emailAddress: str | None
 
@@ -128,7 +129,7 @@ class ResponsibleEntityContactDetails:
         return safe_object_from_dict(cls, data)
 
 
-@dataclass
+@dataclass(slots=True)
 class ResponsibleEntity:
     id: str
     name: str | None
@@ -143,7 +144,7 @@ class ResponsibleEntity:
         return safe_object_from_dict(cls, data)
 
 
-@dataclass
+@dataclass(slots=True)
 class Patch:
     id: str
     domain: str | None
@@ -163,7 +164,7 @@ class Patch:
         return safe_object_from_dict(cls, data)
 
 
-@dataclass
+@dataclass(slots=True)
 class AssetTenure:
     id: str | None
     startOfTenureDate: str | None
@@ -176,7 +177,7 @@ class AssetTenure:
         return safe_object_from_dict(cls, data)
 
 
-@dataclass
+@dataclass(slots=True)
 class AssetAddress:
     addressLine1: str | None
     addressLine2: str | None
@@ -191,22 +192,7 @@ class AssetAddress:
         return safe_object_from_dict(cls, data)
 
 
-@dataclass
-class AssetAddress:
-    addressLine1: str | None
-    addressLine2: str | None
-    addressLine3: str | None
-    addressLine4: str | None
-    postCode: str | None
-    postPreamble: str | None
-    uprn: str | None
-
-    @classmethod
-    def from_data(cls, data: dict | T):
-        return safe_object_from_dict(cls, data)
-
-
-@dataclass
+@dataclass(slots=True)
 class Asset:
     id: str
     assetId: str | None
@@ -0,0 +1,264 @@
+"""
+Lazy views over raw DynamoDB items
+
+A view wraps the item dict as it came from boto3 or an export and reads attributes from it on access,
+with the same attribute names and types as the dataclasses in dynamo_domain_objects.
+Nested maps and lists of maps are only wrapped in views when first accessed, and every view shares the
+underlying dicts - setting an attribute changes the raw item, and .raw can be written straight back to DynamoDB.
+"""
+
+from typing import Any, Generic, TypeVar
+
+from aws.database.domain import dynamo_domain_objects
+
+V = TypeVar("V", bound="ItemView")
+
+
+class Field:
+    """An attribute read from and written to the raw item"""
+
+    def __set_name__(self, owner: type, name: str):
+        self.name = name
+
+    def __get__(self, view: "ItemView | None", owner: type | None = None) -> Any:
+        if view is None:
+            return self
+        return view.raw.get(self.name)
+
+    def __set__(self, view: "ItemView", value: Any):
+        view.raw[self.name] = value
+
+
+class NestedField(Field, Generic[V]):
+    """A map attribute, wrapped in a view the first time it's read"""
+
+    def __init__(self, view_type: type[V]):
+        self.view_type = view_type
+
+    def _build(self, value: Any) -> Any:
+        return self.view_type(value)
+
+    def __get__(self, view: "ItemView | None", owner: type | None = None) -> Any:
+        if view is None:
+            return self
+        if view._views is None:
+            view._views = {}
+        elif self.name in view._views:
+            return view._views[self.name]
+        value = view.raw.get(self.name)
+        nested = None if value is None else self._build(value)
+        view._views[self.name] = nested
+        return nested
+
+    def __set__(self, view: "ItemView", value: Any):
+        if view._views is not None:
+            view._views.pop(self.name, None)
+        view.raw[self.name] = _unwrap(value)
+
+
+class NestedListField(NestedField[V]):
+    """
+    A list of maps, wrapped in views the first time it's read - missing lists read as []
+    The views can be changed in place, but items added to or removed from the returned list aren't saved
+    - set the attribute to a new list to do that
+    """
+
+    def _build(self, value: Any) -> Any:
+        return [self.view_type(element) for element in value]
+
+    def __get__(self, view: "ItemView | None", owner: type | None = None) -> Any:
+        nested = super().__get__(view, owner)
+        if view is not None and nested is None:
+            return []
+        return nested
+
+
+def _unwrap(value: Any) -> Any:
+    if isinstance(value, ItemView):
+        return value.raw
+    if isinstance(value, list):
+        return [_unwrap(element) for element in value]
+    return value
+
+
+class ItemView:
+    __slots__ = ("raw", "_views")
+    DOMAIN_TYPE: type | None = None
+
+    def __init__(self, raw: dict):
+        """
+        :param raw: The item to wrap - it isn't copied, so changes through the view change it
+        """
+        self.raw = raw
+        self._views: dict[str, Any] | None = None
+
+    @classmethod
+    def from_data(cls: type[V], data: "dict | V | None") -> "V | None":
+        if data is None or isinstance(data, cls):
+            return data
+        return cls(data)
+
+    def to_object(self) -> Any:
+        """Build the matching dynamo_domain_objects dataclass, converting everything eagerly"""
+        return self.DOMAIN_TYPE.from_data(self.raw)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, ItemView):
+            return self.raw == other.raw
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.raw!r})"
+
+
+# --- Tenure Table ---
+class TenuredAssetView(ItemView):
+    __slots__ = ()
+    DOMAIN_TYPE = dynamo_domain_objects.TenuredAsset
+    id: str = Field()
+    fullAddress: str | None = Field()
+    propertyReference: str | None = Field()
+    uprn: str | None = Field()
+    type: str | None = Field()
+
+
+class HouseholdMemberView(ItemView):
+    __slots__ = ()
+    DOMAIN_TYPE = dynamo_domain_objects.HouseholdMember
+    id: str = Field()
+    fullName: str | None = Field()
+    dateOfBirth: str | None = Field()
+    isResponsible: bool | None = Field()
+    personTenureType: str | None = Field()
+    type: str | None = Field()
+
+
+class TenureView(ItemView):
+    __slots__ = ()
+    DOMAIN_TYPE = dynamo_domain_objects.Tenure
+    id: str = Field()
+    charges: dict | None = Field()
+    endOfTenureDate: str | None = Field()
+    evictionDate: str | None = Field()
+    householdMembers: list[HouseholdMemberView] = NestedListField(HouseholdMemberView)
+    informHousingBenefitsForChanges: bool | None = Field()
+    isMutalExchange: bool | None = Field()
+    isSublet: bool | None = Field()
+    legacyReferences: list[dict] = Field()
+    notices: list[dict] = Field()
+    paymentReference: str | None = Field()
+    potentialEndDate: str | None = Field()
+    startOfTenureDate: str | None = Field()
+    subletEndDate: str | None = Field()
+    successionDate: str | None = Field()
+    tenuredAsset: TenuredAssetView | None = NestedField(TenuredAssetView)
+    tenureType: dict | None = Field()
+    terminated: dict | None = Field()
+
+
+# --- END Tenure Table ---
+
+
+# --- Person Table ---
+class PersonTenureView(ItemView):
+    __slots__ = ()
+    DOMAIN_TYPE = dynamo_domain_objects.PersonTenure
+    id: str = Field()
+    assetId: str | None = Field()
+    propertyReference: str | None = Field()
+    uprn: str | None = Field()
+    assetFullAddress: str | None = Field()
+    paymentReference: str | None = Field()
+    startDate: str | None = Field()
+    endDate: str | None = Field()
+    type: str | None = Field()
+
+
+class PersonView(ItemView):
+    __slots__ = ()
+    DOMAIN_TYPE = dynamo_domain_objects.Person
+    id: str = Field()
+    title: str | None = Field()
+    firstName: str | None = Field()
+    middleName: str | None = Field()
+    surname: str | None = Field()
+    dateOfBirth: str | None = Field()
+    personTypes: list[str] = Field()
+    tenures: list[PersonTenureView] = NestedListField(PersonTenureView)
+
+
+# --- END Person Table ---
+
+
+# --- Asset Table ---
+class ResponsibleEntityContactDetailsView(ItemView):
+    __slots__ = ()
+    DOMAIN_TYPE = dynamo_domain_objects.ResponsibleEntityContactDetails
+    emailAddress: str | None = Field()
+
+
+class ResponsibleEntityView(ItemView):
+    __slots__ = ()
+    DOMAIN_TYPE = dynamo_domain_objects.ResponsibleEntity
+    id: str = Field()
+    name: str | None = Field()
+    responsibleType: str | None = Field()
+    contactDetails: ResponsibleEntityContactDetailsView | None = NestedField(ResponsibleEntityContactDetailsView)
+
+
+class PatchView(ItemView):
+    __slots__ = ()
+    DOMAIN_TYPE = dynamo_domain_objects.Patch
+    id: str = Field()
+    domain: str | None = Field()
+    name: str | None = Field()
+    parentId: str | None = Field()
+    patchType: str | None = Field()
+    responsibleEntities: list[ResponsibleEntityView] = NestedListField(ResponsibleEntityView)
+    versionNumber: int | None = Field()
+
+
+class AssetTenureView(ItemView):
+    __slots__ = ()
+    DOMAIN_TYPE = dynamo_domain_objects.AssetTenure
+    id: str | None = Field()
+    startOfTenureDate: str | None = Field()
+    paymentReference: str | None = Field()
+    type: str | None = Field()
+    endOfTenureDate: str | None = Field()
+
+
+class AssetAddressView(ItemView):
+    __slots__ = ()
+    DOMAIN_TYPE = dynamo_domain_objects.AssetAddress
+    addressLine1: str | None = Field()
+    addressLine2: str | None = Field()
+    addressLine3: str | None = Field()
+    addressLine4: str | None = Field()
+    postCode: str | None = Field()
+    postPreamble: str | None = Field()
+    uprn: str | None = Field()
+
+
+class AssetView(ItemView):
+    __slots__ = ()
+    DOMAIN_TYPE = dynamo_domain_objects.Asset
+    id: str = Field()
+    assetId: str | None = Field()
+    areaId: str | None = Field()
+    patchId: str | None = Field()
+    assetType: str | None = Field()
+    rentGroup: str | None = Field()
+    rootAsset: str | None = Field()
+    isActive: int | None = Field()
+    parentAssetIds: str | None = Field()
+    assetLocation: dict | None = Field()
+    assetAddress: AssetAddressView | None = NestedField(AssetAddressView)
+    assetManagement: dict | None = Field()
+    assetCharacteristics: dict | None = Field()
+    tenure: AssetTenureView | None = NestedField(AssetTenureView)
+    versionNumber: int | None = Field()
+    boilerHouseId: str | None = Field()
+
+
+# --- END Asset Table ---
@@ -0,0 +1,101 @@
+"""
+Clean an item for writing in a single pass, without building intermediate copies
+
+- None values are removed from maps and lists, so DynamoDB doesn't store DynamoDBNull,
+  which the .NET SDK cannot deserialise into Guid? or other nullable types
+- "true" and "false" strings (in any case) become booleans
+- For DynamoDB, floats become Decimals, which boto3 requires
+- For Elasticsearch (or anything else that takes JSON), Decimals become ints or floats
+Dataclasses, such as those in dynamo_domain_objects, and views from dynamo_views can be passed in directly.
+"""
+
+import dataclasses
+from decimal import Decimal
+from functools import cache
+from typing import Any, Callable
+
+from aws.database.domain.dynamo_views import ItemView
+
+_BOOLEAN_STRINGS = {"true": True, "false": False}
+
+
+@cache
+def _field_names(object_type: type) -> tuple[str, ...]:
+    return tuple(field.name for field in dataclasses.fields(object_type))
+
+
+def _sanitiser(decimals: bool) -> Callable[[Any], Any]:
+    """A sanitising function for one target, dispatching on the exact type of each value"""
+
+    def sanitise_str(value: str) -> Any:
+        if len(value) == 4 or len(value) == 5:
+            return _BOOLEAN_STRINGS.get(value.lower(), value)
+        return value
+
+    def sanitise_dict(value: dict) -> dict:
+        return {key: sanitise(element) for key, element in value.items() if element is not None}
+
+    def sanitise_list(value: list | tuple) -> list:
+        return [sanitise(element) for element in value if element is not None]
+
+    def sanitise_set(value: set) -> set:
+        return {sanitise(element) for element in value if element is not None}
+
+    def sanitise_float(value: float) -> Decimal:
+        return Decimal(str(value))
+
+    def sanitise_decimal(value: Decimal) -> int | float:
+        # Infinity and NaN have no integral value, so they go straight to float
+        if value.is_finite() and value == value.to_integral_value():
+            return int(value)
+        return float(value)
+
+    def unchanged(value: Any) -> Any:
+        return value
+
+    handlers: dict[type, Callable[[Any], Any]] = {
+        str: sanitise_str,
+        dict: sanitise_dict,
+        list: sanitise_list,
+        tuple: sanitise_list,
+        set: sanitise_set,
+        bool: unchanged,
+        int: unchanged,
+        float: sanitise_float if decimals else unchanged,
+        Decimal: unchanged if decimals else sanitise_decimal,
+    }
+
+    def sanitise(value: Any) -> Any:
+        handler = handlers.get(type(value))
+        if handler is not None:
+            return handler(value)
+        if isinstance(value, ItemView):
+            return sanitise_dict(value.raw)
+        if dataclasses.is_dataclass(value) and not isinstance(value, type):
+            return {
+                name: sanitise(element) for name in _field_names(type(value))
+                if (element := getattr(value, name)) is not None
+            }
+        return value
+
+    return sanitise
+
+
+_sanitise_for_dynamodb = _sanitiser(decimals=True)
+_sanitise_for_elasticsearch = _sanitiser(decimals=False)
+
+
+def sanitise_for_dynamodb(item: Any) -> dict:
+    """
+    :param item: A dict, dataclass or ItemView - it isn't changed
+    :return: A new dict ready for put_item
+    """
+    return _sanitise_for_dynamodb(item)
+
+
+def sanitise_for_elasticsearch(item: Any) -> dict:
+    """
+    :param item: A dict, dataclass or ItemView - it isn't changed
+    :return: A new dict that can be indexed in Elasticsearch or written with json.dump
+    """
+    return _sanitise_for_elasticsearch(item)
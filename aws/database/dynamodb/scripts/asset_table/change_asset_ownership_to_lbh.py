@@ -1,9 +1,11 @@
+import copy
 from dataclasses import dataclass
 
 from mypy_boto3_dynamodb.service_resource import Table
 
-from aws.database.dynamodb.utils.get_by_secondary_index import get_by_secondary_index
+from aws.database.dynamodb.utils.get_by_secondary_index import get_by_secondary_index_bulk
 from aws.database.dynamodb.utils.get_dynamodb_table import get_dynamodb_table
+from aws.database.dynamodb.utils.partial_update import PartialUpdateWriter
 from aws.utils.csv_to_dict_list import csv_to_dict_list
 from aws.utils.logger import Logger
 from aws.utils.progress_bar import ProgressBar
@@ -26,6 +28,18 @@ def change_asset_ownership_to_lbh(asset_table: Table, assets_from_csv: list[dict
     assets_not_found = []
     assets_changed = []
 
+    # Fetch every asset in the CSV up front with concurrent queries
+    assets_by_prop_ref = get_by_secondary_index_bulk(
+        asset_table, "AssetId", "assetId", [str(csv_asset_item["PropRef"]) for csv_asset_item in assets_from_csv]
+    )
+
+    def log_failed_update(keys: list[dict], success: bool, reason: str):
+        if not success:
+            logger.log(f"Failed to save assets {[key['id'] for key in keys]}: {reason}")
+
+    # Only assetManagement.isCouncilProperty is saved, and only if the asset hasn't changed since it was read
+    writer = PartialUpdateWriter(asset_table, on_update=log_failed_update, key_names=["id"])
+
     for i, csv_asset_item in enumerate(assets_from_csv):
         if i % 100 == 0:
             progress_bar.display(i)
@@ -34,24 +48,25 @@ def change_asset_ownership_to_lbh(asset_table: Table, assets_from_csv: list[dict
         asset_prop_ref = str(csv_asset_item["PropRef"])
 
         # Get asset object, using the AssetId, from DynamoDb
-        db_data_retrieve = get_by_secondary_index(asset_table, "AssetId", "assetId", asset_prop_ref)
+        db_data_retrieve = assets_by_prop_ref[asset_prop_ref]
 
         if (len(db_data_retrieve) > 0):
-            asset_record = db_data_retrieve[0]
+            original_asset_record = db_data_retrieve[0]
+            asset_record = copy.deepcopy(original_asset_record)
 
             # Property assetManagement is NOT present (meaning property isCouncilProperty is also NOT present)
             if ("assetManagement" not in asset_record or asset_record['assetManagement'] is None):
 
                 # Add new assetManagement property to asset, and within assetManagement, set isCouncilProperty to True
                 asset_record['assetManagement'] = {"isCouncilProperty" : True}
-                change_asset_ownership(asset_table, asset_record, assets_changed, logger)
+                change_asset_ownership(writer, original_asset_record, asset_record, assets_changed, logger)
 
             else:
                 # Property assetManagement is present and property isCouncilProperty is NOT present
                 if ('isCouncilProperty' not in asset_record['assetManagement']):
                     # We create isCouncilProperty within assetManagement (without affecting other properties within assetManagement)
                     asset_record["assetManagement"]["isCouncilProperty"] = True
-                    change_asset_ownership(asset_table, asset_record, assets_changed, logger)
+                    change_asset_ownership(writer, original_asset_record, asset_record, assets_changed, logger)
 
                 else:
                     #  Property isCouncilProperty is present and set to True
@@ -63,23 +78,24 @@ def change_asset_ownership_to_lbh(asset_table: Table, assets_from_csv: list[dict
                     elif (asset_record["assetManagement"]["isCouncilProperty"] == False):
                         # Create new/change property isCouncilProperty to True (without affecting other properties within assetManagement)
                         asset_record["assetManagement"]["isCouncilProperty"] = True
-                        change_asset_ownership(asset_table, asset_record, assets_changed, logger)
+                        change_asset_ownership(writer, original_asset_record, asset_record, assets_changed, logger)
 
         else:
             assets_not_found.append(asset_prop_ref)
             logger.log(f'Could not find asset with prop ref {asset_prop_ref}')
 
+    writer.close()
     logger.log("Script execution complete")
     return assets_changed, assets_not_found
 
 
-def change_asset_ownership(asset_table, asset_record, assets_changed, logger):
+def change_asset_ownership(writer: PartialUpdateWriter, original_asset_record, asset_record, assets_changed, logger):
     assets_changed.append(asset_record["assetId"])
-    asset_table.put_item(Item=asset_record)
+    writer.update(original_asset_record, asset_record)
     logger.log(f"Ownership of asset with prop ref {asset_record['assetId']} has been changed to LBH.")
 
 def main():
-    table = get_dynamodb_table(Config.TABLE_NAME, Config.STAGE)
+    table = get_dynamodb_table(Config.TABLE_NAME, Config.STAGE, config_profile="bulk-write")
     _file_path = Config.FILE_PATH
     asset_csv_data = csv_to_dict_list(_file_path)
 
@@ -3,7 +3,7 @@ A script to retrieve assetId and rentGroup from the Assets DynamoDB table
 And export the results to either:
 1)  a CSV file.
 2)  a SQL file for importing into a database.
-The script scans the DynamoDB table, retrieves the specified attributes, and handles pagination if necessary.
+The script scans the DynamoDB table in parallel segments and retrieves the specified attributes.
 """
 
 import boto3
@@ -11,6 +11,8 @@ import csv
 import argparse
 from mypy_boto3_dynamodb.service_resource import Table
 
+from aws.database.dynamodb.utils.parallel_scan import parallel_scan
+
 # File format argument
 fileFormat = "sql"  # argument "csv" for CSV file - or "sql" for SQL file
 
@@ -21,14 +23,8 @@ session = boto3.Session(profile_name=profileName)
 dynamodb = session.resource("dynamodb")
 table: Table = dynamodb.Table("Assets")
 
-# Scan the table for assetId and rentGroup
-response = table.scan(ProjectionExpression="assetId, rentGroup")
-items = response["Items"]
-
-# Handle pagination
-while "LastEvaluatedKey" in response:
-    response = table.scan(ExclusiveStartKey=response["LastEvaluatedKey"])
-    items.extend(response["Items"])
+# Scan the table for assetId and rentGroup in parallel segments (pagination is handled per segment)
+items = list(parallel_scan(table, total_segments=8, ProjectionExpression="assetId, rentGroup"))
 
 # Filter and clean data
 filtered_data = [
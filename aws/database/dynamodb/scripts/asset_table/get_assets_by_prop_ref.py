@@ -4,7 +4,7 @@ from dataclasses import dataclass
 from mypy_boto3_dynamodb.service_resource import Table
 
 from aws.database.domain.dynamo_domain_objects import Asset
-from aws.database.dynamodb.utils.get_by_secondary_index import get_by_secondary_index
+from aws.database.dynamodb.utils.get_by_secondary_index import get_by_secondary_index_bulk
 from aws.database.dynamodb.utils.get_dynamodb_table import get_dynamodb_table
 from aws.utils.csv_to_dict_list import csv_to_dict_list
 from aws.utils.logger import Logger
@@ -43,6 +43,15 @@ def set_id_in_csv_with_asset_id(asset_table: Table, assets_from_csv: list[dict])
     """
     progress_bar = ProgressBar(len(assets_from_csv))
 
+    asset_ids_to_fetch = [
+        clean_asset_id(asset_item["prop_ref"]) for asset_item in assets_from_csv
+        if not (isinstance(asset_item["property_pk"], str) and len(asset_item["property_pk"]) > 0)
+    ]
+    assets_by_asset_id = get_by_secondary_index_bulk(
+        asset_table, "AssetId", "assetId", [asset_id for asset_id in asset_ids_to_fetch if asset_id is not None],
+        projection_expression="id"
+    )
+
     for i, asset_item in enumerate(assets_from_csv):
         if isinstance(asset_item["property_pk"], str) and len(asset_item["property_pk"]) > 0:
             continue
@@ -54,7 +63,7 @@ def set_id_in_csv_with_asset_id(asset_table: Table, assets_from_csv: list[dict])
             if asset_id is None:
                 asset_item["failed_reason"] = f"Invalid assetId: {asset_item['prop_ref']}. "
                 continue
-            results = get_by_secondary_index(asset_table, "AssetId", "assetId", asset_id)
+            results = assets_by_asset_id[asset_id]
             if len(results) > 1:
                 asset_item["failed_reason"] = f"Multiple assets found for assetId {asset_item['prop_ref']}. "
                 continue
@@ -4,6 +4,7 @@ from mypy_boto3_dynamodb.service_resource import Table
 
 from aws.database.dynamodb.utils.get_by_secondary_index import get_by_secondary_index
 from aws.database.dynamodb.utils.get_dynamodb_table import get_dynamodb_table
+from aws.database.dynamodb.utils.offline_index import OfflineIndex, OfflineTable
 from aws.utils.csv_to_dict_list import csv_to_dict_list
 from aws.utils.logger import Logger
 from aws.utils.progress_bar import ProgressBar
@@ -22,6 +23,8 @@ class Config:
     LOGGER = Logger()
     STAGE = Stage.HOUSING_DEVELOPMENT
     FILE_PATH = "aws/src/database/data/input/Asset Ownership List - Compact - All Dwellings.csv"
+    # Set to a directory made by build_offline_index to look up assets in a table export instead of DynamoDB
+    OFFLINE_INDEX_PATH: str | None = None
 
 
 
@@ -29,7 +32,7 @@ class Config:
 # so that after the script has run, the terminal will not close, and you will be able to view
 # the final output (displaying any assets that, for whatever reason, -could not be updated).
 
-def generate_lbh_owned_assets_csv(asset_table: Table, assets_from_csv: list[dict], writer, logger: Logger) -> int:
+def generate_lbh_owned_assets_csv(asset_table: Table | OfflineTable, assets_from_csv: list[dict], writer, logger: Logger) -> int:
     progress_bar = ProgressBar(len(assets_from_csv))
 
     assets_not_found = []
@@ -136,7 +139,10 @@ def add_asset_to_csv (assets_in_csv_file, asset, writer, logger, asset_relations
         # logger.log(f"PropRef {asset['assetId']} of {asset_relationship} is already in the CSV, skipping asset.")
 
 def main():
-    table = get_dynamodb_table(Config.TABLE_NAME, Config.STAGE)
+    if Config.OFFLINE_INDEX_PATH:
+        table = OfflineIndex(Config.OFFLINE_INDEX_PATH).table(Config.TABLE_NAME)
+    else:
+        table = get_dynamodb_table(Config.TABLE_NAME, Config.STAGE)
     _file_path = Config.FILE_PATH
     asset_csv_data = csv_to_dict_list(_file_path)
     load_dotenv()
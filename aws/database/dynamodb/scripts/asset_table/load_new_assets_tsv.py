@@ -1,7 +1,6 @@
 import json
 import os
 import uuid
-from dataclasses import asdict
 from datetime import datetime, timezone
 
 import progress.bar as progress
@@ -11,9 +10,13 @@ from mypy_boto3_ssm import SSMClient
 
 from aws.authentication.generate_aws_resource import get_session_for_stage
 from aws.database.domain.dynamo_domain_objects import Asset, AssetAddress
-from aws.database.dynamodb.utils.get_by_secondary_index import get_by_secondary_index
+from aws.database.domain.sanitise_item import sanitise_for_dynamodb, sanitise_for_elasticsearch
+from aws.database.dynamodb.utils.get_by_secondary_index import (
+    count_by_secondary_index_bulk,
+    get_by_secondary_index_bulk,
+)
 from aws.database.opensearch.client.elasticsearch_client import LocalElasticsearchClient
-from aws.utils.csv_to_dict_list import csv_to_dict_list
+from aws.utils.csv_to_dict_list import iter_csv_rows
 from enums.enums import Stage
 
 STAGE = Stage.HOUSING_PRODUCTION
@@ -58,36 +61,9 @@ def search_asset_by_asset_id(asset_id: str) -> list[dict]:
     return matches
 
 
-def strip_none_values(d: dict) -> dict:
-    """Recursively remove keys with None values so DynamoDB doesn't store DynamoDBNull,
-    which the .NET SDK cannot deserialise into Guid? or other nullable types."""
-    return {
-        k: strip_none_values(v) if isinstance(v, dict) else v
-        for k, v in d.items()
-        if v is not None
-    }
-
-
-def convert_json_str_bool_to_python_bool(d: dict) -> dict:
-    """Recursively replace string 'true' with boolean True, and 'false' with False."""
-    return {
-        k: (
-            convert_json_str_bool_to_python_bool(v)
-            if isinstance(v, dict)
-            else (
-                (True if v.lower() == "true" else False if v.lower() == "false" else v)
-                if isinstance(v, str)
-                else v
-            )
-        )
-        for k, v in d.items()
-    }
-
-
 def create_asset_dynamo(asset: dict) -> bool:
     # 1. Write directly to DynamoDB (id already resolved in generate_assets_json) (strip Nones so they're absent, not DynamoDBNull)
-    stripped_asset = strip_none_values(asset)
-    stripped_asset = convert_json_str_bool_to_python_bool(stripped_asset)
+    stripped_asset = sanitise_for_dynamodb(asset)
     asset_table.put_item(Item=stripped_asset)
 
     # Fetch asset from asset API to verify schema validation
@@ -100,17 +76,28 @@ def create_asset_dynamo(asset: dict) -> bool:
 
     assert fetched_asset["assetId"] == asset["assetId"]
 
-    # 3. Emit AssetCreatedEvent to SNS if needed
-    # Remove existing search results if they exist
-    matching_assets = search_asset_by_asset_id(asset["assetId"])
-    if len(matching_assets) >= 0:  # if any assets found, delete so event re-creates it
-        for match in matching_assets:
-            elasticsearch_client.delete(doc_id=match["id"])
-    emit_asset_created_event(stripped_asset)  # Create in search
-
     return True
 
 
+def recreate_search_results(assets: list[dict]):
+    """
+    Remove any existing search results for the assets, then emit an AssetCreatedEvent for each one
+    so the search listener re-creates them
+    The existing results are still found with one Search API request per asset - only the deletes are batched
+    """
+    with progress.Bar("Finding existing search results", max=len(assets)) as pbar:
+        stale_doc_ids = []
+        for asset in assets:
+            stale_doc_ids.extend(match["id"] for match in search_asset_by_asset_id(asset["assetId"]))
+            pbar.next()
+    elasticsearch_client.bulk_delete(stale_doc_ids)
+
+    with progress.Bar("Emitting asset created events", max=len(assets)) as pbar:
+        for asset in assets:
+            emit_asset_created_event(sanitise_for_elasticsearch(asset))  # Create in search - JSON, so no Decimals
+            pbar.next()
+
+
 def create_sns_message(
     event_type: str,
     user: dict,
@@ -155,26 +142,28 @@ def emit_asset_created_event(asset: dict):
 
 
 def generate_assets_json() -> list[dict]:
-    asset_csv_data = csv_to_dict_list(FILE_PATH, is_tsv=True)
-    asset_csv_data = [row for row in asset_csv_data if row.get("Property Reference")]
+    # Cells are kept as strings, so property references and UPRNs aren't turned into numbers
+    asset_csv_data = [
+        row for row in iter_csv_rows(FILE_PATH, is_tsv=True, decode_json=False) if row.get("Property Reference")
+    ]
 
     # Step 1: Resolve UUIDs — reuse existing IDs if asset already in DynamoDB
+    prop_refs = [str(item["Property Reference"]) for item in asset_csv_data]
+    # Most assets are new, so they are counted first and ids are only read for the ones that already exist
+    asset_counts = count_by_secondary_index_bulk(asset_table, "AssetId", "assetId", prop_refs)
+    for prop_ref, count in asset_counts.items():
+        assert count <= 1, f"Found {count} assets with assetId {prop_ref}"
+    existing_assets_by_prop_ref = get_by_secondary_index_bulk(
+        table=asset_table,
+        index_name="AssetId",
+        secondary_key_name="assetId",
+        secondary_key_values=[prop_ref for prop_ref, count in asset_counts.items() if count == 1],
+        projection_expression="id",
+    )
     asset_id_map: dict[str, str] = {}
-    for item in asset_csv_data:
-        prop_ref = str(item["Property Reference"])
-        existing_assets = get_by_secondary_index(
-            table=asset_table,
-            index_name="AssetId",
-            secondary_key_name="assetId",
-            secondary_key_value=prop_ref,
-        )
-        if existing_assets:
-            assert (
-                len(existing_assets) == 1
-            ), f"Found {len(existing_assets)} assets with assetId {prop_ref}"
-            asset_id_map[prop_ref] = existing_assets[0]["id"]
-        else:
-            asset_id_map[prop_ref] = str(uuid.uuid4())
+    for prop_ref in prop_refs:
+        existing_assets = existing_assets_by_prop_ref.get(prop_ref)
+        asset_id_map[prop_ref] = existing_assets[0]["id"] if existing_assets else str(uuid.uuid4())
 
     def get_floor_number(floor_str: str | None) -> str | None:
         """Parse floor description like '1st floor', 'Gnd floor' into '1', '0'."""
@@ -258,7 +247,8 @@ def generate_assets_json() -> list[dict]:
         for item in asset_csv_data
     ]
 
-    assets_dicts = [asdict(asset) for asset in assets]
+    # None values are left out of the JSON file, as they would be stripped before writing anyway
+    assets_dicts = [sanitise_for_elasticsearch(asset) for asset in assets]
 
     return assets_dicts
 
@@ -297,11 +287,11 @@ def check_assets_created(assets: list[Asset]):
             pbar.next()
 
 
-def create_asset_search_result_from_asset_id(asset_id: str) -> dict:
-    """Fetch an asset from the Asset API by its asset ID (property reference),
-    convert to the asset search result format, and index it in Elasticsearch.
+def get_asset_search_result_from_asset_id(asset_id: str) -> tuple[dict, list[str]]:
+    """Fetch an asset from the Asset API by its asset ID (property reference)
+    and convert it to the asset search result format.
 
-    Returns the Elasticsearch document body that was indexed.
+    Returns the Elasticsearch document body, and the IDs of any existing search results for the asset ID.
     """
     # Fetch asset from Asset API by assetId
     response = requests.get(
@@ -311,14 +301,26 @@ def create_asset_search_result_from_asset_id(asset_id: str) -> dict:
     response.raise_for_status()
     asset = response.json()
 
-    # Remove existing search results for this asset ID if any
+    # Strip None values so Elasticsearch doesn't store nulls unnecessarily
+    stripped_asset = sanitise_for_elasticsearch(asset)
+
+    # Existing search results for this asset ID - one with the same ID is simply overwritten
     matching_assets = search_asset_by_asset_id(asset_id)
-    for match in matching_assets:
-        elasticsearch_client.delete(doc_id=match["id"])
+    stale_doc_ids = [match["id"] for match in matching_assets if match["id"] != stripped_asset["id"]]
+    return stripped_asset, stale_doc_ids
 
-    # Strip None values so Elasticsearch doesn't store nulls unnecessarily
-    stripped_asset = strip_none_values(asset)
-    stripped_asset = convert_json_str_bool_to_python_bool(stripped_asset)
+
+def create_asset_search_result_from_asset_id(asset_id: str) -> dict:
+    """Fetch an asset from the Asset API by its asset ID (property reference),
+    convert to the asset search result format, and index it in Elasticsearch.
+
+    Returns the Elasticsearch document body that was indexed.
+    """
+    stripped_asset, stale_doc_ids = get_asset_search_result_from_asset_id(asset_id)
+
+    # Remove existing search results for this asset ID if any
+    for doc_id in stale_doc_ids:
+        elasticsearch_client.delete(doc_id=doc_id)
 
     # Index the asset into the Elasticsearch assets index
     elasticsearch_client.index(doc_id=stripped_asset["id"], body=stripped_asset)
@@ -327,17 +329,25 @@ def create_asset_search_result_from_asset_id(asset_id: str) -> dict:
 
 
 def create_search_results_for_all_assets():
-    """Fetch all assets from the Asset API and index them in Elasticsearch."""
+    """Fetch all assets from the Asset API and index them in Elasticsearch with bulk requests."""
     with open(ASSETS_LOAD_FILE, "r") as f:
         assets_dicts = json.load(f)
 
+    search_docs, stale_doc_ids = [], []
     with progress.Bar(
-        "Creating search results for assets", max=len(assets_dicts)
+        "Fetching assets for search results", max=len(assets_dicts)
     ) as pbar:
         for asset in assets_dicts:
-            create_asset_search_result_from_asset_id(asset["assetId"])
+            search_doc, asset_stale_doc_ids = get_asset_search_result_from_asset_id(asset["assetId"])
+            search_docs.append(search_doc)
+            stale_doc_ids.extend(asset_stale_doc_ids)
             pbar.next()
 
+    elasticsearch_client.bulk_delete(stale_doc_ids)
+    report = elasticsearch_client.bulk_index(search_docs, parallel=True)
+    for error in report.errors:
+        print(f"Failed to index asset {error['id']}: {error['error']}")
+
 
 def main():
     # 1. Generate JSON from TSV for manual inspection
@@ -350,15 +360,29 @@ def main():
 
     # 2. Load assets into DynamoDB and emit events
     # assets_dicts = assets_dicts[0:1]  # Limit for testing
-    with progress.Bar("Uploading assets", max=len(assets_dicts)) as progress_bar:
-        for asset in assets_dicts:
-            if create_asset_dynamo(asset):
-                with open("assets_loaded.txt", "a") as f:
-                    f.write(f"{asset['assetId']}\n")
-            progress_bar.next()
+    loaded_assets = []
+    try:
+        with progress.Bar("Uploading assets", max=len(assets_dicts)) as progress_bar:
+            for asset in assets_dicts:
+                if create_asset_dynamo(asset):
+                    with open("assets_loaded.txt", "a") as f:
+                        f.write(f"{asset['assetId']}\n")
+                    loaded_assets.append(asset)
+                progress_bar.next()
+    except BaseException:
+        # Assets written before a failure still need their search results, so they aren't left out of search.
+        # Any error from that is printed, so it can't hide the error that stopped the upload
+        if loaded_assets:
+            try:
+                recreate_search_results(loaded_assets)
+            except Exception as e:
+                print(f"Failed to recreate search results for {len(loaded_assets)} loaded assets: {e!r}")
+        raise
+    if loaded_assets:
+        recreate_search_results(loaded_assets)
 
     # 3. Check assets are valid in Asset API and Search API
-    # check_assets_created([Asset(**asset_dict) for asset_dict in assets_dicts])
+    # check_assets_created([Asset.from_data(asset_dict) for asset_dict in assets_dicts])
 
 
 if __name__ == "__main__":
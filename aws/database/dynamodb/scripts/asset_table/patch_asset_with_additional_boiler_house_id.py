@@ -31,7 +31,8 @@ def update_assets_with_additional_data(asset_table: Table, assets_from_csv: list
         asset = get_by_secondary_index(asset_table, "AssetId", "assetId", prop_ref)[0]
 
         # 2. Get assetGuid for boilerHouse
-        boilerHouseGuidPk = get_by_secondary_index(asset_table, "AssetId", "assetId", boiler_house_prop_ref)[0]['id']
+        boilerHouseGuidPk = get_by_secondary_index(
+            asset_table, "AssetId", "assetId", boiler_house_prop_ref, projection_expression="id")[0]['id']
 
         # 3. Add boilerHouseId to asset object
         asset["boilerHouseId"] = boilerHouseGuidPk
@@ -1,9 +1,12 @@
+import copy
 from dataclasses import dataclass
+from typing import Iterable
 
 from mypy_boto3_dynamodb.service_resource import Table
 
 from aws.database.dynamodb.utils.get_dynamodb_table import get_dynamodb_table
-from aws.utils.csv_to_dict_list import csv_to_dict_list
+from aws.database.dynamodb.utils.partial_update import PartialUpdateWriter
+from aws.utils.csv_to_dict_list import count_csv_rows, iter_csv_rows
 from aws.utils.logger import Logger
 from aws.utils.progress_bar import ProgressBar
 from enums.enums import Stage
@@ -30,13 +33,21 @@ def verify_integer(number: str | int | None) -> int:
         return None
 
 
-def update_assets_with_additional_data(asset_table: Table, assets_from_csv: list[dict]) -> int:
+def update_assets_with_additional_data(asset_table: Table, assets_from_csv: Iterable[dict], total: int) -> int:
     """
     update the asset record to have asset charateristics data given from csv
-
+    :param assets_from_csv: The csv rows - read one at a time, so this can be a stream such as iter_csv_rows
+    :param total: Number of rows, for the progress bar
     """
     update_count = 0
-    progress_bar = ProgressBar(len(assets_from_csv))
+    progress_bar = ProgressBar(total)
+
+    def log_failed_update(keys: list[dict], success: bool, reason: str):
+        if not success:
+            Config.LOGGER.log(f"Failed to save assets {[key['id'] for key in keys]}: {reason}")
+
+    # Only the changed attributes of each asset are saved, and only if it hasn't changed since it was read
+    writer = PartialUpdateWriter(asset_table, on_update=log_failed_update, key_names=["id"])
     for i, csv_asset_item in enumerate(assets_from_csv):
         if i % 100 == 0:
             progress_bar.display(i)
@@ -61,8 +72,9 @@ def update_assets_with_additional_data(asset_table: Table, assets_from_csv: list
 
         heating = str(csv_asset_item["heating"])
 
-        dynamo_asset = asset_table.get_item(Key={"id": asset_pk})
-        dynamo_asset = dynamo_asset.get("Item")
+        original_asset = asset_table.get_item(Key={"id": asset_pk})
+        original_asset = original_asset.get("Item")
+        dynamo_asset = copy.deepcopy(original_asset)
 
         if not dynamo_asset.get("assetCharacteristics"):
             print(f"asset charateristic not available for {asset_pk}")
@@ -97,18 +109,20 @@ def update_assets_with_additional_data(asset_table: Table, assets_from_csv: list
         dynamo_asset["assetCharacteristics"].pop("floors", None)
         dynamo_asset["assetCharacteristics"].pop("rentGroup", None)
 
-        asset_table.put_item(Item=dynamo_asset)
+        writer.update(original_asset, dynamo_asset)
         update_count += 1
-    return update_count
+    writer.close()
+    return update_count - writer.failed_count
 
 
 def main():
-    table = get_dynamodb_table(Config.TABLE_NAME, Config.STAGE)
+    table = get_dynamodb_table(Config.TABLE_NAME, Config.STAGE, config_profile="bulk-write")
     _file_path = Config.FILE_PATH
-    asset_csv_data = csv_to_dict_list(_file_path)
+    # Every cell stays a string - verify_integer and Decimal parse the numbers exactly
+    asset_csv_data = iter_csv_rows(_file_path, schema={"prop_ref": "prop_ref"}, decode_json=False)
 
     logger = Config.LOGGER
 
     # Note: Batch write to update the asset data in dynamodb
-    update_count = update_assets_with_additional_data(table, asset_csv_data)
+    update_count = update_assets_with_additional_data(table, asset_csv_data, count_csv_rows(_file_path))
     logger.log(f"Updated {update_count} records")
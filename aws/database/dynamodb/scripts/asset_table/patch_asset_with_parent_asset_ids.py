@@ -1,9 +1,12 @@
+import copy
 from dataclasses import dataclass
 
 from mypy_boto3_dynamodb.service_resource import Table
 
-from aws.database.dynamodb.utils.get_by_secondary_index import get_by_secondary_index
+from aws.database.dynamodb.utils.get_by_secondary_index import get_by_secondary_index_bulk
 from aws.database.dynamodb.utils.get_dynamodb_table import get_dynamodb_table
+from aws.database.dynamodb.utils.offline_index import OfflineIndex, OfflineTable
+from aws.database.dynamodb.utils.partial_update import PartialUpdateWriter
 from aws.utils.csv_to_dict_list import csv_to_dict_list
 from aws.utils.logger import Logger
 from aws.utils.progress_bar import ProgressBar
@@ -15,12 +18,19 @@ class Config:
     LOGGER = Logger()
     STAGE = Stage.HOUSING_DEVELOPMENT
     FILE_PATH = "aws/src/database/data/input/property_table_full.csv"
+    # Set to a directory made by build_offline_index to look up assets in a table export instead of DynamoDB
+    OFFLINE_INDEX_PATH: str | None = None
 
 # IMPORTANT: It is advised to open a specific terminal window prior to running this script,
 # so that after the script has run, the terminal will not close, and you will be able to view
 # the final output (displaying any assets that, for whatever reason, -could not be updated).
 
-def update_assets_with_parents_data(asset_table: Table, assets_from_csv: list[dict], logger: Logger) -> int:
+def update_assets_with_parents_data(asset_table: Table, assets_from_csv: list[dict], logger: Logger,
+                                    lookup_table: Table | OfflineTable | None = None) -> int:
+    """
+    Sets parentAssetIds and assetLocation.parentAssets on each asset in the CSV from its parent's details
+    :param lookup_table: Where to look up the child and parent assets - defaults to asset_table
+    """
     update_count = 0
     progress_bar = ProgressBar(len(assets_from_csv))
 
@@ -29,6 +39,25 @@ def update_assets_with_parents_data(asset_table: Table, assets_from_csv: list[di
     no_asset_found_children = []
     no_asset_found_parents = []
 
+    # Fetch every child and parent asset referenced in the CSV up front with concurrent queries
+    prop_refs_to_fetch = []
+    for csv_asset_item in assets_from_csv:
+        if str(csv_asset_item["parent"]) == "":
+            continue
+        prop_refs_to_fetch.append(str(csv_asset_item["property_number"]))
+        if str(csv_asset_item["parent"]) != "00087086":
+            prop_refs_to_fetch.append(str(csv_asset_item["parent"]))
+    assets_by_prop_ref = get_by_secondary_index_bulk(
+        lookup_table or asset_table, "AssetId", "assetId", prop_refs_to_fetch)
+
+    def log_failed_update(keys: list[dict], success: bool, reason: str):
+        if not success:
+            logger.log(f"Failed to save assets {[key['id'] for key in keys]}: {reason}")
+
+    # Only the parent fields are saved, and only if the asset hasn't changed since it was read
+    # (so a stale offline index can't overwrite newer changes)
+    writer = PartialUpdateWriter(asset_table, on_update=log_failed_update, key_names=["id"])
+
     for i, csv_asset_item in enumerate(assets_from_csv):
         if i % 100 == 0:
             progress_bar.display(i)
@@ -45,11 +74,12 @@ def update_assets_with_parents_data(asset_table: Table, assets_from_csv: list[di
         #     child_asset_prop_ref = child_asset_prop_ref.rjust(8, '0')
 
         # Get asset object, using the AssetId, from DynamoDb
-        data_retrieve_child = get_by_secondary_index(asset_table, "AssetId", "assetId", child_asset_prop_ref)
+        data_retrieve_child = assets_by_prop_ref[child_asset_prop_ref]
 
         if (len(data_retrieve_child) > 0):
              # If we successfully retrieve data, we can access the (child) access object
-            child_asset_record = data_retrieve_child[0]
+            original_child_asset_record = data_retrieve_child[0]
+            child_asset_record = copy.deepcopy(original_child_asset_record)
 
             # Get the parent from the CSV file for the asset
             parent_asset_prop_ref = str(csv_asset_item["parent"])
@@ -65,7 +95,7 @@ def update_assets_with_parents_data(asset_table: Table, assets_from_csv: list[di
                 parent_asset_type = "NA"
             else:
                 # Alternatively, we fetch asset object, using the AssetId, from DynamoDb, for the parent asset
-                data_retrieve_parent = get_by_secondary_index(asset_table, "AssetId", "assetId", parent_asset_prop_ref)
+                data_retrieve_parent = assets_by_prop_ref[parent_asset_prop_ref]
 
                 # If we have results, get the first object and get its GUID, Address Line 1 (name) and its asset type.
                 if (len(data_retrieve_parent) > 0):
@@ -104,13 +134,16 @@ def update_assets_with_parents_data(asset_table: Table, assets_from_csv: list[di
                 ]
 
             # Once we have amended the (child) asset with parent information on both fields, we save the changes
-            asset_table.put_item(Item=child_asset_record)
+            writer.update(original_child_asset_record, child_asset_record)
 
             update_count += 1
         else:
             no_asset_found_children.append(child_asset_prop_ref)
             logger.log(f'Cannot find (child) asset for Asset ID {child_asset_prop_ref}')
 
+    writer.close()
+    update_count -= writer.failed_count
+
     if (len(no_asset_found_children) > 0):
         logger.log("Script completed. The following (child) assets could not be found:")
         for asset_id in no_asset_found_children:
@@ -125,12 +158,15 @@ def update_assets_with_parents_data(asset_table: Table, assets_from_csv: list[di
 
 
 def main():
-    table = get_dynamodb_table(Config.TABLE_NAME, Config.STAGE)
+    table = get_dynamodb_table(Config.TABLE_NAME, Config.STAGE, config_profile="bulk-write")
     _file_path = Config.FILE_PATH
     asset_csv_data = csv_to_dict_list(_file_path)
 
     logger = Config.LOGGER
+    lookup_table = None
+    if Config.OFFLINE_INDEX_PATH:
+        lookup_table = OfflineIndex(Config.OFFLINE_INDEX_PATH).table(Config.TABLE_NAME)
 
     # Note: Batch write to update the asset data in dynamodb
-    update_count = update_assets_with_parents_data(table, asset_csv_data, logger)
+    update_count = update_assets_with_parents_data(table, asset_csv_data, logger, lookup_table)
     logger.log(f"Updated {update_count} records")
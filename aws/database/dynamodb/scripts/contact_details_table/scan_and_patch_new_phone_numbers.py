@@ -1,10 +1,16 @@
+import copy
+import re
 from dataclasses import dataclass
 
+from boto3.dynamodb.conditions import Attr
+
 from aws.database.dynamodb.utils.get_dynamodb_table import get_dynamodb_table
+from aws.database.dynamodb.utils.parallel_scan import ParallelScanner
+from aws.database.dynamodb.utils.partial_update import PartialUpdateWriter
+from aws.database.dynamodb.utils.rate_limiter import CapacityRateLimiter
 from aws.utils.csv_to_dict_list import csv_to_array
 from aws.utils.logger import Logger
 from enums.enums import Stage
-import time
 #
 # IMPORTANT:
 #
@@ -19,11 +25,38 @@ class Config:
     LOGGER = Logger()
     STAGE = Stage.HOUSING_DEVELOPMENT
     FILE_PATH = "aws\src\database\input\\bad_phone_numbers.csv"
+    TOTAL_SEGMENTS = 4
+    CAPACITY_SHARE = 0.5  # Share of the table's read capacity to use
+    # Also filter on the bad numbers in DynamoDB when there are few enough of them (an IN list takes at most 100).
+    # Only numbers stored exactly as in the file, or in normalised form, are returned - set to False to check
+    # every phone number after normalising it instead
+    FILTER_VALUES_IN_DYNAMODB = True
+    MAX_FILTER_VALUES = 100
 
 total_count = 0
 update_count = 0
 
-def process_item(item, bad_phone_numbers, dynamo_table, logger):
+def normalise_phone_number(phone: str) -> str:
+    """Strip formatting so the same number always compares equal, e.g. "+44 (0)20 8356-3000" -> 02083563000"""
+    digits = re.sub(r"\D", "", str(phone))
+    if digits.startswith("440"):
+        digits = digits[2:]
+    elif digits.startswith("44"):
+        digits = "0" + digits[2:]
+    return digits
+
+
+def phone_filter_expression(bad_phone_numbers: list[str]):
+    """Filter the scan to phone contacts, and to the bad numbers themselves when the list is short enough"""
+    filter_expression = Attr("contactInformation.contactType").eq("phone")
+    values = list(dict.fromkeys(
+        bad_phone_numbers + [normalise_phone_number(phone) for phone in bad_phone_numbers]))
+    if Config.FILTER_VALUES_IN_DYNAMODB and len(values) <= Config.MAX_FILTER_VALUES:
+        filter_expression = filter_expression & Attr("contactInformation.value").is_in(values)
+    return filter_expression
+
+
+def process_item(item, bad_phone_numbers: set[str], writer: PartialUpdateWriter, logger):
     global update_count
     partition_key = item['targetId']
     sort_key = item['id']
@@ -35,39 +68,49 @@ def process_item(item, bad_phone_numbers, dynamo_table, logger):
     if item.get('contactInformation').get('contactType') != 'phone':
         return
     phone = item.get('contactInformation').get('value')
-    if phone in bad_phone_numbers:
+    if normalise_phone_number(phone) in bad_phone_numbers:
         logger.log(f"Item {partition_key} / {sort_key} has a bad phone number! Erasing....")
-        item["contactInformation"]["value"] = ''
-        dynamo_table.put_item(Item=item)
+        updated_item = copy.deepcopy(item)
+        updated_item["contactInformation"]["value"] = ''
+        writer.update(item, updated_item)
         update_count += 1
 
-def process_scan(scan_results, bad_phone_numbers, dynamo_table, logger):
+def process_scan(scan_results, bad_phone_numbers: set[str], writer: PartialUpdateWriter, logger):
     global total_count
     global update_count
     for item in scan_results['Items']:
-        process_item(item, bad_phone_numbers, dynamo_table, logger)
+        process_item(item, bad_phone_numbers, writer, logger)
         total_count += 1
     return
 
 def main():
     global total_count
     global update_count
-    dynamo_table = get_dynamodb_table(Config.TABLE_NAME, Config.STAGE)
+    dynamo_table = get_dynamodb_table(Config.TABLE_NAME, Config.STAGE, config_profile="parallel-scan")
     _file_path = Config.FILE_PATH
-    bad_phone_numbers = csv_to_array(_file_path)
+    bad_phone_number_list = [phone for phone in csv_to_array(_file_path) if phone]
+    bad_phone_numbers = {normalise_phone_number(phone) for phone in bad_phone_number_list}
 
     logger = Config.LOGGER
-    scan = dynamo_table.scan()
+    read_limiter = CapacityRateLimiter.for_table(dynamo_table, "read", target_share=Config.CAPACITY_SHARE)
+    # Filtering in DynamoDB doesn't save read capacity, but only matching items are sent back
+    scanner = ParallelScanner(dynamo_table, total_segments=Config.TOTAL_SEGMENTS, logger=logger, limiter=read_limiter,
+                              FilterExpression=phone_filter_expression(bad_phone_number_list),
+                              ProjectionExpression="targetId, id, contactInformation")
 
-    process_scan(scan, bad_phone_numbers, dynamo_table, logger)
+    def log_failed_update(keys: list[dict], success: bool, reason: str):
+        if not success:
+            logger.log(f"Failed to erase phone numbers for {keys}: {reason}")
 
-    while "LastEvaluatedKey" in scan:
-        logger.log(f"Scanned {len(scan)} rows - last key: {scan['LastEvaluatedKey']} total: {total_count} updated: {update_count}")
-        time.sleep(10)
-        scan = dynamo_table.scan(ExclusiveStartKey=scan["LastEvaluatedKey"])
-        process_scan(scan, bad_phone_numbers, dynamo_table, logger)
+    # Only contactInformation.value is written back for each bad number
+    with PartialUpdateWriter(dynamo_table, on_update=log_failed_update, key_names=["targetId", "id"],
+                             version_attribute=None) as writer:
+        for segment, items in scanner.pages():
+            process_scan({"Items": items}, bad_phone_numbers, writer, logger)
+            logger.log(f"Scanned {len(items)} rows in segment {segment} - total: {total_count} updated: {update_count}")
+    update_count -= writer.failed_count
 
     logger.log(f"Operation complete")
     logger.log(f"Records updated: {update_count}")
     logger.log(f"Records rejected: {total_count - update_count}")
-    logger.log(f"Total records: {total_count}")
+    logger.log(f"Total phone records matching the filter: {total_count}")
@@ -1,9 +1,10 @@
 from aws.database.dynamodb.utils.get_dynamodb_table import get_dynamodb_table
+from aws.database.dynamodb.utils.parallel_scan import ParallelScanner
 from enums.enums import Stage
 
 
-def process_scan(table, scan, next_person_ref):
-    for item in scan.get('Items', []):
+def process_items(table, items: list[dict], next_person_ref: int) -> int:
+    for item in items:
         table.update_item(
             Key={'id': item['id']},
             UpdateExpression="SET personRef = :val",
@@ -12,25 +13,22 @@ def process_scan(table, scan, next_person_ref):
         print(f"Assigned personRef {next_person_ref} to id {item['id']}")
         next_person_ref += 1
 
-    return scan.get('LastEvaluatedKey'), next_person_ref
+    return next_person_ref
 
 
 def main():
     table = get_dynamodb_table(
         table_name="Persons",
-        stage=Stage.HOUSING_DEVELOPMENT
+        stage=Stage.HOUSING_DEVELOPMENT,
+        config_profile="parallel-scan"
     )
 
     next_person_ref = 70000000
-    scan = table.scan()
+    # A single segment keeps refs in scan order - with more, pages from different segments arrive interleaved
+    scanner = ParallelScanner(table, total_segments=1, ProjectionExpression="id")
 
-    while True:
-        last_evaluated_key, next_person_ref = process_scan(table, scan, next_person_ref)
-
-        if last_evaluated_key:
-            scan = table.scan(ExclusiveStartKey=last_evaluated_key)
-        else:
-            break
+    for _, items in scanner.pages():
+        next_person_ref = process_items(table, items, next_person_ref)
 
     last_assigned_ref = next_person_ref - 1
     with open('last_person_ref.log', 'w') as f:
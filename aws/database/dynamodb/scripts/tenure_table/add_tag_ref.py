@@ -1,8 +1,11 @@
+import copy
 from dataclasses import dataclass
 
 from mypy_boto3_dynamodb.service_resource import Table
 
+from aws.database.dynamodb.utils.batch_get import batch_get
 from aws.database.dynamodb.utils.get_dynamodb_table import get_dynamodb_table
+from aws.database.dynamodb.utils.partial_update import PartialUpdateWriter
 from aws.utils.csv_to_dict_list import csv_to_dict_list
 from aws.utils.logger import Logger
 from aws.utils.progress_bar import ProgressBar
@@ -22,15 +25,28 @@ def add_tenure_to_tag_ref(tenure_table: Table, tenure_from_csv: list[dict], logg
 
     """
     update_count = 0
+    tenures = batch_get(tenure_table, [{"id": item["id"].strip()} for item in tenure_from_csv], key_names=["id"])
     progress_bar = ProgressBar(len(tenure_from_csv))
+
+    def record_update(keys: list[dict], success: bool, reason: str):
+        # Called one update at a time by the writer - tenures that were already up to date have the reason "No changes"
+        nonlocal update_count
+        if not success:
+            logger.log(f"Failed to save tenure {keys[0]['id']}: {reason}")
+        elif not reason:
+            update_count += 1
+            logger.log(f"Updated {update_count} records")
+
+    # Only legacyReferences is saved, and only if the tenure hasn't changed since it was read
+    writer = PartialUpdateWriter(tenure_table, on_update=record_update, key_names=["id"])
     for i, csv_asset_item in enumerate(tenure_from_csv):
         if i % 100 == 0:
             progress_bar.display(i)
         tenure_pk = csv_asset_item["id"].strip()
         tag_ref = csv_asset_item["tag_ref"].strip()
 
-        dynamo_tenure = tenure_table.get_item(Key={"id": tenure_pk})
-        dynamo_tenure = dynamo_tenure.get("Item")
+        original_tenure = tenures.get(tenure_pk)
+        dynamo_tenure = copy.deepcopy(original_tenure)
         legacy_ref = dynamo_tenure.get("legacyReferences") if dynamo_tenure else None
 
         if dynamo_tenure is None:
@@ -50,14 +66,13 @@ def add_tenure_to_tag_ref(tenure_table: Table, tenure_from_csv: list[dict], logg
                     new_legacy_ref = {"name": "uh_tag_ref", "value": tag_ref if tag_ref else None}
                     legacy_ref.append(new_legacy_ref)
 
-        tenure_table.put_item(Item=dynamo_tenure)
-        update_count += 1
-        logger.log(f"Updated {update_count} records")
+        writer.update(original_tenure, dynamo_tenure)
+    writer.close()
     return update_count
 
 
 def add_missing_tenure_refs():
-    table = get_dynamodb_table(Config.TABLE_NAME, Config.STAGE)
+    table = get_dynamodb_table(Config.TABLE_NAME, Config.STAGE, config_profile="bulk-write")
     _file_path = r"linked_tenures_staging.csv"
     tag_ref_csv_data = csv_to_dict_list(_file_path)
 
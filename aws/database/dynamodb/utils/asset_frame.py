@@ -0,0 +1,220 @@
+"""
+Column oriented view of the Assets table for estate-wide computations
+
+AssetFrame holds the attributes that derived fields are worked out from as NumPy arrays - one entry per asset -
+so a rule such as "active unless the tenure has ended" is a handful of array operations rather than a Python
+loop over 60k+ dicts. Each computation returns the new values; changed_rows then picks out only the assets
+where they differ from what's stored, which are the only ones that need writing.
+"""
+
+import re
+import time
+from typing import Any, Callable, Iterable
+
+import numpy as np
+
+from aws.database.dynamodb.utils.export_reader import read_export
+
+# isActive codes - 0 and 1 are False and True
+IS_ACTIVE_ABSENT = -2  # The item has no isActive attribute
+IS_ACTIVE_NULL = -1  # isActive is null or an empty string
+
+_NO_CATEGORY = -1
+# Dates are parsed from the start of ISO date and datetime strings - anything else is kept as it is
+_ISO_DATE_PREFIX = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}")
+
+
+def _encode_categories(values: list[str | None]) -> tuple[np.ndarray, list[str]]:
+    """Categorical codes for values - the index into the returned categories, or -1 for None"""
+    lookup: dict[str, int] = {}
+    codes = np.fromiter(
+        (_NO_CATEGORY if value is None else lookup.setdefault(value, len(lookup)) for value in values),
+        dtype=np.int32, count=len(values),
+    )
+    return codes, list(lookup)
+
+
+def _to_dates(values: list[Any]) -> tuple[np.ndarray, dict[int, Any]]:
+    """
+    datetime64[D] from ISO date or datetime strings - NaT where missing or unreadable
+    :return: The dates, and the values that are present but couldn't be read (such as "") by row
+    """
+    unparsed: dict[int, Any] = {}
+    day_strings = []
+    for row, value in enumerate(values):
+        if value is None:
+            day_strings.append("NaT")
+        elif isinstance(value, str) and _ISO_DATE_PREFIX.match(value):
+            day_strings.append(value[:10])
+        else:
+            unparsed[row] = value
+            day_strings.append("NaT")
+    try:
+        return np.array(day_strings, dtype="datetime64[D]"), unparsed
+    except ValueError:
+        dates = np.full(len(values), np.datetime64("NaT"), dtype="datetime64[D]")
+        for row, day_string in enumerate(day_strings):
+            try:
+                dates[row] = np.datetime64(day_string, "D")
+            except ValueError:
+                # Starts like a date but isn't one, e.g. 2024-13-45
+                unparsed[row] = values[row]
+        return dates, unparsed
+
+
+def _unparsed_mask(length: int, unparsed: dict[int, Any]) -> np.ndarray:
+    mask = np.zeros(length, dtype=bool)
+    mask[list(unparsed)] = True
+    return mask
+
+
+def is_active_code(asset: dict) -> int:
+    """The isActive column code for an asset - IS_ACTIVE_ABSENT, IS_ACTIVE_NULL, 0 or 1"""
+    if "isActive" not in asset:
+        return IS_ACTIVE_ABSENT
+    value = asset["isActive"]
+    if value is None or value == "":
+        return IS_ACTIVE_NULL
+    return int(bool(value))
+
+
+class AssetFrame:
+    CATEGORICAL_COLUMNS = ("assetType", "rentGroup", "owner")
+
+    def __init__(self, columns: dict[str, np.ndarray], categories: dict[str, list[str]],
+                 items: dict[int, dict] | None = None, unparsed_dates: dict[str, dict[int, Any]] | None = None):
+        """
+        Use from_items or from_export to build a frame
+        :param columns: Column name -> array with one entry per asset
+        :param categories: For categorical columns, the value each code stands for
+        :param items: The kept assets the rows were read from, by row
+        :param unparsed_dates: For date columns, the values that are present but couldn't be read, by row
+        """
+        self.columns = columns
+        self.categories = categories
+        self._items = items
+        self.unparsed_dates = unparsed_dates or {}
+
+    @classmethod
+    def from_items(cls, assets: Iterable[dict],
+                   keep_items: bool | Callable[[dict], bool] = False) -> "AssetFrame":
+        """
+        :param assets: Asset items as plain dicts, e.g. from read_export
+        :param keep_items: Keep the items, so items() can return the changed ones for writing
+            - or a function choosing which items to keep, so the rest aren't held in memory
+        """
+        keep = keep_items if callable(keep_items) else (lambda _: keep_items)
+        items: dict[int, dict] = {}
+        ids, asset_ids, patch_ids, area_ids, tenure_ids = [], [], [], [], []
+        asset_types, rent_groups, owners = [], [], []
+        tenure_starts, tenure_ends = [], []
+        has_root, has_tenure, is_active, versions = [], [], [], []
+
+        for row, asset in enumerate(assets):
+            if keep(asset):
+                items[row] = asset
+            tenure = asset.get("tenure")
+            management = asset.get("assetManagement") or {}
+            ids.append(asset["id"])
+            asset_ids.append(asset.get("assetId") or "")
+            patch_ids.append(asset.get("patchId") or "")
+            area_ids.append(asset.get("areaId") or "")
+            asset_types.append(asset.get("assetType"))
+            rent_groups.append(asset.get("rentGroup") or None)
+            owners.append(management.get("owner") or None)
+            has_root.append(bool(asset.get("rootAsset")))
+            has_tenure.append(tenure is not None)
+            tenure_ids.append((tenure or {}).get("id") or "")
+            tenure_starts.append((tenure or {}).get("startOfTenureDate"))
+            tenure_ends.append((tenure or {}).get("endOfTenureDate"))
+            is_active.append(is_active_code(asset))
+            version = asset.get("versionNumber")
+            versions.append(-1 if version is None else int(version))
+
+        tenure_start_dates, unparsed_starts = _to_dates(tenure_starts)
+        tenure_end_dates, unparsed_ends = _to_dates(tenure_ends)
+        columns = {
+            "id": np.array(ids, dtype=np.str_),
+            "assetId": np.array(asset_ids, dtype=np.str_),
+            "patchId": np.array(patch_ids, dtype=np.str_),
+            "areaId": np.array(area_ids, dtype=np.str_),
+            "tenureId": np.array(tenure_ids, dtype=np.str_),
+            "hasRootAsset": np.array(has_root, dtype=bool),
+            "hasTenure": np.array(has_tenure, dtype=bool),
+            "tenureStart": tenure_start_dates,
+            "tenureEnd": tenure_end_dates,
+            "tenureStartUnparsed": _unparsed_mask(len(ids), unparsed_starts),
+            "tenureEndUnparsed": _unparsed_mask(len(ids), unparsed_ends),
+            "isActive": np.array(is_active, dtype=np.int8),
+            "versionNumber": np.array(versions, dtype=np.int64),
+        }
+        categories = {}
+        for name, values in zip(cls.CATEGORICAL_COLUMNS, [asset_types, rent_groups, owners]):
+            columns[name], categories[name] = _encode_categories(values)
+        unparsed_dates = {"tenureStart": unparsed_starts, "tenureEnd": unparsed_ends}
+        return cls(columns, categories, items if keep_items else None, unparsed_dates)
+
+    @classmethod
+    def from_export(cls, path: str, keep_items: bool | Callable[[dict], bool] = False,
+                    processes: int | None = None) -> "AssetFrame":
+        """Build a frame from an Assets export - a file, .json.gz part or directory of parts"""
+        return cls.from_items(read_export(path, processes=processes), keep_items=keep_items)
+
+    def __len__(self) -> int:
+        return len(self.columns["id"])
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.columns[column]
+
+    def category_mask(self, column: str, *values: str | None) -> np.ndarray:
+        """Rows where a categorical column is any of the values - None matches missing values"""
+        lookup = {category: code for code, category in enumerate(self.categories[column])}
+        codes = [lookup[value] for value in values if value in lookup]
+        if None in values:
+            codes.append(_NO_CATEGORY)
+        return np.isin(self.columns[column], codes)
+
+    def decode(self, column: str, rows: np.ndarray | None = None) -> list[str | None]:
+        """The values of a categorical column, for all rows or the given row indices"""
+        codes = self.columns[column] if rows is None else self.columns[column][rows]
+        categories = self.categories[column]
+        return [None if code == _NO_CATEGORY else categories[code] for code in codes.tolist()]
+
+    def compute_is_active(self, today: np.datetime64 | None = None) -> np.ndarray:
+        """
+        isActive for every asset - False with no tenure, True if the tenure has no end date or ends today or later
+        :param today: The date to compare tenure end dates with - defaults to today
+        """
+        today = np.datetime64(time.strftime("%Y-%m-%d"), "D") if today is None else np.datetime64(today, "D")
+        tenure_end = self.columns["tenureEnd"]
+        # NaT compares as False, so open tenures are never treated as ended
+        ended = tenure_end < today
+        # End dates that are present but unreadable (such as "") are compared as text, as set_is_active always did,
+        # so they count as ended unless they sort after today - anything that isn't a string counts as ended
+        today_text = str(today)
+        for row, value in self.unparsed_dates.get("tenureEnd", {}).items():
+            ended[row] = not isinstance(value, str) or value < today_text
+        return self.columns["hasTenure"] & ~ended
+
+    def changed_rows(self, column: str, new_values: np.ndarray, rows: np.ndarray | None = None) -> np.ndarray:
+        """
+        Indices of the rows where new_values differs from the stored column
+        Missing isActive values (absent or null) always count as changed
+        :param rows: A boolean mask limiting which rows are considered
+        """
+        changed = self.columns[column] != new_values.astype(self.columns[column].dtype)
+        if rows is not None:
+            changed &= rows
+        return np.flatnonzero(changed)
+
+    def ids(self, rows: np.ndarray) -> list[str]:
+        return self.columns["id"][rows].tolist()
+
+    def items(self, rows: np.ndarray) -> list[dict]:
+        """The kept items for the given row indices - the frame must be built with keep_items"""
+        if self._items is None:
+            raise ValueError("Items weren't kept - build the frame with keep_items")
+        missing = [row for row in rows.tolist() if row not in self._items]
+        if missing:
+            raise ValueError(f"Items weren't kept for {len(missing)} of the rows, e.g. {self.ids(missing[:3])}")
+        return [self._items[row] for row in rows.tolist()]
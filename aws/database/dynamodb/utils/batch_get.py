@@ -0,0 +1,105 @@
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable
+
+from mypy_boto3_dynamodb.service_resource import Table
+
+from aws.database.dynamodb.utils.rate_limiter import CapacityRateLimiter, consumed_capacity_units, is_throttling_error
+
+MAX_BATCH_SIZE = 100
+
+
+def _key_value(key: dict, key_names: list[str]) -> Any:
+    """The value results are keyed by - the key itself for single attribute keys, a tuple for composite keys"""
+    if len(key_names) == 1:
+        return key[key_names[0]]
+    return tuple(key[key_name] for key_name in key_names)
+
+
+def _projection_with_keys(projection_expression: str, expression_attribute_names: dict[str, str],
+                          key_names: list[str]) -> tuple[str, dict[str, str]]:
+    """Add the key attributes to a projection so the results can be matched back to their keys"""
+    expression_attribute_names = dict(expression_attribute_names)
+    projected = {expression_attribute_names.get(path.strip(), path.strip())
+                 for path in projection_expression.split(",")}
+    for i, key_name in enumerate(key_names):
+        if key_name not in projected:
+            placeholder = f"#batch_get_key{i}"
+            expression_attribute_names[placeholder] = key_name
+            projection_expression += f", {placeholder}"
+    return projection_expression, expression_attribute_names
+
+
+def batch_get(table: Table, keys: Iterable[dict], projection_expression: str | None = None,
+              expression_attribute_names: dict[str, str] | None = None, max_workers: int = 8,
+              max_retries: int = 8, base_delay: float = 0.05, max_delay: float = 5.0,
+              key_names: list[str] | None = None, limiter: CapacityRateLimiter | None = None) -> dict[Any, dict]:
+    """
+    Fetch many items by primary key with concurrent 100 key BatchGetItem calls
+    UnprocessedKeys and throttled requests are retried with jittered exponential backoff
+    :param table: The boto3 table to read from
+    :param keys: Primary keys to fetch, e.g. [{"id": "..."}] - duplicates are only fetched once
+    :param projection_expression: Only fetch these attributes, e.g. "id, tenures" - the key is always included
+    :param expression_attribute_names: Placeholders used in the projection, e.g. {"#t": "type"}
+    :param max_workers: Maximum number of batches in flight at once
+    :param max_retries: Attempts to resubmit UnprocessedKeys or a throttled request before raising
+    :param base_delay: Backoff before the first retry in seconds - doubles with each retry
+    :param max_delay: Upper bound on the backoff between retries in seconds
+    :param key_names: Primary key attribute names - read from the table's key schema if not given
+    :param limiter: Paces batches by the read capacity they consume
+    :return: A dict of each found item keyed by its primary key value (a tuple for composite keys)
+        Keys that don't exist in the table are left out
+    """
+    key_names = key_names or [key["AttributeName"] for key in table.key_schema]
+    unique_keys = list({_key_value(key, key_names): {key_name: key[key_name] for key_name in key_names}
+                        for key in keys}.values())
+    if not unique_keys:
+        return {}
+
+    request_template: dict[str, Any] = {}
+    if projection_expression:
+        projection_expression, names = _projection_with_keys(
+            projection_expression, expression_attribute_names or {}, key_names)
+        request_template["ProjectionExpression"] = projection_expression
+        request_template["ExpressionAttributeNames"] = names
+
+    client = table.meta.client
+
+    def _get_batch(batch_keys: list[dict]) -> list[dict]:
+        items = []
+        pending = batch_keys
+        for attempt in range(max_retries + 1):
+            if attempt > 0:
+                time.sleep(random.uniform(0, min(max_delay, base_delay * 2 ** attempt)))
+            request_kwargs: dict[str, Any] = {"RequestItems": {table.name: dict(request_template, Keys=pending)}}
+            if limiter is not None:
+                # Assume 0.5 RCU per key (an eventually consistent read under 4KB) until DynamoDB says otherwise
+                estimated_units = len(pending) / 2
+                limiter.acquire(estimated_units)
+                request_kwargs["ReturnConsumedCapacity"] = "TOTAL"
+            try:
+                response = client.batch_get_item(**request_kwargs)
+            except Exception as e:
+                if is_throttling_error(e) and attempt < max_retries:
+                    if limiter is not None:
+                        limiter.throttled()
+                    continue
+                raise
+            items.extend(response.get("Responses", {}).get(table.name, []))
+            pending = response.get("UnprocessedKeys", {}).get(table.name, {}).get("Keys", [])
+            if limiter is not None:
+                limiter.record(estimated_units, consumed_capacity_units(response))
+                if pending:
+                    limiter.throttled()
+            if not pending:
+                return items
+        raise RuntimeError(f"{len(pending)} keys from {table.name} still unprocessed after {max_retries} retries")
+
+    batches = [unique_keys[i:i + MAX_BATCH_SIZE] for i in range(0, len(unique_keys), MAX_BATCH_SIZE)]
+    results: dict[Any, dict] = {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as executor:
+        for items in executor.map(_get_batch, batches):
+            for item in items:
+                results[_key_value(item, key_names)] = item
+    return results
@@ -0,0 +1,177 @@
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable
+
+from mypy_boto3_dynamodb.service_resource import Table
+
+from aws.database.dynamodb.utils.rate_limiter import CapacityRateLimiter, consumed_capacity_units, is_throttling_error
+
+# Called with the keys in a batch, whether they were written and the failure reason if not
+BatchCallback = Callable[[list[dict], bool, str], None]
+
+
+class BatchWriter:
+    MAX_BATCH_SIZE = 25
+
+    def __init__(self, table: Table, on_batch: BatchCallback | None = None, max_workers: int = 4,
+                 max_retries: int = 8, base_delay: float = 0.05, max_delay: float = 5.0,
+                 key_names: list[str] | None = None, limiter: CapacityRateLimiter | None = None):
+        """
+        Buffers puts and deletes and writes them to a DynamoDB table in 25 item BatchWriteItem calls
+        Full batches are flushed on a thread pool, and UnprocessedItems are retried with jittered exponential backoff
+        Batches can land in any order - call flush() between writes to the same key that must happen in sequence
+        :param table: The boto3 table to write to
+        :param on_batch: Called once per batch (from the flushing thread) to report which keys were written
+            - an exception from it stops that batch, and is raised from the next flush() or close()
+        :param max_workers: Number of threads flushing batches at once
+        :param max_retries: Attempts to resubmit UnprocessedItems before reporting them as failed
+        :param base_delay: Backoff before the first retry in seconds - doubles with each retry
+        :param max_delay: Upper bound on the backoff between retries in seconds
+        :param key_names: Primary key attribute names - read from the table's key schema if not given
+        :param limiter: Paces batches by the write capacity they consume and backs off when throttled
+        """
+        self.table = table
+        self.on_batch = on_batch
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.key_names = key_names or [key["AttributeName"] for key in table.key_schema]
+        self.limiter = limiter
+        self.written_count = 0
+        self.failed_count = 0
+
+        self._buffer: dict[tuple, dict] = {}
+        self._lock = threading.Lock()
+        self._callback_lock = threading.Lock()
+        self._futures: set[Future] = set()
+        self._errors: list[BaseException] = []
+        # Bounds the batches waiting on the pool so a fast producer can't buffer the whole job in memory
+        self._in_flight = threading.BoundedSemaphore(max_workers * 2)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="batch-writer")
+
+    def __enter__(self) -> "BatchWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _key(self, item: dict) -> dict:
+        try:
+            return {key_name: item[key_name] for key_name in self.key_names}
+        except KeyError as e:
+            raise ValueError(f"Item is missing primary key attribute {e} - key is {self.key_names}") from e
+
+    def put(self, item: dict):
+        """Queue an item to be put - a later put or delete of the same key replaces it"""
+        self._add(self._key(item), {"PutRequest": {"Item": item}})
+
+    def delete(self, key: dict):
+        """Queue an item to be deleted by its primary key"""
+        self._add(self._key(key), {"DeleteRequest": {"Key": self._key(key)}})
+
+    def _add(self, key: dict, request: dict):
+        # BatchWriteItem rejects batches with the same key twice, so only the latest request per key is kept
+        with self._lock:
+            self._buffer[tuple(key.values())] = request
+            if len(self._buffer) < self.MAX_BATCH_SIZE:
+                return
+            batch = self._take_batch()
+        self._submit(batch)
+
+    def _take_batch(self) -> list[dict]:
+        keys = list(self._buffer.keys())[:self.MAX_BATCH_SIZE]
+        return [self._buffer.pop(key) for key in keys]
+
+    def _submit(self, batch: list[dict]):
+        self._in_flight.acquire()
+        future = self._executor.submit(self._write_batch, batch)
+        with self._lock:
+            self._futures.add(future)
+        future.add_done_callback(self._batch_done)
+
+    def _batch_done(self, future: Future):
+        with self._lock:
+            self._futures.discard(future)
+            if not future.cancelled() and future.exception() is not None:
+                self._errors.append(future.exception())
+        self._in_flight.release()
+
+    def flush(self):
+        """
+        Write everything buffered so far and wait for all outstanding batches to finish
+        Raises the first exception a batch raised since the last flush, e.g. from on_batch
+        """
+        while True:
+            with self._lock:
+                if not self._buffer:
+                    break
+                batch = self._take_batch()
+            self._submit(batch)
+        with self._lock:
+            futures = list(self._futures)
+        wait(futures)
+        with self._lock:
+            errors, self._errors = self._errors, []
+        if errors:
+            raise errors[0]
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self._executor.shutdown(wait=True)
+
+    def _request_key(self, request: dict) -> dict:
+        if "PutRequest" in request:
+            return self._key(request["PutRequest"]["Item"])
+        return request["DeleteRequest"]["Key"]
+
+    def _report(self, requests: list[dict], success: bool, reason: str = ""):
+        if not requests:
+            return
+        with self._callback_lock:
+            if success:
+                self.written_count += len(requests)
+            else:
+                self.failed_count += len(requests)
+            if self.on_batch is not None:
+                self.on_batch([self._request_key(request) for request in requests], success, reason)
+
+    def _write_batch(self, batch: list[dict]):
+        client = self.table.meta.client
+        pending = batch
+        for attempt in range(self.max_retries + 1):
+            if attempt > 0:
+                # Full jitter: sleep a random amount up to the exponential backoff cap
+                time.sleep(random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt)))
+            request_kwargs = {"RequestItems": {self.table.name: pending}}
+            if self.limiter is not None:
+                # Assume 1 WCU per item until DynamoDB says what the batch really cost
+                estimated_units = float(len(pending))
+                self.limiter.acquire(estimated_units)
+                request_kwargs["ReturnConsumedCapacity"] = "TOTAL"
+            try:
+                response = client.batch_write_item(**request_kwargs)
+            except Exception as e:
+                if is_throttling_error(e) and attempt < self.max_retries:
+                    if self.limiter is not None:
+                        self.limiter.throttled()
+                    continue
+                self._report(pending, False, str(e))
+                return
+            unprocessed = response.get("UnprocessedItems", {}).get(self.table.name, [])
+            if self.limiter is not None:
+                self.limiter.record(estimated_units, consumed_capacity_units(response))
+                if unprocessed:
+                    self.limiter.throttled()
+            unprocessed_keys = {tuple(self._request_key(request).values()) for request in unprocessed}
+            self._report(
+                [request for request in pending if tuple(self._request_key(request).values()) not in unprocessed_keys],
+                True,
+            )
+            if not unprocessed:
+                return
+            pending = unprocessed
+        self._report(pending, False, f"Still unprocessed after {self.max_retries} retries")
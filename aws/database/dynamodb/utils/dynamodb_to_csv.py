@@ -1,36 +1,91 @@
 import csv
+from typing import Any, Callable
+
+import numpy as np
 
 from aws.database.dynamodb.utils.get_dynamodb_table import get_dynamodb_table
-from aws.utils.filter_list_of_dictionaries_by_lambdas import filter_list_of_dictionaries_by_lambdas
+from aws.database.dynamodb.utils.parallel_scan import ParallelScanner
 from aws.utils.logger import Logger
 from enums.enums import Stage
 
 logger = Logger()
 
+# Rows buffered per segment before a columnar shard is written
+COLUMNAR_SHARD_ROWS = 100000
+
+
+def projection_for_headings(headings: list[str]) -> tuple[str, dict[str, str]]:
+    """
+    A ProjectionExpression that only fetches the given top level attributes
+    Every heading gets a placeholder, so reserved words such as "type" or "name" can be used
+    :return: The expression and its ExpressionAttributeNames
+    """
+    names = {f"#h{i}": heading for i, heading in enumerate(headings)}
+    return ", ".join(names.keys()), names
+
+
+def passes_filters(item: dict, headings_filters: dict[str, Callable[[Any], bool] | None]) -> bool:
+    """Whether every heading's filter accepts the item's value for it - headings with no filter accept anything"""
+    for heading, heading_filter in headings_filters.items():
+        if heading_filter is not None and not heading_filter(item.get(heading)):
+            return False
+    return True
 
-def filter_and_write_to_csv(items, outfile, headings_filters):
-    print(f"Writing to {outfile.name}...")
-    filtered_items = filter_list_of_dictionaries_by_lambdas(items, headings_filters)
-    csv_rows = []
-    for filtered_item in filtered_items:
-        csv_row = []
-        for key in headings_filters.keys():
-            csv_row.append(str(filtered_item[key]))
-        csv_rows.append(",".join(csv_row))
-    outfile.writelines(csv_rows)
-    logger.log(f"Scanned {len(csv_rows)} items")
 
+def _write_columnar_shard(output_path: str, segment: int, shard: int, columns: dict[str, list[str]]):
+    shard_path = f"{output_path}_segment{segment}_{shard}.npz"
+    arrays = {heading: np.asarray(values, dtype=np.str_) for heading, values in columns.items()}
+    np.savez_compressed(shard_path, **arrays)
+    logger.log(f"Wrote {len(next(iter(columns.values())))} rows to {shard_path}")
 
-def dynamodb_to_tsv(table_name: str, stage: Stage, output_directory: str, headings_filters: dict[str, any]):
-    dynamo_table = get_dynamodb_table(table_name, stage)
-    with open(f"{output_directory}_{stage}.tsv", "w") as outfile:
+
+def dynamodb_to_tsv(table_name: str, stage: Stage, output_directory: str,
+                    headings_filters: dict[str, Callable[[Any], bool] | None], total_segments: int = 4,
+                    columnar: bool = False):
+    """
+    Export the headings_filters attributes of every item that passes the filters to a TSV file
+    Only those attributes are fetched from DynamoDB
+    :param table_name: Table to export
+    :param stage: Stage the table is in
+    :param output_directory: Output path prefix - the stage and extension are appended
+    :param headings_filters: Attribute names to export, mapped to a filter on the attribute's value (or None)
+    :param total_segments: Number of parallel scan segments
+    :param columnar: Also write compressed NumPy .npz files with one array per heading, sharded per scan segment
+    """
+    dynamo_table = get_dynamodb_table(table_name, stage, config_profile="parallel-scan")
+    headings = list(headings_filters.keys())
+    projection_expression, expression_attribute_names = projection_for_headings(headings)
+    scanner = ParallelScanner(dynamo_table, total_segments=total_segments, logger=logger,
+                              ProjectionExpression=projection_expression,
+                              ExpressionAttributeNames=expression_attribute_names)
+
+    output_path = f"{output_directory}_{stage}"
+    segment_columns: dict[int, dict[str, list[str]]] = {}
+    segment_shards: dict[int, int] = {}
+    written_count = 0
+    print(f"Writing to {output_path}.tsv...")
+    with open(f"{output_path}.tsv", "w", newline="", buffering=1024 * 1024) as outfile:
         writer = csv.writer(outfile, delimiter="\t", lineterminator="\n")
-        outfile.write(",".join(headings_filters.keys()) + "\n")
-        scan = dynamo_table.scan()
-        filter_and_write_to_csv(scan["Items"], outfile, headings_filters)
-        while "LastEvaluatedKey" in scan:
-            logger.log(f"Scanned {len(scan)} rows - last key: {scan['LastEvaluatedKey']}")
-            scan = dynamo_table.scan(ExclusiveStartKey=scan["LastEvaluatedKey"])
-            filter_and_write_to_csv(scan["Items"], outfile, headings_filters)
-
-        logger.log(f"Finished run - scanned {len(scan)} rows")
+        writer.writerow(headings)
+        for segment, items in scanner.pages():
+            # Missing and null attributes are written as empty cells rather than "None"
+            rows = [["" if (value := item.get(heading)) is None else str(value) for heading in headings]
+                    for item in items if passes_filters(item, headings_filters)]
+            writer.writerows(rows)
+            written_count += len(rows)
+            if not columnar or not rows:
+                continue
+
+            columns = segment_columns.setdefault(segment, {heading: [] for heading in headings})
+            for heading, values in zip(headings, zip(*rows)):
+                columns[heading].extend(values)
+            if len(columns[headings[0]]) >= COLUMNAR_SHARD_ROWS:
+                _write_columnar_shard(output_path, segment, segment_shards.get(segment, 0), columns)
+                segment_shards[segment] = segment_shards.get(segment, 0) + 1
+                del segment_columns[segment]
+
+    for segment, columns in segment_columns.items():
+        _write_columnar_shard(output_path, segment, segment_shards.get(segment, 0), columns)
+
+    logger.log(f"Finished run - scanned {sum(stats.items for stats in scanner.stats.values())} rows, "
+               f"wrote {written_count}")
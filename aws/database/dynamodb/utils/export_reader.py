@@ -0,0 +1,110 @@
+"""
+Reads DynamoDB table exports to S3 (DynamoDB JSON format), see guide:
+https://docs.aws.amazon.com/amazondynamodb/latest/developerguide/S3DataExport.Output.html
+
+Each line of an export part is {"Item": {...}} with DynamoDB typed values.
+Parts can be read as downloaded (.json.gz) or after decompressing (.json).
+"""
+
+import gzip
+import json
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, TypeVar
+
+from aws.database.dynamodb.utils.deserializer import deserialize_item
+
+T = TypeVar("T")
+
+EXPORT_FILE_SUFFIXES = (".json", ".json.gz")
+
+
+def export_files(path: str) -> list[str]:
+    """
+    The export parts at a path, in name order
+    :param path: A single export file, or a directory such as an export's data/ folder
+    """
+    if not os.path.isdir(path):
+        return [path]
+    return sorted(
+        os.path.join(path, file_name) for file_name in os.listdir(path)
+        if file_name.endswith(EXPORT_FILE_SUFFIXES)
+    )
+
+
+def iter_export_lines(path: str) -> Iterator[str]:
+    """Streams the non-empty lines of every export part at a path, decompressing .gz parts on the fly"""
+    for file_path in export_files(path):
+        opener = gzip.open if file_path.endswith(".gz") else open
+        with opener(file_path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield line
+
+
+def deserialize_export_line(line: str, int_numbers: bool = False) -> dict:
+    """Turns one export line into a plain dict, e.g. {"id": {"S": "1"}} -> {"id": "1"}"""
+    return deserialize_item(json.loads(line)["Item"], int_numbers)
+
+
+def _deserialize_chunk(lines: list[str], factory: Callable[[dict], Any] | None, int_numbers: bool) -> list:
+    # Runs in the worker processes, so it and the factory must be importable at module level
+    items = [deserialize_export_line(line, int_numbers) for line in lines]
+    if factory is not None:
+        items = [factory(item) for item in items]
+    return items
+
+
+def _chunks(lines: Iterable[str], chunk_size: int) -> Iterator[list[str]]:
+    lines = iter(lines)
+    while chunk := list(islice(lines, chunk_size)):
+        yield chunk
+
+
+def read_export(path: str, factory: Callable[[dict], T] | None = None, processes: int | None = None,
+                chunk_size: int = 1000, int_numbers: bool = False) -> Iterator[dict | T]:
+    """
+    Lazily reads every item of a DynamoDB export, deserialising lines on a process pool
+    Only a few chunks are in flight at once, so memory stays flat however large the export is
+    :param path: A single export file, or a directory of export parts
+    :param factory: Applied to each deserialised dict in the worker, e.g. Asset.from_data - must be picklable
+    :param processes: Worker processes - defaults to the number of CPUs, 1 deserialises in this process
+    :param chunk_size: Lines sent to a worker at a time
+    :param int_numbers: Return whole numbers as int instead of Decimal - leave False if items are written back
+    :return: A generator of items in file order
+    """
+    lines = iter_export_lines(path)
+    processes = processes or os.cpu_count() or 1
+    if processes == 1:
+        for chunk in _chunks(lines, chunk_size):
+            yield from _deserialize_chunk(chunk, factory, int_numbers)
+        return
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        # Bounded window of chunks - results are yielded in order as the oldest one completes
+        in_flight: deque[Future] = deque()
+        try:
+            for chunk in _chunks(lines, chunk_size):
+                in_flight.append(executor.submit(_deserialize_chunk, chunk, factory, int_numbers))
+                if len(in_flight) >= processes * 2:
+                    yield from in_flight.popleft().result()
+            while in_flight:
+                yield from in_flight.popleft().result()
+        finally:
+            # Don't parse the rest of the export if the consumer stopped early
+            for future in in_flight:
+                future.cancel()
+
+
+if __name__ == "__main__":
+    # Example usage
+    import sys
+    import time
+
+    from aws.database.domain.dynamo_domain_objects import Asset
+
+    _start = time.monotonic()
+    _count = sum(1 for _ in read_export(sys.argv[1], factory=Asset.from_data))
+    print(f"Read {_count} assets in {time.monotonic() - _start:.1f}s")
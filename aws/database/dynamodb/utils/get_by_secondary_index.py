@@ -1,11 +1,118 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable, Iterator
+
 from boto3.dynamodb.conditions import Key
 from mypy_boto3_dynamodb.service_resource import Table
 
 
+def _query_kwargs(index_name: str, secondary_key_name: str, secondary_key_value: str,
+                  projection_expression: str | None = None,
+                  expression_attribute_names: dict[str, str] | None = None) -> dict[str, Any]:
+    query_kwargs: dict[str, Any] = {
+        "IndexName": index_name,
+        "KeyConditionExpression": Key(secondary_key_name).eq(secondary_key_value),
+    }
+    if projection_expression:
+        query_kwargs["ProjectionExpression"] = projection_expression
+    if expression_attribute_names:
+        query_kwargs["ExpressionAttributeNames"] = expression_attribute_names
+    return query_kwargs
+
+
+def query_by_secondary_index(
+        table: Table, index_name: str, secondary_key_name: str, secondary_key_value: str,
+        projection_expression: str | None = None, expression_attribute_names: dict[str, str] | None = None,
+        page_limit: int | None = None) -> Iterator[dict]:
+    """
+    Streams every item matching a secondary index key, following LastEvaluatedKey across pages
+    :param table: The boto3 table to query
+    :param index_name: Name of the secondary index, e.g. "AssetId"
+    :param secondary_key_name: Name of the index's partition key attribute, e.g. "assetId"
+    :param secondary_key_value: Key value to look up
+    :param projection_expression: Only fetch these attributes, e.g. "id, tenure"
+    :param expression_attribute_names: Placeholders used in the projection, e.g. {"#t": "type"}
+    :param page_limit: Maximum number of items per Query page
+    :return: A generator of the matching items
+    """
+    query_kwargs = _query_kwargs(index_name, secondary_key_name, secondary_key_value,
+                                 projection_expression, expression_attribute_names)
+    if page_limit:
+        query_kwargs["Limit"] = page_limit
+    while True:
+        response = table.query(**query_kwargs)
+        yield from response.get("Items", [])
+        if "LastEvaluatedKey" not in response:
+            return
+        query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def count_by_secondary_index(
+        table: Table, index_name: str, secondary_key_name: str, secondary_key_value: str) -> int:
+    """
+    Counts the items matching a secondary index key with Select=COUNT, so no item attributes are returned
+    :return: Number of items with the given key value
+    """
+    query_kwargs = _query_kwargs(index_name, secondary_key_name, secondary_key_value)
+    query_kwargs["Select"] = "COUNT"
+    count = 0
+    while True:
+        response = table.query(**query_kwargs)
+        count += response["Count"]
+        if "LastEvaluatedKey" not in response:
+            return count
+        query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def count_by_secondary_index_bulk(
+        table: Table, index_name: str, secondary_key_name: str, secondary_key_values: Iterable[str],
+        max_workers: int = 16) -> dict[str, int]:
+    """
+    count_by_secondary_index for many key values at once, running the queries concurrently
+    :param secondary_key_values: Key values to count - duplicates are only queried once
+    :return: A dict of each key value to the number of items with it
+    """
+    unique_values = list(dict.fromkeys(secondary_key_values))
+    if not unique_values:
+        return {}
+
+    def _count(secondary_key_value: str) -> int:
+        return count_by_secondary_index(table, index_name, secondary_key_name, secondary_key_value)
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(unique_values))) as executor:
+        return dict(zip(unique_values, executor.map(_count, unique_values)))
+
+
 def get_by_secondary_index(
-        table: Table, index_name: str, secondary_key_name: str, secondary_key_value: str) -> list[dict]:
-    response = table.query(
-        IndexName=index_name,
-        KeyConditionExpression=Key(secondary_key_name).eq(secondary_key_value)
-    )
-    return response.get("Items")
+        table: Table, index_name: str, secondary_key_name: str, secondary_key_value: str,
+        projection_expression: str | None = None,
+        expression_attribute_names: dict[str, str] | None = None) -> list[dict]:
+    return list(query_by_secondary_index(table, index_name, secondary_key_name, secondary_key_value,
+                                         projection_expression, expression_attribute_names))
+
+
+def get_by_secondary_index_bulk(
+        table: Table, index_name: str, secondary_key_name: str, secondary_key_values: Iterable[str],
+        max_workers: int = 16, projection_expression: str | None = None,
+        expression_attribute_names: dict[str, str] | None = None) -> dict[str, list[dict]]:
+    """
+    Queries a secondary index for many key values at once, running the queries concurrently
+    :param table: The boto3 table to query
+    :param index_name: Name of the secondary index, e.g. "AssetId"
+    :param secondary_key_name: Name of the index's partition key attribute, e.g. "assetId"
+    :param secondary_key_values: Key values to look up - duplicates are only queried once
+    :param max_workers: Maximum number of queries in flight at once
+    :param projection_expression: Only fetch these attributes, e.g. "id, tenure"
+    :param expression_attribute_names: Placeholders used in the projection, e.g. {"#t": "type"}
+    :return: A dict of each key value to the list of items found for it (empty if none were found)
+    """
+    unique_values = list(dict.fromkeys(secondary_key_values))
+    if not unique_values:
+        return {}
+
+    def _query(secondary_key_value: str) -> list[dict]:
+        return get_by_secondary_index(table, index_name, secondary_key_name, secondary_key_value,
+                                      projection_expression, expression_attribute_names)
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(unique_values))) as executor:
+        results = executor.map(_query, unique_values)
+        return dict(zip(unique_values, results))
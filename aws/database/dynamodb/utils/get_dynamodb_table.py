@@ -1,19 +1,39 @@
+import threading
 from difflib import get_close_matches
 
 from mypy_boto3_dynamodb import ServiceResource
 from mypy_boto3_dynamodb.service_resource import Table
 
-from aws.authentication.generate_aws_resource import generate_aws_service
+from aws.authentication.generate_aws_resource import generate_aws_service, register_cache_clear
 from enums.enums import Stage
 
+# Tables already checked to exist, so later calls skip the DescribeTable round trip
+_tables_lock = threading.Lock()
+_tables: dict[tuple[Stage, str, str | None], Table] = {}
 
-def get_dynamodb_table(table_name: str, stage: Stage) -> Table:
+
+def clear_dynamodb_tables():
+    """Forget every cached table - also done by clear_aws_cache, as the tables belong to its cached resources"""
+    with _tables_lock:
+        _tables.clear()
+
+
+register_cache_clear(clear_dynamodb_tables)
+
+
+def get_dynamodb_table(table_name: str, stage: Stage, config_profile: str | None = None) -> Table:
     """
     :param table_name: Name of the DynamoDB table to connect to (as on AWS)
     :param stage: A valid stage (e.g. Stage.DEVELOPMENT)
-    :return: A boto3 DynamoDB table object
+    :param config_profile: A client config from CLIENT_CONFIG_PROFILES, e.g. "bulk-write" for many concurrent writes
+    :return: A boto3 DynamoDB table object - the same one for every call with the same arguments
     """
-    db_resource: ServiceResource = generate_aws_service("dynamodb", stage)
+    cache_key = (stage, table_name, config_profile)
+    with _tables_lock:
+        if cache_key in _tables:
+            return _tables[cache_key]
+
+    db_resource: ServiceResource = generate_aws_service("dynamodb", stage, config_profile)
     dynamo_table: Table = db_resource.Table(table_name)
     try:
         # Check that the table exists
@@ -24,4 +44,6 @@ def get_dynamodb_table(table_name: str, stage: Stage) -> Table:
         raise ValueError(f"Did not find table named: {table_name}\n"
                          f"Valid tables: {valid_tables}\n"
                          f"Close matches: {get_close_matches(table_name, valid_tables)}")
+    with _tables_lock:
+        _tables[cache_key] = dynamo_table
     return dynamo_table
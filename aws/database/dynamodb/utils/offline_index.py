@@ -0,0 +1,258 @@
+"""
+Offline lookups against DynamoDB table exports instead of the live tables
+
+build_offline_index reads the Assets, TenureInformation and Persons exports once and records in a SQLite file:
+- where each item is in the export (id -> file and byte offset)
+- assetId -> asset id, for the Assets AssetId index
+- paymentReference -> tenure id, for the TenureInformation PaymentReference index
+
+OfflineIndex.table() then returns a stand-in for a boto3 Table that answers get_item, query and batch_get_item
+from the index, so the existing lookup helpers work unchanged and dry runs cost no read capacity.
+"""
+
+import gzip
+import json
+import os
+import shutil
+import sqlite3
+import threading
+from typing import Any, BinaryIO
+
+from aws.database.dynamodb.utils.export_reader import deserialize_export_line, export_files
+
+INDEX_FILE_NAME = "index.sqlite"
+
+# Secondary indexes answered offline: (table name, index name) -> (key attribute, SQLite table)
+SECONDARY_INDEXES = {
+    ("Assets", "AssetId"): ("assetId", "asset_ids"),
+    ("TenureInformation", "PaymentReference"): ("paymentReference", "payment_references"),
+}
+
+
+def _plain_export_files(export_path: str, table_dir: str) -> list[str]:
+    """Export parts that can be seeked into - gzipped parts are decompressed into the index directory"""
+    plain_files = []
+    for file_path in export_files(export_path):
+        if file_path.endswith(".gz"):
+            plain_path = os.path.join(table_dir, os.path.basename(file_path)[:-len(".gz")])
+            with gzip.open(file_path, "rb") as compressed, open(plain_path, "wb") as plain:
+                shutil.copyfileobj(compressed, plain)
+            file_path = plain_path
+        plain_files.append(os.path.abspath(file_path))
+    return plain_files
+
+
+def _string_attribute(item: dict, attribute: str) -> str | None:
+    value = item.get(attribute)
+    return value.get("S") if value else None
+
+
+def build_offline_index(index_dir: str, assets_export: str, tenures_export: str, persons_export: str,
+                        batch_size: int = 10000):
+    """
+    Build (or rebuild) the offline index from a set of table exports
+    :param index_dir: Directory to write the index (and any decompressed export parts) to
+    :param assets_export: Assets export file or directory of parts
+    :param tenures_export: TenureInformation export file or directory of parts
+    :param persons_export: Persons export file or directory of parts
+    :param batch_size: Rows inserted per SQLite batch
+    """
+    os.makedirs(index_dir, exist_ok=True)
+    index_path = os.path.join(index_dir, INDEX_FILE_NAME)
+    if os.path.exists(index_path):
+        os.remove(index_path)
+
+    connection = sqlite3.connect(index_path)
+    connection.execute("PRAGMA synchronous = OFF")
+    connection.execute("PRAGMA journal_mode = OFF")
+    connection.execute("CREATE TABLE files (file_id INTEGER PRIMARY KEY, path TEXT NOT NULL)")
+    connection.execute(
+        "CREATE TABLE items (table_name TEXT NOT NULL, id TEXT NOT NULL, file_id INTEGER NOT NULL, "
+        "offset INTEGER NOT NULL, PRIMARY KEY (table_name, id)) WITHOUT ROWID"
+    )
+    secondary_indexes = {}
+    for (table_name, _), (key_attribute, sqlite_table) in SECONDARY_INDEXES.items():
+        connection.execute(f"CREATE TABLE {sqlite_table} (key TEXT NOT NULL, id TEXT NOT NULL)")
+        secondary_indexes[table_name] = (key_attribute, sqlite_table)
+
+    exports = {"Assets": assets_export, "TenureInformation": tenures_export, "Persons": persons_export}
+    for table_name, export_path in exports.items():
+        table_dir = os.path.join(index_dir, table_name)
+        os.makedirs(table_dir, exist_ok=True)
+        item_rows, secondary_rows = [], []
+        secondary_key, secondary_table = secondary_indexes.get(table_name, (None, None))
+        count, skipped = 0, 0
+
+        for file_path in _plain_export_files(export_path, table_dir):
+            file_id = connection.execute("INSERT INTO files (path) VALUES (?)", (file_path,)).lastrowid
+            offset = 0
+            with open(file_path, "rb") as f:
+                for line in f:
+                    line_offset, offset = offset, offset + len(line)
+                    if not line.strip():
+                        continue
+                    item = json.loads(line)["Item"]
+                    item_id = _string_attribute(item, "id")
+                    if not item_id:
+                        # A malformed line shouldn't stop the rest of the export being indexed
+                        skipped += 1
+                        continue
+                    item_rows.append((table_name, item_id, file_id, line_offset))
+                    if secondary_key is not None:
+                        secondary_value = _string_attribute(item, secondary_key)
+                        if secondary_value:
+                            secondary_rows.append((secondary_value, item_id))
+                    count += 1
+                    if len(item_rows) >= batch_size:
+                        connection.executemany("INSERT OR REPLACE INTO items VALUES (?, ?, ?, ?)", item_rows)
+                        item_rows = []
+                    if len(secondary_rows) >= batch_size:
+                        connection.executemany(f"INSERT INTO {secondary_table} VALUES (?, ?)", secondary_rows)
+                        secondary_rows = []
+        connection.executemany("INSERT OR REPLACE INTO items VALUES (?, ?, ?, ?)", item_rows)
+        if secondary_rows:
+            connection.executemany(f"INSERT INTO {secondary_table} VALUES (?, ?)", secondary_rows)
+        connection.commit()
+        print(f"Indexed {count} {table_name} items from {export_path}"
+              + (f" - skipped {skipped} without an id" if skipped else ""))
+
+    for _, sqlite_table in secondary_indexes.values():
+        connection.execute(f"CREATE INDEX {sqlite_table}_key ON {sqlite_table} (key)")
+    connection.commit()
+    connection.close()
+    print(f"Offline index written to {index_path}")
+
+
+class OfflineIndex:
+    def __init__(self, index_dir: str):
+        """
+        Reads items from table exports through an index made by build_offline_index
+        :param index_dir: Directory the index was built in
+        """
+        index_path = os.path.join(index_dir, INDEX_FILE_NAME)
+        if not os.path.exists(index_path):
+            raise FileNotFoundError(f"No offline index at {index_path} - run build_offline_index first")
+        self._connection = sqlite3.connect(f"file:{index_path}?mode=ro", uri=True, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._file_paths: dict[int, str] = dict(self._connection.execute("SELECT file_id, path FROM files"))
+        self._files: dict[int, BinaryIO] = {}
+
+    def close(self):
+        with self._lock:
+            for f in self._files.values():
+                f.close()
+            self._files = {}
+            self._connection.close()
+
+    def _read_line(self, file_id: int, offset: int) -> bytes:
+        if file_id not in self._files:
+            self._files[file_id] = open(self._file_paths[file_id], "rb")
+        f = self._files[file_id]
+        f.seek(offset)
+        return f.readline()
+
+    def get(self, table_name: str, item_id: str) -> dict | None:
+        """The exported item with this id, or None if it isn't in the export"""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT file_id, offset FROM items WHERE table_name = ? AND id = ?", (table_name, item_id)
+            ).fetchone()
+            if row is None:
+                return None
+            line = self._read_line(*row)
+        return deserialize_export_line(line.decode("utf-8"))
+
+    def ids_for_key(self, table_name: str, index_name: str, key_value: str) -> list[str]:
+        """Item ids with this secondary index key value, e.g. the asset ids for an assetId"""
+        if (table_name, index_name) not in SECONDARY_INDEXES:
+            raise ValueError(f"No offline index for {table_name}.{index_name} - supported indexes are "
+                             f"{[f'{table}.{index}' for table, index in SECONDARY_INDEXES]}")
+        _, sqlite_table = SECONDARY_INDEXES[(table_name, index_name)]
+        with self._lock:
+            rows = self._connection.execute(f"SELECT id FROM {sqlite_table} WHERE key = ?", (key_value,)).fetchall()
+        return [row[0] for row in rows]
+
+    def asset_ids_for_prop_ref(self, asset_id: str) -> list[str]:
+        return self.ids_for_key("Assets", "AssetId", asset_id)
+
+    def tenure_ids_for_payment_reference(self, payment_reference: str) -> list[str]:
+        return self.ids_for_key("TenureInformation", "PaymentReference", payment_reference)
+
+    def table(self, table_name: str) -> "OfflineTable":
+        return OfflineTable(self, table_name)
+
+
+def _project(item: dict, projection_expression: str | None, expression_attribute_names: dict[str, str] | None) -> dict:
+    # Only top level attributes are projected, which is all the lookup helpers use
+    if not projection_expression:
+        return item
+    names = expression_attribute_names or {}
+    attributes = [names.get(path.strip(), path.strip()) for path in projection_expression.split(",")]
+    return {attribute: item[attribute] for attribute in attributes if attribute in item}
+
+
+class _OfflineClient:
+    """Answers the batch_get_item calls batch_get makes through table.meta.client"""
+
+    def __init__(self, table: "OfflineTable"):
+        self._table = table
+
+    def batch_get_item(self, RequestItems: dict, **kwargs) -> dict:
+        responses = {}
+        for table_name, request in RequestItems.items():
+            items = [self._table.index.get(table_name, key["id"]) for key in request["Keys"]]
+            responses[table_name] = [
+                _project(item, request.get("ProjectionExpression"), request.get("ExpressionAttributeNames"))
+                for item in items if item is not None
+            ]
+        return {"Responses": responses, "UnprocessedKeys": {}}
+
+
+class _OfflineMeta:
+    def __init__(self, client: _OfflineClient):
+        self.client = client
+
+
+class OfflineTable:
+    key_schema = [{"AttributeName": "id", "KeyType": "HASH"}]
+
+    def __init__(self, index: OfflineIndex, table_name: str):
+        """
+        Stands in for a boto3 Table when reading - supports get_item, equality queries on the indexed
+        secondary indexes, and batch_get_item through meta.client
+        """
+        self.index = index
+        self.name = table_name
+        self.meta = _OfflineMeta(_OfflineClient(self))
+
+    def get_item(self, Key: dict, ProjectionExpression: str | None = None,
+                 ExpressionAttributeNames: dict[str, str] | None = None, **kwargs) -> dict:
+        item = self.index.get(self.name, Key["id"])
+        if item is None:
+            return {}
+        return {"Item": _project(item, ProjectionExpression, ExpressionAttributeNames)}
+
+    def query(self, IndexName: str, KeyConditionExpression: Any, ProjectionExpression: str | None = None,
+              ExpressionAttributeNames: dict[str, str] | None = None, Select: str | None = None,
+              **kwargs) -> dict:
+        expression = KeyConditionExpression.get_expression()
+        key_attribute, _ = SECONDARY_INDEXES.get((self.name, IndexName), (None, None))
+        if key_attribute is None:
+            raise ValueError(f"No offline index for {self.name}.{IndexName} - supported indexes are "
+                             f"{[f'{table}.{index}' for table, index in SECONDARY_INDEXES]}")
+        if expression["operator"] != "=" or expression["values"][0].name != key_attribute:
+            raise ValueError(f"Offline queries on {self.name}.{IndexName} only support Key('{key_attribute}').eq(...)")
+        item_ids = self.index.ids_for_key(self.name, IndexName, expression["values"][1])
+        if Select == "COUNT":
+            # As DynamoDB does, a count returns no Items - count_by_secondary_index only reads Count
+            return {"Count": len(item_ids), "ScannedCount": len(item_ids)}
+        items = [self.index.get(self.name, item_id) for item_id in item_ids]
+        items = [_project(item, ProjectionExpression, ExpressionAttributeNames) for item in items if item is not None]
+        return {"Items": items, "Count": len(items)}
+
+
+if __name__ == "__main__":
+    # Example usage: python offline_index.py <index dir> <assets export> <tenures export> <persons export>
+    import sys
+
+    build_offline_index(*sys.argv[1:5])
@@ -0,0 +1,183 @@
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+
+from mypy_boto3_dynamodb.service_resource import Table
+
+from aws.database.dynamodb.utils.rate_limiter import CapacityRateLimiter, consumed_capacity_units, is_throttling_error
+from aws.utils.logger import Logger
+
+_SEGMENT_DONE = object()
+_MAX_CONSECUTIVE_THROTTLES = 10
+
+
+@dataclass
+class SegmentStats:
+    segment: int
+    pages: int = 0
+    items: int = 0
+    started: float = field(default_factory=time.monotonic)
+    finished: float | None = None
+
+    @property
+    def elapsed(self) -> float:
+        end = self.finished if self.finished is not None else time.monotonic()
+        return end - self.started
+
+    @property
+    def items_per_second(self) -> float:
+        return self.items / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __str__(self) -> str:
+        state = "done" if self.finished is not None else "running"
+        return (f"Segment {self.segment}: {self.items} items in {self.pages} pages, "
+                f"{self.elapsed:.1f}s ({self.items_per_second:.1f} items/s) [{state}]")
+
+
+class ParallelScanner:
+    def __init__(self, table: Table, total_segments: int = 4, page_limit: int | None = None,
+                 logger: Logger | None = None, log_every: int = 10, limiter: CapacityRateLimiter | None = None,
+                 **scan_kwargs: Any):
+        """
+        Scans a DynamoDB table with one Segment/TotalSegments worker per segment in a thread pool
+        :param table: The boto3 table to scan
+        :param total_segments: Number of segments (and worker threads) to split the scan into
+        :param page_limit: Maximum number of items evaluated per Scan page (the Limit parameter)
+        :param logger: Logger to report per segment throughput to - prints if not given
+        :param log_every: Report a segment's throughput every n pages - 0 to only report when it finishes
+        :param limiter: Shared by all segments to pace pages by the read capacity they consume
+        :param scan_kwargs: Extra keyword arguments for every Scan call, e.g. ProjectionExpression
+        """
+        if total_segments < 1:
+            raise ValueError(f"total_segments must be at least 1, got {total_segments}")
+        self.table = table
+        self.total_segments = total_segments
+        self.page_limit = page_limit
+        self.logger = logger
+        self.log_every = log_every
+        self.limiter = limiter
+        self.scan_kwargs = scan_kwargs
+        self.stats: dict[int, SegmentStats] = {}
+
+    def _log(self, message: str):
+        if self.logger is not None:
+            self.logger.log(message)
+        else:
+            print(message)
+
+    def _scan_segment(self, segment: int, pages: queue.Queue, stop: threading.Event):
+        stats = self.stats[segment] = SegmentStats(segment)
+        scan_kwargs = dict(self.scan_kwargs, Segment=segment, TotalSegments=self.total_segments)
+        if self.page_limit:
+            scan_kwargs["Limit"] = self.page_limit
+        if self.limiter is not None:
+            scan_kwargs["ReturnConsumedCapacity"] = "TOTAL"
+        # Each page is expected to cost about as much as the one before it
+        estimated_units = 1.0
+        throttles = 0
+        try:
+            while not stop.is_set():
+                if self.limiter is not None:
+                    self.limiter.acquire(estimated_units)
+                try:
+                    response = self.table.scan(**scan_kwargs)
+                except Exception as e:
+                    throttles += 1
+                    if self.limiter is None or not is_throttling_error(e) or throttles > _MAX_CONSECUTIVE_THROTTLES:
+                        raise
+                    self.limiter.throttled()
+                    continue
+                throttles = 0
+                if self.limiter is not None:
+                    consumed_units = consumed_capacity_units(response)
+                    self.limiter.record(estimated_units, consumed_units)
+                    estimated_units = consumed_units or estimated_units
+                items = response.get("Items", [])
+                stats.pages += 1
+                stats.items += len(items)
+                self._put(pages, (segment, items), stop)
+                if self.log_every and stats.pages % self.log_every == 0:
+                    self._log(str(stats))
+                if "LastEvaluatedKey" not in response:
+                    break
+                scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+        except Exception as e:
+            self._put(pages, (segment, e), stop)
+        finally:
+            stats.finished = time.monotonic()
+            self._put(pages, (segment, _SEGMENT_DONE), stop)
+
+    @staticmethod
+    def _put(pages: queue.Queue, entry: tuple, stop: threading.Event):
+        # Bounded queue so fast segments can't run too far ahead of the consumer
+        while not stop.is_set():
+            try:
+                pages.put(entry, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def pages(self) -> Iterator[tuple[int, list[dict]]]:
+        """Yields (segment, items) for every scanned page, in the order pages arrive from the workers"""
+        pages: queue.Queue = queue.Queue(maxsize=self.total_segments * 2)
+        stop = threading.Event()
+        self.stats = {}
+        with ThreadPoolExecutor(max_workers=self.total_segments, thread_name_prefix="scan-segment") as executor:
+            for segment in range(self.total_segments):
+                executor.submit(self._scan_segment, segment, pages, stop)
+            try:
+                remaining = self.total_segments
+                while remaining:
+                    segment, items = pages.get()
+                    if items is _SEGMENT_DONE:
+                        remaining -= 1
+                        self._log(str(self.stats[segment]))
+                        continue
+                    if isinstance(items, Exception):
+                        raise items
+                    yield segment, items
+            finally:
+                # Stops the workers if the consumer breaks out early or a segment failed
+                stop.set()
+        self.log_throughput()
+
+    def items(self) -> Iterator[dict]:
+        """Yields every scanned item as a single stream"""
+        for _, items in self.pages():
+            yield from items
+
+    def log_throughput(self):
+        total_items = sum(stats.items for stats in self.stats.values())
+        elapsed = max((stats.elapsed for stats in self.stats.values()), default=0.0)
+        rate = total_items / elapsed if elapsed > 0 else 0.0
+        self._log(f"Scanned {total_items} items from {self.table.name} in {elapsed:.1f}s "
+                  f"over {self.total_segments} segments ({rate:.1f} items/s)")
+
+
+def parallel_scan(table: Table, total_segments: int = 4, page_limit: int | None = None,
+                  logger: Logger | None = None, limiter: CapacityRateLimiter | None = None,
+                  **scan_kwargs: Any) -> Iterator[dict]:
+    """
+    Scans a whole DynamoDB table using parallel segments
+    :param table: The boto3 table to scan
+    :param total_segments: Number of segments (and worker threads) to split the scan into
+    :param page_limit: Maximum number of items evaluated per Scan page
+    :param logger: Logger to report per segment throughput to
+    :param limiter: Paces pages by the read capacity they consume
+    :param scan_kwargs: Extra keyword arguments for every Scan call, e.g. ProjectionExpression
+    :return: A generator of every item in the table
+    """
+    return ParallelScanner(table, total_segments, page_limit, logger, limiter=limiter, **scan_kwargs).items()
+
+
+if __name__ == "__main__":
+    # Example usage
+    from aws.database.dynamodb.utils.get_dynamodb_table import get_dynamodb_table
+    from enums.enums import Stage
+
+    _table = get_dynamodb_table("Assets", Stage.HOUSING_DEVELOPMENT, config_profile="parallel-scan")
+    _count = sum(1 for _ in parallel_scan(_table, total_segments=8, ProjectionExpression="id"))
+    print(f"Counted {_count} assets")
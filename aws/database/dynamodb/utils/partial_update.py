@@ -0,0 +1,193 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any
+
+from botocore.exceptions import ClientError
+from mypy_boto3_dynamodb.service_resource import Table
+
+from aws.database.dynamodb.utils.batch_writer import BatchCallback
+
+_MISSING = object()
+
+
+class _ExpressionBuilder:
+    def __init__(self):
+        self.names: dict[str, str] = {}
+        self.values: dict[str, Any] = {}
+        self._placeholders: dict[str, str] = {}
+        self.set_actions: list[str] = []
+        self.remove_actions: list[str] = []
+
+    def name(self, attribute: str) -> str:
+        # The same attribute name reuses its placeholder wherever it appears in a path
+        if attribute not in self._placeholders:
+            placeholder = f"#n{len(self._placeholders)}"
+            self._placeholders[attribute] = placeholder
+            self.names[placeholder] = attribute
+        return self._placeholders[attribute]
+
+    def value(self, value: Any, placeholder: str | None = None) -> str:
+        placeholder = placeholder or f":v{len(self.values)}"
+        self.values[placeholder] = value
+        return placeholder
+
+    def path(self, attributes: list[str]) -> str:
+        return ".".join(self.name(attribute) for attribute in attributes)
+
+    def diff(self, original: dict, modified: dict, parent: list[str]):
+        for attribute, new_value in modified.items():
+            old_value = original.get(attribute, _MISSING)
+            if isinstance(old_value, dict) and isinstance(new_value, dict):
+                # Both sides are maps, so only the changed paths inside them are written
+                self.diff(old_value, new_value, parent + [attribute])
+            elif old_value is _MISSING or old_value != new_value:
+                # Lists and scalars are written whole
+                self.set_actions.append(f"{self.path(parent + [attribute])} = {self.value(new_value)}")
+        for attribute in original:
+            if attribute not in modified:
+                self.remove_actions.append(self.path(parent + [attribute]))
+
+
+def build_partial_update(original: dict, modified: dict, key_names: list[str] | None = None,
+                         version_attribute: str | None = "versionNumber",
+                         increment_version: bool = True) -> dict[str, Any] | None:
+    """
+    UpdateItem arguments that turn the original item into the modified one, touching only the changed paths
+    Nested maps are compared attribute by attribute - lists are replaced whole if anything in them changed
+    :param original: The item as read from DynamoDB - take a copy.deepcopy before modifying it
+    :param modified: The item as it should be saved
+    :param key_names: Primary key attributes, which can't be changed - defaults to ["id"]
+    :param version_attribute: Only update if this attribute still has its original value, None to not check
+    :param increment_version: Add 1 to the version attribute unless modified already changes it
+    :return: UpdateExpression, ConditionExpression and their placeholders, or None if nothing changed
+    """
+    key_names = key_names or ["id"]
+    for key_name in key_names:
+        if original.get(key_name) != modified.get(key_name):
+            raise ValueError(f"Primary key attribute {key_name} can't be changed by an update")
+
+    builder = _ExpressionBuilder()
+    builder.diff({k: v for k, v in original.items() if k not in key_names},
+                 {k: v for k, v in modified.items() if k not in key_names}, [])
+    if not builder.set_actions and not builder.remove_actions:
+        return None
+
+    update_kwargs: dict[str, Any] = {}
+    if version_attribute is not None:
+        version = builder.name(version_attribute)
+        original_version = original.get(version_attribute)
+        if original_version is None:
+            null_version = builder.value(None, ":null_version")
+            update_kwargs["ConditionExpression"] = f"attribute_not_exists({version}) OR {version} = {null_version}"
+        else:
+            update_kwargs["ConditionExpression"] = f"{version} = {builder.value(original_version, ':original_version')}"
+            if increment_version and modified.get(version_attribute) == original_version:
+                builder.set_actions.append(f"{version} = {builder.value(original_version + 1)}")
+
+    expression = []
+    if builder.set_actions:
+        expression.append("SET " + ", ".join(builder.set_actions))
+    if builder.remove_actions:
+        expression.append("REMOVE " + ", ".join(builder.remove_actions))
+    update_kwargs["UpdateExpression"] = " ".join(expression)
+    update_kwargs["ExpressionAttributeNames"] = builder.names
+    if builder.values:
+        update_kwargs["ExpressionAttributeValues"] = builder.values
+    return update_kwargs
+
+
+def update_item_diff(table: Table, original: dict, modified: dict, key_names: list[str] | None = None,
+                     **kwargs) -> bool:
+    """
+    Save the changes between two versions of an item with a single UpdateItem call
+    Raises ClientError (ConditionalCheckFailedException) if the item's version changed since it was read
+    :param kwargs: Passed on to build_partial_update
+    :return: Whether there was anything to update
+    """
+    key_names = key_names or ["id"]
+    update_kwargs = build_partial_update(original, modified, key_names, **kwargs)
+    if update_kwargs is None:
+        return False
+    table.update_item(Key={key_name: original[key_name] for key_name in key_names}, **update_kwargs)
+    return True
+
+
+class PartialUpdateWriter:
+    def __init__(self, table: Table, on_update: BatchCallback | None = None, max_workers: int = 8,
+                 key_names: list[str] | None = None, **update_kwargs):
+        """
+        Saves modified items with diff based UpdateItem calls on a thread pool
+        Takes the place of a BatchWriter when only part of each item changes
+        :param table: The boto3 table to update
+        :param on_update: Called with ([key], success, reason) once per item - from the updating thread
+        :param max_workers: Number of updates in flight at once
+        :param key_names: Primary key attribute names - defaults to ["id"]
+        :param update_kwargs: Passed on to build_partial_update, e.g. version_attribute=None
+        """
+        self.table = table
+        self.on_update = on_update
+        self.key_names = key_names or ["id"]
+        self.update_kwargs = update_kwargs
+        self.updated_count = 0
+        self.unchanged_count = 0
+        self.failed_count = 0
+
+        self._callback_lock = threading.Lock()
+        self._futures: set[Future] = set()
+        self._in_flight = threading.BoundedSemaphore(max_workers * 2)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="partial-update")
+
+    def __enter__(self) -> "PartialUpdateWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def update(self, original: dict, modified: dict):
+        """Queue the changes from original to modified to be saved"""
+        self._in_flight.acquire()
+        future = self._executor.submit(self._update, original, modified)
+        with self._callback_lock:
+            self._futures.add(future)
+        future.add_done_callback(self._update_done)
+
+    def _update_done(self, future: Future):
+        with self._callback_lock:
+            self._futures.discard(future)
+        self._in_flight.release()
+
+    def _update(self, original: dict, modified: dict):
+        key = {key_name: original[key_name] for key_name in self.key_names}
+        try:
+            updated = update_item_diff(self.table, original, modified, self.key_names, **self.update_kwargs)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                self._report(key, False, "Item was changed since it was read - version number no longer matches")
+            else:
+                self._report(key, False, str(e))
+            return
+        except Exception as e:
+            self._report(key, False, str(e))
+            return
+        self._report(key, True, "" if updated else "No changes")
+
+    def _report(self, key: dict, success: bool, reason: str):
+        with self._callback_lock:
+            if not success:
+                self.failed_count += 1
+            elif reason:
+                self.unchanged_count += 1
+            else:
+                self.updated_count += 1
+            if self.on_update is not None:
+                self.on_update([key], success, reason)
+
+    def flush(self):
+        """Wait for all queued updates to finish"""
+        with self._callback_lock:
+            futures = list(self._futures)
+        wait(futures)
+
+    def close(self):
+        self.flush()
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,110 @@
+import threading
+import time
+from typing import Literal
+
+from botocore.exceptions import ClientError
+from mypy_boto3_dynamodb.service_resource import Table
+
+THROTTLING_ERROR_CODES = {
+    "ProvisionedThroughputExceededException",
+    "ThrottlingException",
+    "RequestLimitExceeded",
+}
+
+# On-demand tables report no provisioned capacity - these are the throughput a new on-demand table can serve
+ON_DEMAND_READ_CAPACITY = 12000
+ON_DEMAND_WRITE_CAPACITY = 4000
+
+
+def is_throttling_error(error: Exception) -> bool:
+    return isinstance(error, ClientError) and error.response.get("Error", {}).get("Code") in THROTTLING_ERROR_CODES
+
+
+def consumed_capacity_units(response: dict) -> float | None:
+    """Total CapacityUnits from a response made with ReturnConsumedCapacity="TOTAL", or None if it has none"""
+    consumed = response.get("ConsumedCapacity")
+    if consumed is None:
+        return None
+    if isinstance(consumed, dict):
+        consumed = [consumed]
+    return float(sum(capacity.get("CapacityUnits", 0) for capacity in consumed))
+
+
+class CapacityRateLimiter:
+    def __init__(self, target_rate: float, initial_rate: float | None = None, min_rate: float = 1.0,
+                 increase_step: float | None = None, decrease_factor: float = 0.5, burst_seconds: float = 1.0):
+        """
+        Token bucket limiter measured in capacity units per second
+        The rate climbs towards target_rate while requests succeed and is cut back whenever DynamoDB throttles
+        :param target_rate: Highest rate to climb to in capacity units per second
+        :param initial_rate: Rate to start at - defaults to a tenth of the target
+        :param min_rate: Lowest rate to back off to
+        :param increase_step: Units per second added after each successful request - defaults to 1% of the target
+        :param decrease_factor: Multiplier applied to the rate after a throttle
+        :param burst_seconds: Seconds of unused capacity that can be saved up and spent at once
+        """
+        self.target_rate = max(target_rate, min_rate)
+        self.min_rate = min_rate
+        self.rate = min(self.target_rate, initial_rate if initial_rate is not None else max(min_rate, target_rate / 10))
+        self.increase_step = increase_step if increase_step is not None else max(self.target_rate / 100, 0.1)
+        self.decrease_factor = decrease_factor
+        self.burst_seconds = burst_seconds
+        self.throttle_count = 0
+
+        self._tokens = self.rate * burst_seconds
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_table(cls, table: Table, mode: Literal["read", "write"], target_share: float = 0.5,
+                  **kwargs) -> "CapacityRateLimiter":
+        """
+        Create a limiter targeting a share of a table's read or write capacity
+        :param table: The boto3 table - its capacity is read from DescribeTable
+        :param mode: Whether to limit reads or writes
+        :param target_share: Fraction of the table's capacity to use, e.g. 0.5 to leave half for the live services
+        :param kwargs: Passed on to the CapacityRateLimiter constructor
+        """
+        billing_mode = (table.billing_mode_summary or {}).get("BillingMode", "PROVISIONED")
+        if billing_mode == "PAY_PER_REQUEST":
+            max_units = (getattr(table, "on_demand_throughput", None) or {}).get(
+                "MaxReadRequestUnits" if mode == "read" else "MaxWriteRequestUnits", -1)
+            if max_units is None or max_units <= 0:
+                max_units = ON_DEMAND_READ_CAPACITY if mode == "read" else ON_DEMAND_WRITE_CAPACITY
+        else:
+            max_units = table.provisioned_throughput["ReadCapacityUnits" if mode == "read" else "WriteCapacityUnits"]
+        limiter = cls(target_rate=max_units * target_share, **kwargs)
+        print(f"Limiting {mode}s on {table.name} ({billing_mode}) to {limiter.target_rate:.0f} units/s, "
+              f"starting at {limiter.rate:.0f} units/s")
+        return limiter
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.rate * self.burst_seconds, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def acquire(self, units: float = 1.0):
+        """Block until there is capacity for a request expected to consume this many units"""
+        while True:
+            with self._lock:
+                self._refill()
+                # Requests larger than the bucket are let through once it is full and leave it in debt
+                if self._tokens >= min(units, self.rate * self.burst_seconds):
+                    self._tokens -= units
+                    return
+                wait_seconds = (min(units, self.rate * self.burst_seconds) - self._tokens) / self.rate
+            time.sleep(wait_seconds)
+
+    def record(self, estimated_units: float, consumed_units: float | None):
+        """Settle the difference between the units acquired for a request and what it really consumed"""
+        with self._lock:
+            if consumed_units is not None:
+                self._tokens -= consumed_units - estimated_units
+            self.rate = min(self.target_rate, self.rate + self.increase_step)
+
+    def throttled(self):
+        """Back off after DynamoDB throttled a request or left items unprocessed"""
+        with self._lock:
+            self.throttle_count += 1
+            self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+            self._tokens = min(self._tokens, 0)
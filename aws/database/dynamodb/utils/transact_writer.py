@@ -0,0 +1,135 @@
+from typing import Any
+
+from botocore.exceptions import ClientError
+from mypy_boto3_dynamodb.service_resource import Table
+
+from aws.database.dynamodb.utils.partial_update import build_partial_update
+
+
+def _with_expression_kwargs(request: dict, condition_expression: str | None,
+                            expression_attribute_names: dict[str, str] | None,
+                            expression_attribute_values: dict[str, Any] | None) -> dict:
+    if condition_expression:
+        request["ConditionExpression"] = condition_expression
+    if expression_attribute_names:
+        request["ExpressionAttributeNames"] = expression_attribute_names
+    if expression_attribute_values:
+        request["ExpressionAttributeValues"] = expression_attribute_values
+    return request
+
+
+class TransactWriter:
+    MAX_TRANSACTION_ITEMS = 100
+
+    def __init__(self):
+        """
+        Collects writes across tables and commits them together with TransactWriteItems
+        Nothing is written until commit() - then every write lands, or none of them do
+        """
+        self.operations: list[dict] = []
+        self._descriptions: list[str] = []
+        # Insertion ordered, so the keys of committed operations can be dropped from the front
+        self._keys: dict[tuple, None] = {}
+        self._client = None
+
+    def __len__(self) -> int:
+        return len(self.operations)
+
+    def _add(self, table: Table, key: dict, operation: str, request: dict):
+        # A transaction can only touch each item once
+        item_key = (table.name, tuple(sorted(key.items())))
+        if item_key in self._keys:
+            raise ValueError(f"{table.name} item {key} is already written in this transaction")
+        self._keys[item_key] = None
+        self._client = self._client or table.meta.client
+        self.operations.append({operation: dict(request, TableName=table.name)})
+        self._descriptions.append(f"{operation} {table.name} {key}")
+
+    def put(self, table: Table, item: dict, key_names: list[str] | None = None,
+            condition_expression: str | None = None, expression_attribute_names: dict[str, str] | None = None,
+            expression_attribute_values: dict[str, Any] | None = None):
+        key_names = key_names or ["id"]
+        key = {key_name: item[key_name] for key_name in key_names}
+        request = _with_expression_kwargs({"Item": item}, condition_expression, expression_attribute_names,
+                                          expression_attribute_values)
+        self._add(table, key, "Put", request)
+
+    def update(self, table: Table, key: dict, update_expression: str, condition_expression: str | None = None,
+               expression_attribute_names: dict[str, str] | None = None,
+               expression_attribute_values: dict[str, Any] | None = None):
+        request = _with_expression_kwargs({"Key": key, "UpdateExpression": update_expression},
+                                          condition_expression, expression_attribute_names,
+                                          expression_attribute_values)
+        self._add(table, key, "Update", request)
+
+    def update_diff(self, table: Table, original: dict, modified: dict, key_names: list[str] | None = None,
+                    **kwargs) -> bool:
+        """
+        Add an update that saves only the changes between two versions of an item, see build_partial_update
+        :return: Whether there was anything to update
+        """
+        key_names = key_names or ["id"]
+        update_kwargs = build_partial_update(original, modified, key_names, **kwargs)
+        if update_kwargs is None:
+            return False
+        self.update(table, {key_name: original[key_name] for key_name in key_names},
+                    update_kwargs["UpdateExpression"], update_kwargs.get("ConditionExpression"),
+                    update_kwargs["ExpressionAttributeNames"], update_kwargs.get("ExpressionAttributeValues"))
+        return True
+
+    def delete(self, table: Table, key: dict, condition_expression: str | None = None,
+               expression_attribute_names: dict[str, str] | None = None,
+               expression_attribute_values: dict[str, Any] | None = None):
+        request = _with_expression_kwargs({"Key": key}, condition_expression, expression_attribute_names,
+                                          expression_attribute_values)
+        self._add(table, key, "Delete", request)
+
+    def condition_check(self, table: Table, key: dict, condition_expression: str,
+                        expression_attribute_names: dict[str, str] | None = None,
+                        expression_attribute_values: dict[str, Any] | None = None):
+        """Make the transaction depend on an item it doesn't write, e.g. that it still exists"""
+        request = _with_expression_kwargs({"Key": key}, condition_expression, expression_attribute_names,
+                                          expression_attribute_values)
+        self._add(table, key, "ConditionCheck", request)
+
+    def _drop_committed(self, count: int):
+        """Forget the first count operations once they're written, so a later commit() doesn't replay them"""
+        self.operations = self.operations[count:]
+        self._descriptions = self._descriptions[count:]
+        self._keys = dict.fromkeys(list(self._keys)[count:])
+
+    def commit(self) -> int:
+        """
+        Write every collected operation
+        More than 100 operations are split into several transactions - each one is atomic, but not the set
+        If one fails, the transactions before it stay committed and are dropped from the writer,
+        so calling commit() again only retries the rest
+        :return: Number of transactions committed
+        """
+        if not self.operations:
+            return 0
+        chunks = range(0, len(self.operations), self.MAX_TRANSACTION_ITEMS)
+        if len(chunks) > 1:
+            print(f"WARNING: {len(self.operations)} operations are more than one transaction can hold - "
+                  f"committing them as {len(chunks)} separate transactions")
+        for committed, start in enumerate(chunks):
+            operations = self.operations[start:start + self.MAX_TRANSACTION_ITEMS]
+            try:
+                self._client.transact_write_items(TransactItems=operations)
+            except Exception as e:
+                reasons = e.response.get("CancellationReasons", []) if isinstance(e, ClientError) else []
+                details = [
+                    f"{description}: {reason.get('Code')} {reason.get('Message', '')}".strip()
+                    for description, reason in zip(self._descriptions[start:], reasons)
+                    if reason.get("Code") not in [None, "None"]
+                ]
+                self._drop_committed(start)
+                if not details:
+                    raise
+                summary = f"Transaction {committed + 1} of {len(chunks)} cancelled - nothing in it was written"
+                if committed:
+                    summary += (f", but {committed} earlier transaction(s) with {start} operations were committed "
+                                f"and have been removed from this writer")
+                raise RuntimeError(summary + ":\n" + "\n".join(details)) from e
+        self._drop_committed(len(self.operations))
+        return len(chunks)
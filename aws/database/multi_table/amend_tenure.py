@@ -6,6 +6,8 @@ from dateutil import parser
 from mypy_boto3_dynamodb.service_resource import Table
 
 from aws.authentication.generate_aws_resource import generate_aws_service
+from aws.database.dynamodb.utils.batch_get import batch_get
+from aws.database.dynamodb.utils.transact_writer import TransactWriter
 from enums.enums import Stage
 
 # Config - change these
@@ -54,14 +56,22 @@ def main():
     print(f"New value: {UPDATE_DATE}")
     _confirm("Correct?")
 
-    tenure = get_tenure_dynamodb(TENURE_ID)
+    dynamodb = generate_aws_service("dynamodb", STAGE)
+    tenure_table: Table = dynamodb.Table(TENURE_TABLE_NAME)
+    asset_table: Table = dynamodb.Table(PROPERTY_TABLE_NAME)
+    persons_table: Table = dynamodb.Table(PERSONS_TABLE_NAME)
+
+    tenure = get_tenure_dynamodb(tenure_table, TENURE_ID)
     original_date = tenure[PARAM_KEY_DYNAMO_TENURE]
 
     update_dynamodb = _confirm(f"Update {STAGE.value} DynamoDB?", kill=False)
     if update_dynamodb:
-        update_tenure_dynamodb(tenure)
-        update_property_dynamodb(tenure)
-        update_persons_dynamodb(tenure)
+        # Every confirmed change is committed together at the end, so the tables can't be left half updated
+        transaction = TransactWriter()
+        update_tenure_dynamodb(transaction, tenure_table, tenure)
+        update_property_dynamodb(transaction, asset_table, tenure)
+        update_persons_dynamodb(transaction, persons_table, tenure)
+        commit_dynamodb(transaction)
 
     update_es = _confirm(f"Update {STAGE.value} Elasticsearch?", kill=False)
     if update_es:
@@ -152,14 +162,23 @@ def update_property_elasticsearch(property_pk):
     update_item_by_pk_es(index, property_pk, update_obj)
 
 
-def get_tenure_dynamodb(primary_key=TENURE_ID) -> dict:
-    tenure_table: Table = generate_aws_service("dynamodb", STAGE).Table(TENURE_TABLE_NAME)
+def get_tenure_dynamodb(tenure_table: Table, primary_key=TENURE_ID) -> dict:
     tenure_item: dict = tenure_table.get_item(Key={"id": primary_key})["Item"]
     return tenure_item
 
 
-def update_tenure_dynamodb(tenure_item: dict):
-    tenure_table: Table = generate_aws_service("dynamodb", STAGE).Table(TENURE_TABLE_NAME)
+def commit_dynamodb(transaction: TransactWriter):
+    if len(transaction) == 0:
+        print("No DynamoDB changes to commit.")
+        return
+    if not _confirm(f"Commit {len(transaction)} DynamoDB updates in a single transaction?", kill=False):
+        print("DynamoDB not updated.")
+        return
+    transaction.commit()
+    print("DynamoDB updated!")
+
+
+def update_tenure_dynamodb(transaction: TransactWriter, tenure_table: Table, tenure_item: dict):
     print("\n== DynamoDB Item ==")
     pprint(tenure_item)
     print("== DynamoDB Item ==")
@@ -170,16 +189,16 @@ def update_tenure_dynamodb(tenure_item: dict):
         return
 
     tenure_id = tenure_item["id"]
-    tenure_table.update_item(
-        Key={"id": tenure_id},
-        UpdateExpression=f"set {PARAM_KEY_DYNAMO_TENURE} = :r",
-        ExpressionAttributeValues={":r": UPDATE_DATE},
-        ReturnValues="UPDATED_NEW",
+    transaction.update(
+        tenure_table,
+        key={"id": tenure_id},
+        update_expression=f"set {PARAM_KEY_DYNAMO_TENURE} = :r",
+        condition_expression="attribute_exists(id)",
+        expression_attribute_values={":r": UPDATE_DATE},
     )
 
 
-def update_property_dynamodb(tenure_item: dict):
-    asset_table: Table = generate_aws_service("dynamodb", STAGE).Table(PROPERTY_TABLE_NAME)
+def update_property_dynamodb(transaction: TransactWriter, asset_table: Table, tenure_item: dict):
     property_id: str = tenure_item["tenuredAsset"]["id"]
     property_item: dict = asset_table.get_item(Key={"id": property_id})["Item"]
     property_tenure = property_item["tenure"]
@@ -194,17 +213,17 @@ def update_property_dynamodb(tenure_item: dict):
         print("Tenure not updated.")
         return
 
-    property_tenure[PARAM_KEY_DYNAMO_ASSET] = UPDATE_DATE
-    asset_table.update_item(
-        Key={"id": property_id},
-        UpdateExpression=f"SET tenure = :r",
-        ExpressionAttributeValues={":r": property_tenure},
-        ReturnValues="UPDATED_NEW",
+    # Only update the property's tenure if it is still this tenure when the transaction commits
+    transaction.update(
+        asset_table,
+        key={"id": property_id},
+        update_expression=f"SET tenure.{PARAM_KEY_DYNAMO_ASSET} = :r",
+        condition_expression="tenure.id = :tenure_id",
+        expression_attribute_values={":r": UPDATE_DATE, ":tenure_id": tenure_item["id"]},
     )
 
 
-def update_persons_dynamodb(tenure_item: dict):
-    persons_table: Table = generate_aws_service("dynamodb", STAGE).Table(PERSONS_TABLE_NAME)
+def update_persons_dynamodb(transaction: TransactWriter, persons_table: Table, tenure_item: dict):
     tenure_id = tenure_item["id"]
 
     household_members: list[dict] = tenure_item["householdMembers"]
@@ -212,10 +231,12 @@ def update_persons_dynamodb(tenure_item: dict):
         print(f"No household members found in tenure {tenure_id}")
         return
 
+    person_items = batch_get(persons_table, [{"id": member["id"]} for member in household_members], key_names=["id"])
     for tenure_person in household_members:
-        person_item: dict = persons_table.get_item(Key={"id": tenure_person['id']})["Item"]
+        person_item: dict = person_items[tenure_person["id"]]
 
         person_tenures: list[dict] = person_item["tenures"]
+        tenure_indexes = []
         for i, tenure in enumerate(person_tenures):
             if tenure["id"] == tenure_id:
                 pprint(person_item)
@@ -224,16 +245,20 @@ def update_persons_dynamodb(tenure_item: dict):
                     f"Pending Update: tenure {PARAM_KEY_DYNAMO_PERSON}: "
                     f"{tenure.get(PARAM_KEY_DYNAMO_PERSON).split('T')[0]} -> {UPDATE_DATE.split('T')[0]}"
                 )
-                person_tenures[i][PARAM_KEY_DYNAMO_PERSON] = str(UPDATE_DATE).split("T")[0]
+                tenure_indexes.append(i)
                 print(tenure["assetFullAddress"])
         print(f"Update tenure for person {tenure_person['id']}, {tenure_person['fullName']}?")
 
-        if _confirm(f"Confirm updating this person's tenure {PARAM_KEY_DYNAMO_PERSON}?", kill=False):
-            persons_table.update_item(
-                Key={"id": tenure_person["id"]},
-                UpdateExpression=f"set tenures = :r",
-                ExpressionAttributeValues={":r": person_tenures},
-                ReturnValues="UPDATED_NEW",
+        if tenure_indexes and _confirm(f"Confirm updating this person's tenure {PARAM_KEY_DYNAMO_PERSON}?", kill=False):
+            # Only the matching tenures are set, and only if they are still at the same positions in the list
+            values = {":r": str(UPDATE_DATE).split("T")[0], ":tenure_id": tenure_id}
+            transaction.update(
+                persons_table,
+                key={"id": tenure_person["id"]},
+                update_expression="set " + ", ".join(
+                    f"tenures[{i}].{PARAM_KEY_DYNAMO_PERSON} = :r" for i in tenure_indexes),
+                condition_expression=" AND ".join(f"tenures[{i}].id = :tenure_id" for i in tenure_indexes),
+                expression_attribute_values=values,
             )
 
 
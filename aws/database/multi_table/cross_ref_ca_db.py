@@ -1,10 +1,10 @@
 import csv
+import uuid
 from datetime import date
 
-from mypy_boto3_dynamodb import ServiceResource
 from mypy_boto3_dynamodb.service_resource import Table
 
-from aws.authentication.generate_aws_resource import generate_aws_service
+from aws.database.dynamodb.utils.batch_get import batch_get
 from aws.database.dynamodb.utils.get_dynamodb_table import get_dynamodb_table
 from aws.utils.csv_to_dict_list import csv_to_dict_list
 from aws.utils.logger import Logger
@@ -25,29 +25,18 @@ def is_uuid_valid(uuid_to_test):
 
 
 def persons_from_ca(cautionary_alerts: list[dict], person_table: Table) -> list[dict]:
-    persons = []
-
     mmh_ids = list(set([alert["mmh_id"] for alert in cautionary_alerts if is_uuid_valid(alert["mmh_id"])]))
 
     # mmh_ids = mmh_ids[0:100]
 
     person_ids = [{"id": mmh_id} for mmh_id in mmh_ids]
-    for i in range(0, len(person_ids), 100):
-        batch_keys = person_ids[i:i + 100]
-        response = dynamo_resource.batch_get_item(RequestItems={
-            person_table.name: {
-                "Keys": batch_keys
-            },
-        })
-        persons.extend([person for person in response["Responses"][person_table.name]])
+    persons = list(batch_get(person_table, person_ids, key_names=["id"]).values())
     for i, person in enumerate(persons):
         person["matchId"] = i
     return persons
 
 
 def tenures_from_persons(persons: list[dict], tenure_table: Table) -> list[dict]:
-    tenures = []
-
     def is_tenure_active(tenure: dict) -> bool:
         if tenure["endDate"] is None:
             return True
@@ -73,13 +62,7 @@ def tenures_from_persons(persons: list[dict], tenure_table: Table) -> list[dict]
     tenure_ids = [get_active_tenure_id(person) for person in persons if get_active_tenure_id(person) is not None]
 
     tenure_keys = [{"id": tenure_ids} for tenure_ids in tenure_ids]
-    for i in range(0, len(tenure_keys), 100):
-        response = dynamo_resource.batch_get_item(RequestItems={
-            tenure_table.name: {
-                "Keys": tenure_keys[i:i + 100]
-            },
-        })
-        tenures.extend([tenure for tenure in response["Responses"][tenure_table.name]])
+    tenures = list(batch_get(tenure_table, tenure_keys, key_names=["id"]).values())
     for i, tenure in enumerate(tenures):
         tenure["matchId"] = i
     for tenure in tenures:
@@ -102,7 +85,6 @@ def main():
     _file_path = "../data/cautionary_alerts.csv"
     alert_csv_data = csv_to_dict_list(_file_path)
 
-    dynamo_resource: ServiceResource = generate_aws_service("dynamodb", STAGE)
     person_table: Table = get_dynamodb_table("Persons", STAGE)
     tenure_table: Table = get_dynamodb_table("TenureInformation", STAGE)
     asset_table: Table = get_dynamodb_table("Assets", STAGE)
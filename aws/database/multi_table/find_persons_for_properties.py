@@ -3,14 +3,21 @@ import re
 
 from mypy_boto3_dynamodb.service_resource import Table
 
-from aws.database.dynamodb.utils.get_by_secondary_index import get_by_secondary_index
+from aws.database.dynamodb.utils.get_by_secondary_index import get_by_secondary_index_bulk
 from aws.database.dynamodb.utils.get_dynamodb_table import get_dynamodb_table
-from aws.utils.csv_to_dict_list import csv_to_dict_list
+from aws.database.dynamodb.utils.offline_index import OfflineIndex
+from aws.utils.csv_to_dict_list import load_csv_rows
 from aws.utils.logger import Logger
 from aws.utils.progress_bar import ProgressBar
 from enums.enums import Stage
 
 STAGE = Stage.HOUSING_PRODUCTION
+# Set to a directory made by build_offline_index to look up assets and tenures in table exports instead of DynamoDB
+OFFLINE_INDEX_PATH: str | None = None
+
+ALERT_SCHEMA = {
+    "Property Reference": "prop_ref", "Name": "str", "Action on Assure": "str", "OUTCOME": "str", "Lookup": "str"
+}
 
 logger = Logger()
 
@@ -86,17 +93,22 @@ def set_person_ids_in_alert_data(asset_table: Table, tenure_table: Table, alerts
     Iterate through the alerts and set the personId for each alert
     :return: A dictionary containing the updated alerts and the alerts that failed to update
     """
+    asset_ids = [clean_asset_id(alert_item["Property Reference"]) for alert_item in alerts_from_csv]
+    assets_by_asset_id = get_by_secondary_index_bulk(
+        asset_table, "AssetId", "assetId", [asset_id for asset_id in asset_ids if asset_id is not None],
+        projection_expression="assetId, tenure"
+    )
+
     progress_bar = ProgressBar(len(alerts_from_csv))
     for i, alert_item in enumerate(alerts_from_csv):
         if i % 10 == 0:
             progress_bar.display(i)
-        asset_id = alert_item["Property Reference"]
-        asset_id = clean_asset_id(asset_id)
+        asset_id = asset_ids[i]
         if asset_id is None:
             alert_item["failed_reason"] = f"Invalid assetId: {alert_item['Property Reference']}. " \
                                           f"Alert name: {alert_item['Name']}"
             continue
-        results = get_by_secondary_index(asset_table, "AssetId", "assetId", asset_id)
+        results = assets_by_asset_id[asset_id]
         if len(results) > 1:
             alert_item["failed_reason"] = f"Multiple assets found for assetId {alert_item['Property Reference']}. " \
                                           f"Alert name: {alert_item['Name']}"
@@ -123,7 +135,8 @@ def set_person_ids_in_alert_data(asset_table: Table, tenure_table: Table, alerts
 
 def main():
     _file_path = "../data/input/spreadsheet_alerts_v2.csv"
-    alert_data = csv_to_dict_list(_file_path)
+    # Free text columns are kept as strings, so property references keep their leading zeros
+    alert_data = load_csv_rows(_file_path, schema=ALERT_SCHEMA, decode_json=False)
 
     for alert in alert_data:
         alert["failed_reason"] = None
@@ -135,8 +148,13 @@ def main():
     for alert in alerts_to_be_processed:
         set_assure_ref_for_alert(alert)
 
-    tenure_table: Table = get_dynamodb_table("TenureInformation", STAGE)
-    asset_table: Table = get_dynamodb_table("Assets", STAGE)
+    if OFFLINE_INDEX_PATH:
+        offline_index = OfflineIndex(OFFLINE_INDEX_PATH)
+        tenure_table = offline_index.table("TenureInformation")
+        asset_table = offline_index.table("Assets")
+    else:
+        tenure_table: Table = get_dynamodb_table("TenureInformation", STAGE)
+        asset_table: Table = get_dynamodb_table("Assets", STAGE)
     set_person_ids_in_alert_data(asset_table, tenure_table, alert_data)
 
     with open("../data/output/fixed_alerts.csv", "w") as output_file:
@@ -21,13 +21,16 @@ from typing import TypedDict, cast
 from boto3 import Session
 from mypy_boto3_ssm import SSMClient
 from aws.authentication.generate_aws_resource import get_session_for_stage
-from aws.database.dynamodb.utils.get_by_secondary_index import get_by_secondary_index
+from aws.database.dynamodb.utils.get_by_secondary_index import (
+    count_by_secondary_index_bulk,
+    get_by_secondary_index_bulk,
+)
 from enums.enums import Stage
 import os
 import requests
 import json
 
-from aws.database.opensearch.client.elasticsearch_client import create_client
+from aws.database.opensearch.client.elasticsearch_client import LocalElasticsearchClient
 from utils.confirm import confirm
 
 
@@ -157,16 +160,26 @@ def generate_fixups(stage: Stage, session: Session) -> list[Fixup]:
     tenancies_to_fix = tsv_to_file_rows("tenancies_to_fix.tsv")
 
     fixups: list[Fixup] = []
+    prop_refs = [sheet_tenancy["property_ref"] for sheet_tenancy in tenancies_to_fix]
+
+    # Every property reference must match exactly one asset - checked with counts before any assets are read
+    asset_counts = count_by_secondary_index_bulk(assets_table, "AssetId", "assetId", prop_refs)
+    unmatched = {prop_ref: count for prop_ref, count in asset_counts.items() if count != 1}
+    assert not unmatched, f"Property references without exactly one asset: {unmatched}"
+
+    assets_by_prop_ref = get_by_secondary_index_bulk(
+        assets_table,
+        "AssetId",
+        "assetId",
+        prop_refs,
+        projection_expression="id, tenure",
+    )
 
     for sheet_tenancy in tenancies_to_fix:
         print(f"Getting tenancy for property: {sheet_tenancy['property_ref']}")
 
         # - Get current asset assigned to tenure
-        assets = get_by_secondary_index(
-            assets_table, "AssetId", "assetId", sheet_tenancy["property_ref"]
-        )
-        assert len(assets) == 1, assets
-        asset = assets[0]
+        asset = assets_by_prop_ref[sheet_tenancy["property_ref"]][0]
         assert "tenure" in asset, asset
 
         current_asset_tenure: AssetTenure = {
@@ -242,7 +255,7 @@ def update_asset_tenures_from_fixups(session: Session, fixups: list[Fixup]) -> N
         # The first is the most recent tenure
         proposed_new_tenure = fixup["new_tenures"][0]
 
-        current_tenure_id = current_asset.get("tenure", {}).get("id")
+        current_tenure_id = (current_asset.get("tenure") or {}).get("id")
         assert current_tenure_id is not None, current_asset
         if current_tenure_id == proposed_new_tenure["id"]:
             print(
@@ -265,18 +278,25 @@ def update_asset_tenures_from_fixups(session: Session, fixups: list[Fixup]) -> N
 
 
 def update_elasticsearch_from_fixups(fixups: list[Fixup]) -> None:
-    index_ = "assets"
-    es_client = create_client(index_, ES_PORT)
+    es_client = LocalElasticsearchClient("assets", ES_PORT)
+
+    # Current search assets are fetched in chunks, updates are confirmed one by one, then sent together in bulk
+    current_assets, missing_ids = es_client.mget([fixup["prop_id"] for fixup in fixups], source=["id", "tenure"])
+    for missing_id in missing_ids:
+        print(f"Property {missing_id} not found in the assets index, skipping")
 
+    tenure_updates: list[tuple[str, dict]] = []
     for fixup in fixups:
         # The first is the most recent tenure
         proposed_new_tenure = fixup["new_tenures"][0]
 
-        current_asset = cast(dict, es_client.get(index_, fixup["prop_id"]))["_source"]
+        if fixup["prop_id"] not in current_assets:
+            continue
+        current_asset = current_assets[fixup["prop_id"]]
         assert current_asset["id"] == fixup["prop_id"], current_asset
 
         # if the tenure ids are the same, skip
-        current_tenure_id = current_asset.get("tenure", {}).get("id")
+        current_tenure_id = (current_asset.get("tenure") or {}).get("id")
         assert current_tenure_id is not None, current_asset
         if current_tenure_id == proposed_new_tenure["id"]:
             print(
@@ -286,12 +306,22 @@ def update_elasticsearch_from_fixups(fixups: list[Fixup]) -> None:
 
         if confirm(
             f"Update asset search tenure for property {fixup['prop_id']} from \n"
-            f"{json.dumps(current_asset.get("tenure", {}), indent=4)} -> \n"
+            f"{json.dumps(current_asset.get('tenure'), indent=4)} -> \n"
             f"{json.dumps(proposed_new_tenure, indent=4)}?"
         ):
-            es_client.update(
-                index_, fixup["prop_id"], body={"doc": {"tenure": proposed_new_tenure}}
-            )
+            tenure_updates.append((fixup["prop_id"], {"tenure": proposed_new_tenure}))
+
+    report = es_client.bulk_update(tenure_updates)
+    for error in report.errors:
+        print(f"Failed to update asset search tenure for property {error['id']}: {error['error']}")
+
+    # Read the updated assets back to check the new tenures were saved
+    updated_assets, missing_ids = es_client.mget([doc_id for doc_id, _ in tenure_updates], source=["tenure.id"])
+    for doc_id, update in tenure_updates:
+        saved_tenure_id = (updated_assets.get(doc_id, {}).get("tenure") or {}).get("id")
+        if saved_tenure_id != update["tenure"]["id"]:
+            print(f"WARNING: Property {doc_id} has tenure {saved_tenure_id} in search, "
+                  f"expected {update['tenure']['id']}")
 
 
 def verify_work_complete(stage: Stage, fixups: list[Fixup]) -> None:
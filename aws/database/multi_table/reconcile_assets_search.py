@@ -0,0 +1,170 @@
+"""
+Compare every asset in the Assets DynamoDB table with its document in the assets search index, in one pass.
+
+1. The Assets table is read with a parallel scan, and the assets index with a scroll - only the compared fields
+2. Both sides are hash partitioned by asset id into temporary files, so only one partition is in memory at a time
+3. Each partition is joined by id, and the differences are written to a TSV file:
+   - missing: in DynamoDB but not in the search index
+   - extra: in the search index but not in DynamoDB
+   - mismatch: in both, but a compared field differs (one row per field)
+
+Requirements:
+- Port forwarding to the housing search Elasticsearch on Config.ES_PORT - see Makefile
+- AWS CLI profile with the necessary permissions
+"""
+
+import csv
+import json
+import os
+import tempfile
+import zlib
+from dataclasses import dataclass
+from typing import Any, Iterable, TextIO
+
+from aws.database.domain.sanitise_item import sanitise_for_elasticsearch
+from aws.database.dynamodb.utils.dynamodb_to_csv import projection_for_headings
+from aws.database.dynamodb.utils.get_dynamodb_table import get_dynamodb_table
+from aws.database.dynamodb.utils.parallel_scan import ParallelScanner
+from aws.database.opensearch.client.elasticsearch_client import LocalElasticsearchClient
+from aws.utils.logger import Logger
+from enums.enums import Stage
+
+
+@dataclass
+class Config:
+    STAGE = Stage.HOUSING_DEVELOPMENT
+    TABLE_NAME = "Assets"
+    INDEX_NAME = "assets"
+    ES_PORT = 9200
+    TOTAL_SEGMENTS = 8
+    SEARCH_PAGE_SIZE = 5000
+    # More partitions means less memory when joining, at the cost of more open files while partitioning
+    PARTITIONS = 64
+    # Temporary partition files are written here - None for the system temp directory
+    WORK_DIR = None
+    OUTPUT_FILE = "output/assets_search_reconciliation.tsv"
+    # Dotted paths of the fields compared between DynamoDB and the search index
+    COMPARED_FIELDS = ["assetId", "tenure.id", "assetAddress"]
+    LOGGER = Logger("reconcile_assets_search")
+
+
+def get_path(item: dict, path: str) -> Any:
+    """The value at a dotted path such as tenure.id, or None if any part of it is missing"""
+    value = item
+    for attribute in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(attribute)
+    return value
+
+
+def normalise(value: Any) -> Any:
+    """
+    A value in a form that compares the same from both sides
+    None values and empty strings are dropped from maps, as the search index leaves them out
+    """
+    value = sanitise_for_elasticsearch(value)
+    if isinstance(value, dict):
+        return {key: normalise(element) for key, element in value.items() if element != ""}
+    return None if value == "" else value
+
+
+def compared_fields(item: dict) -> dict:
+    return {path: normalise(get_path(item, path)) for path in Config.COMPARED_FIELDS}
+
+
+class Partitions:
+    def __init__(self, directory: str, side: str, count: int):
+        """
+        Writes records to one of count JSON lines files, chosen by hashing the record's id
+        :param directory: Directory to write the files to
+        :param side: Name of this side of the comparison, used in the file names
+        """
+        self.paths = [os.path.join(directory, f"{side}_{partition}.jsonl") for partition in range(count)]
+        self._files: list[TextIO | None] = [None] * count
+        self.count = 0
+
+    def write(self, item_id: str, fields: dict):
+        # crc32 rather than hash(), which is salted per process
+        partition = zlib.crc32(item_id.encode("utf-8")) % len(self.paths)
+        if self._files[partition] is None:
+            self._files[partition] = open(self.paths[partition], "w", buffering=1024 * 1024)
+        self._files[partition].write(json.dumps({"id": item_id, "fields": fields}) + "\n")
+        self.count += 1
+
+    def close(self):
+        for f in self._files:
+            if f is not None:
+                f.close()
+
+    def read(self, partition: int) -> Iterable[dict]:
+        if not os.path.exists(self.paths[partition]):
+            return
+        with open(self.paths[partition]) as f:
+            for line in f:
+                yield json.loads(line)
+
+
+def partition_dynamodb_assets(partitions: Partitions):
+    table = get_dynamodb_table(Config.TABLE_NAME, Config.STAGE, config_profile="parallel-scan")
+    top_level_attributes = list(dict.fromkeys(["id"] + [path.split(".")[0] for path in Config.COMPARED_FIELDS]))
+    projection_expression, expression_attribute_names = projection_for_headings(top_level_attributes)
+    scanner = ParallelScanner(table, total_segments=Config.TOTAL_SEGMENTS, logger=Config.LOGGER,
+                              ProjectionExpression=projection_expression,
+                              ExpressionAttributeNames=expression_attribute_names)
+    for asset in scanner.items():
+        partitions.write(asset["id"], compared_fields(asset))
+    partitions.close()
+    Config.LOGGER.log(f"Partitioned {partitions.count} assets from {Config.TABLE_NAME}")
+
+
+def partition_search_assets(partitions: Partitions):
+    es_client = LocalElasticsearchClient(Config.INDEX_NAME, Config.ES_PORT)
+    for hits in es_client.scan_pages(page_size=Config.SEARCH_PAGE_SIZE, source=Config.COMPARED_FIELDS):
+        for hit in hits:
+            partitions.write(hit["_id"], compared_fields(hit.get("_source", {})))
+    partitions.close()
+    Config.LOGGER.log(f"Partitioned {partitions.count} documents from the {Config.INDEX_NAME} index")
+
+
+def reconcile_partition(dynamodb_records: Iterable[dict], search_records: Iterable[dict]) -> Iterable[list[str]]:
+    """Output rows for one partition - the DynamoDB side is held in memory, the search side is streamed past it"""
+    dynamodb_fields = {record["id"]: record["fields"] for record in dynamodb_records}
+    for record in search_records:
+        fields = dynamodb_fields.pop(record["id"], None)
+        if fields is None:
+            yield [record["id"], "extra", "assetId", "", json.dumps(record["fields"].get("assetId"))]
+            continue
+        for path in Config.COMPARED_FIELDS:
+            if fields.get(path) != record["fields"].get(path):
+                yield [record["id"], "mismatch", path, json.dumps(fields.get(path)),
+                       json.dumps(record["fields"].get(path))]
+    for asset_id, fields in dynamodb_fields.items():
+        yield [asset_id, "missing", "assetId", json.dumps(fields.get("assetId")), ""]
+
+
+def reconcile_assets_search():
+    os.makedirs(os.path.dirname(Config.OUTPUT_FILE) or ".", exist_ok=True)
+    counts = {"missing": 0, "extra": 0, "mismatch": 0}
+    with tempfile.TemporaryDirectory(dir=Config.WORK_DIR) as work_dir:
+        dynamodb_partitions = Partitions(work_dir, "dynamodb", Config.PARTITIONS)
+        search_partitions = Partitions(work_dir, "search", Config.PARTITIONS)
+        partition_dynamodb_assets(dynamodb_partitions)
+        partition_search_assets(search_partitions)
+
+        with open(Config.OUTPUT_FILE, "w", newline="") as output_file:
+            writer = csv.writer(output_file, delimiter="\t", lineterminator="\n")
+            writer.writerow(["id", "status", "field", "dynamodb_value", "search_value"])
+            for partition in range(Config.PARTITIONS):
+                rows = reconcile_partition(dynamodb_partitions.read(partition), search_partitions.read(partition))
+                for row in rows:
+                    counts[row[1]] += 1
+                    writer.writerow(row)
+
+    Config.LOGGER.log(f"{dynamodb_partitions.count} assets in DynamoDB, {search_partitions.count} in search - "
+                      f"{counts['missing']} missing from search, {counts['extra']} only in search, "
+                      f"{counts['mismatch']} field mismatches. Written to {Config.OUTPUT_FILE}")
+
+
+if __name__ == "__main__":
+    reconcile_assets_search()
@@ -1,11 +1,12 @@
 import datetime
-from typing import Any
 
 from mypy_boto3_dynamodb.service_resource import Table
 from progress.bar import Bar
 from sqlalchemy import select, tuple_
 
+from aws.authentication.client_config import client_config
 from aws.authentication.generate_aws_resource import get_session_for_stage
+from aws.database.dynamodb.utils.parallel_scan import ParallelScanner
 from aws.database.rds.propref_paymentref.entities.propref_paymentref import (
     ProprefPaymentref,
 )
@@ -15,32 +16,29 @@ from aws.database.rds.propref_paymentref.session_for_propref_paymentref import (
 from enums.enums import Stage
 
 STAGE = Stage.HOUSING_DEVELOPMENT
+TOTAL_SEGMENTS = 8
 
 
 def restore_propref_paymentref():
     """
-    1. Iteratively scan the TenureInformation table for items with a propref and paymentref
+    1. Scan the TenureInformation table in parallel segments for items with a propref and paymentref
     2. For each item, update the propref_paymentref table with the propref and paymentref values
     """
     aws_session = get_session_for_stage(STAGE)
-    tenure_table: Table = aws_session.resource("dynamodb").Table("TenureInformation")
-    scan_kwargs: dict[str, Any] = {
-        "ProjectionExpression": "id, tenuredAsset, paymentReference",
-    }
+    tenure_table: Table = aws_session.resource("dynamodb", config=client_config("parallel-scan")).Table("TenureInformation")
+    scanner = ParallelScanner(
+        tenure_table,
+        total_segments=TOTAL_SEGMENTS,
+        log_every=0,
+        ProjectionExpression="id, tenuredAsset, paymentReference",
+    )
 
-    start_key = None
     total_estimated = tenure_table.item_count
     progress_bar = Bar("Restoring propref_paymentref", max=total_estimated)
 
     Session = session_for_propref_paymentref(STAGE)
     with Session() as session:
-        while True:
-            if start_key:
-                scan_kwargs["ExclusiveStartKey"] = start_key
-
-            response = tenure_table.scan(**scan_kwargs)
-            items = response.get("Items", [])
-
+        for _, items in scanner.pages():
             # 1. Collect all candidates from this page
             candidate_map = {}
             for item in items:
@@ -87,10 +85,6 @@ def restore_propref_paymentref():
 
                 session.commit()
 
-            start_key = response.get("LastEvaluatedKey", None)
-            if not start_key:
-                break
-
     progress_bar.finish()
 
 
@@ -1,6 +1,7 @@
 
 from mypy_boto3_dynamodb.service_resource import Table
 
+from aws.database.dynamodb.utils.batch_get import batch_get
 from aws.database.dynamodb.utils.get_dynamodb_table import get_dynamodb_table
 from aws.utils.csv_to_dict_list import csv_to_dict_list
 from enums.enums import Stage
@@ -16,6 +17,8 @@ def update_cautionary_alert_from_csv_if_tenure_with_alerts_inactive(person_table
     2. check if there is an end date within the tenure object
     3. if so remove the property details from the csv
     """
+    mmh_ids = [alert_item["mmh_id"] for alert_item in alerts_from_csv if alert_item["mmh_id"]]
+    persons = batch_get(person_table, [{"id": mmh_id} for mmh_id in mmh_ids], key_names=["id"])
 
     for alert_item in alerts_from_csv:
         alert_id = alert_item["id"]
@@ -23,7 +26,10 @@ def update_cautionary_alert_from_csv_if_tenure_with_alerts_inactive(person_table
         if mmh_id is '' or None:
             alert_item["failed_reason"] = f"mmh_id is null for id {alert_id}"
             continue
-        person = person_table.get_item(Key={"id": mmh_id}).get("Item")
+        person = persons.get(mmh_id)
+        if person is None:
+            alert_item["failed_reason"] = f"Person {mmh_id} not found for id {alert_id}"
+            continue
         tenures = person["tenures"]
         for tenure_in_person in tenures:
             end_date = tenure_in_person["endDate"]
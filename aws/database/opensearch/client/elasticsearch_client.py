@@ -1,5 +1,8 @@
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Iterator
+
 import elasticsearch
-from elasticsearch import Elasticsearch
+from elasticsearch import Elasticsearch, helpers
 
 import urllib3
 
@@ -30,7 +33,25 @@ def create_client(index: str | None, port: int = 3333) -> Elasticsearch:
     return es_instance
 
 
+@dataclass
+class BulkReport:
+    """Outcome of a bulk request - one error per document that failed"""
+    succeeded: int = 0
+    errors: list[dict] = field(default_factory=list)
+
+    @property
+    def failed(self) -> int:
+        return len(self.errors)
+
+    def __str__(self) -> str:
+        return f"{self.succeeded} succeeded, {self.failed} failed"
+
+
 class LocalElasticsearchClient:
+    # Bulk requests are split at whichever limit is reached first
+    BULK_CHUNK_SIZE = 500
+    BULK_MAX_CHUNK_BYTES = 10 * 1024 * 1024
+
     def __init__(self, index: str | None, port: int = 3333):
         """
         Create a connection to a local Elasticsearch instance
@@ -48,15 +69,75 @@ class LocalElasticsearchClient:
         """Return a document in an index by its ID"""
         return self.es_instance.get(index=self._index, id=doc_id)
 
-    def query(self, query: dict, size: int = 1000) -> list:
-        """Return all documents in an index matching a query"""
-        query = {"query": query}
+    def mget(self, doc_ids: Iterable[str], chunk_size: int = 1000,
+             source: list[str] | None = None) -> tuple[dict[str, dict], list[str]]:
+        """
+        Fetch many documents by ID with the _mget endpoint - one request per chunk of IDs
+        :param doc_ids: Document IDs to fetch - duplicates are only fetched once
+        :param chunk_size: IDs per request
+        :param source: Only return these fields of each document
+        :return: Each found document's _source by ID, and the IDs that weren't found
+        """
+        doc_ids = list(dict.fromkeys(doc_ids))
+        found: dict[str, dict] = {}
+        missing: list[str] = []
+        for start in range(0, len(doc_ids), chunk_size):
+            body = {"ids": doc_ids[start:start + chunk_size]}
+            kwargs = {"_source": source} if source is not None else {}
+            response = self.es_instance.mget(body=body, index=self._index, **kwargs)
+            for doc in response["docs"]:
+                if doc.get("found"):
+                    found[doc["_id"]] = doc.get("_source", {})
+                else:
+                    missing.append(doc["_id"])
+        return found, missing
+
+    def query(self, query: dict, size: int = 1000, source: list[str] | None = None) -> list:
+        """
+        Return documents in an index matching a query, up to the size limit
+        Elasticsearch caps size at 10,000 - use scan to read every match
+        :param source: Only return these fields of each document
+        """
+        query = {"query": query, "size": size}
+        if source is not None:
+            query["_source"] = source
         res = self.es_instance.search(index=self._index, body=query)
         print(
             f"Found {len(res['hits']['hits'])} documents in {self._index} out of {res['hits']['total']['value']}"
         )
         return res["hits"]["hits"]
 
+    def scan_pages(self, query: dict | None = None, page_size: int = 1000, source: list[str] | None = None,
+                   scroll: str = "5m") -> Iterator[list[dict]]:
+        """
+        Read every document matching a query, one page of hits at a time, using a scroll
+        Only one page is held at once, so a whole index can be read with constant memory
+        :param query: Query to match - defaults to every document
+        :param page_size: Hits per page
+        :param source: Only return these fields of each document
+        :param scroll: How long Elasticsearch keeps the scroll open between pages
+        """
+        # Sorting by _doc is the cheapest order to scroll in
+        body = {"query": query or {"match_all": {}}, "sort": ["_doc"], "size": page_size}
+        if source is not None:
+            body["_source"] = source
+        response = self.es_instance.search(index=self._index, body=body, scroll=scroll)
+        scroll_id = response.get("_scroll_id")
+        try:
+            while response["hits"]["hits"]:
+                yield response["hits"]["hits"]
+                response = self.es_instance.scroll(body={"scroll_id": scroll_id, "scroll": scroll})
+                scroll_id = response.get("_scroll_id", scroll_id)
+        finally:
+            if scroll_id:
+                self.es_instance.clear_scroll(body={"scroll_id": [scroll_id]}, ignore=(404,))
+
+    def scan(self, query: dict | None = None, page_size: int = 1000, source: list[str] | None = None,
+             scroll: str = "5m") -> Iterator[dict]:
+        """Every hit matching a query, fetched page by page - see scan_pages"""
+        for hits in self.scan_pages(query, page_size, source, scroll):
+            yield from hits
+
     def index(self, doc_id: str, body: dict):
         """Put a document in an index"""
         self.es_instance.index(index=self._index, id=doc_id, body=body)
@@ -69,6 +150,62 @@ class LocalElasticsearchClient:
         """Delete a document in an index"""
         self.es_instance.delete(index=self._index, id=doc_id)
 
+    def bulk(self, actions: Iterable[dict], parallel: bool = False, thread_count: int = 4,
+             chunk_size: int | None = None, max_chunk_bytes: int | None = None,
+             on_error: Callable[[dict], Any] | None = None) -> BulkReport:
+        """
+        Send actions through the _bulk endpoint, in chunks bounded by count and size
+        Actions are read lazily, so a generator of any length can be passed
+        :param actions: Bulk actions, e.g. {"_op_type": "index", "_id": ..., "_source": {...}} - _index defaults to
+            this client's index
+        :param parallel: Send chunks from a thread pool instead of one at a time
+        :param thread_count: Number of threads when parallel
+        :param chunk_size: Maximum actions per request
+        :param max_chunk_bytes: Maximum request body size
+        :param on_error: Called with each failed item as it comes back, as well as it being in the report
+        :return: How many actions succeeded, and the error for each that didn't
+        """
+        actions = ({"_index": self._index, **action} for action in actions)
+        options = {
+            "chunk_size": chunk_size or self.BULK_CHUNK_SIZE,
+            "max_chunk_bytes": max_chunk_bytes or self.BULK_MAX_CHUNK_BYTES,
+            "raise_on_error": False,
+            "raise_on_exception": False,
+        }
+        if parallel:
+            results = helpers.parallel_bulk(self.es_instance, actions, thread_count=thread_count, **options)
+        else:
+            results = helpers.streaming_bulk(self.es_instance, actions, max_retries=3, **options)
+
+        report = BulkReport()
+        for ok, result in results:
+            if ok:
+                report.succeeded += 1
+                continue
+            (op_type, item), = result.items()
+            error = {"id": item.get("_id"), "action": op_type, "status": item.get("status"),
+                     "error": item.get("error") or str(item.get("exception"))}
+            report.errors.append(error)
+            if on_error is not None:
+                on_error(error)
+        print(f"Bulk request to {self._index}: {report}")
+        return report
+
+    def bulk_index(self, docs: Iterable[dict], id_attribute: str = "id", **bulk_kwargs) -> BulkReport:
+        """Put many documents in the index, using each one's id_attribute as its document ID - see bulk"""
+        return self.bulk(
+            ({"_op_type": "index", "_id": doc[id_attribute], "_source": doc} for doc in docs), **bulk_kwargs
+        )
+
+    def bulk_update(self, updates: Iterable[tuple[str, dict]], **bulk_kwargs) -> BulkReport:
+        """Update many documents from (document ID, partial document) pairs - see bulk"""
+        return self.bulk(({"_op_type": "update", "_id": doc_id, "doc": body} for doc_id, body in updates),
+                         **bulk_kwargs)
+
+    def bulk_delete(self, doc_ids: Iterable[str], **bulk_kwargs) -> BulkReport:
+        """Delete many documents by ID - ones that don't exist are reported as errors, see bulk"""
+        return self.bulk(({"_op_type": "delete", "_id": doc_id} for doc_id in doc_ids), **bulk_kwargs)
+
     def match_all(self, size: int = 1000) -> list:
         """Return all documents in an index up to the size limit"""
         query = {"match_all": {}}
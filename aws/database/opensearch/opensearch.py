@@ -4,7 +4,7 @@ from aws.authentication.generate_aws_resource import generate_aws_service
 from enums.enums import Stage
 
 def opensearch():
-    os: OpenSearchServiceClient = generate_aws_service("opensearch", Stage.HOUSING_DEVELOPMENT, "client")
+    os: OpenSearchServiceClient = generate_aws_service("opensearch", Stage.HOUSING_DEVELOPMENT, "interactive")
     domains = os.list_domain_names()['DomainNames']
     print([domain['DomainName'] for domain in domains])
     result = os.describe_domain(DomainName="housing-search-api-es")
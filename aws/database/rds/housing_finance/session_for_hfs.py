@@ -26,7 +26,7 @@ def session_for_hfs(stage: Stage, expire_on_commit=True, local_port=1433) -> ses
     pg_username_path = f"/housing-finance/{stage.to_env_name()}/db-username"
     pg_password_path = f"/housing-finance/{stage.to_env_name()}/db-password"
 
-    ssm: SSMClient = generate_aws_service('ssm', stage, 'client')
+    ssm: SSMClient = generate_aws_service('ssm', stage)
     username = ssm.get_parameter(Name=pg_username_path)['Parameter']['Value']
     password = ssm.get_parameter(Name=pg_password_path)['Parameter']['Value']
 
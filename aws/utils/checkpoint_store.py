@@ -0,0 +1,185 @@
+import atexit
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+SYNCHRONOUS_MODES = ("OFF", "NORMAL", "FULL")
+
+
+class CheckpointStore:
+    def __init__(self, file_path: str, commit_every: int = 500, synchronous: str = "NORMAL",
+                 legacy_csv: str | None = None):
+        """
+        Records which keys a batch job has processed in a SQLite file, so a rerun can skip them
+        Writes are buffered and committed in batches, and anything pending is committed on exit
+        :param file_path: Path to the SQLite file - created if it doesn't exist
+        :param commit_every: Number of records to buffer before committing
+        :param synchronous: SQLite's synchronous setting - with WAL, NORMAL survives the job crashing and FULL
+            also survives a power cut. OFF is a little faster, but a crash of the machine can corrupt the file
+        :param legacy_csv: A processed ids CSV written before the job used a CheckpointStore
+            - if it exists, it's imported the first time the store is opened with it
+        """
+        if synchronous not in SYNCHRONOUS_MODES:
+            raise ValueError(f"Unknown synchronous mode {synchronous} - valid modes are {list(SYNCHRONOUS_MODES)}")
+        self.file_path = file_path
+        self.commit_every = commit_every
+
+        os.makedirs(Path(file_path).parent, exist_ok=True)
+        self._connection = sqlite3.connect(file_path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        self._connection.execute(f"PRAGMA synchronous = {synchronous}")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS checkpoints ("
+            "key TEXT PRIMARY KEY, success INTEGER NOT NULL, reason TEXT NOT NULL DEFAULT '', "
+            "updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+        )
+        self._connection.execute("CREATE TABLE IF NOT EXISTS imported_files (path TEXT PRIMARY KEY)")
+        self._connection.commit()
+
+        self._lock = threading.Lock()
+        self._pending: list[tuple[str, int, str]] = []
+        self._keys: set[str] | None = None
+        atexit.register(self.close)
+        if legacy_csv is not None and os.path.exists(legacy_csv):
+            self.import_csv(legacy_csv)
+
+    def __enter__(self) -> "CheckpointStore":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._loaded_keys()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._loaded_keys())
+
+    def _loaded_keys(self) -> set[str]:
+        # Every key is read into memory once, so membership checks during a run never touch the disk
+        if self._keys is None:
+            self._keys = {row[0] for row in self._connection.execute("SELECT key FROM checkpoints")}
+            # Records not committed yet count as processed too
+            self._keys.update(key for key, _, _ in self._pending)
+        return self._keys
+
+    def record(self, key: str, success: bool, reason: str = ""):
+        """Record the outcome for a key - recording the same key again replaces its earlier outcome"""
+        with self._lock:
+            self._pending.append((str(key), int(success), reason))
+            if self._keys is not None:
+                self._keys.add(str(key))
+            if len(self._pending) >= self.commit_every:
+                self._commit()
+
+    def _commit(self):
+        if not self._pending:
+            return
+        self._connection.executemany(
+            "INSERT OR REPLACE INTO checkpoints (key, success, reason) VALUES (?, ?, ?)", self._pending
+        )
+        self._connection.commit()
+        self._pending = []
+
+    def commit(self):
+        with self._lock:
+            self._commit()
+
+    def close(self):
+        with self._lock:
+            if self._connection is None:
+                return
+            self._commit()
+            self._connection.close()
+            self._connection = None
+        atexit.unregister(self.close)
+
+    def import_csv(self, csv_path: str) -> int:
+        """
+        Import the "id, success, reason" lines of a processed ids CSV - each file is only imported once
+        Keys already in the store keep the outcome recorded for them
+        :return: The number of keys imported
+        """
+        path = str(Path(csv_path).resolve())
+        with self._lock:
+            if self._connection.execute("SELECT 1 FROM imported_files WHERE path = ?", (path,)).fetchone():
+                return 0
+        rows = []
+        with open(csv_path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                key, _, outcome = line.rstrip("\n").partition(",")
+                success, _, reason = outcome.partition(",")
+                rows.append((key.strip(), int(success.strip() == "True"), reason.strip()))
+        with self._lock:
+            self._commit()
+            before = self._connection.total_changes
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO checkpoints (key, success, reason) VALUES (?, ?, ?)", rows
+            )
+            imported = self._connection.total_changes - before
+            self._connection.execute("INSERT INTO imported_files (path) VALUES (?)", (path,))
+            self._connection.commit()
+            self._keys = None
+        print(f"Imported {imported} processed keys from {csv_path} into {self.file_path}")
+        return imported
+
+    def status(self, key: str) -> tuple[bool, str] | None:
+        """(success, reason) recorded for a key, or None if it hasn't been processed"""
+        self.commit()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT success, reason FROM checkpoints WHERE key = ?", (str(key),)
+            ).fetchone()
+        return (bool(row[0]), row[1]) if row else None
+
+    def counts(self) -> dict[bool, int]:
+        """Number of keys recorded as succeeded (True) and failed (False)"""
+        self.commit()
+        with self._lock:
+            rows = self._connection.execute("SELECT success, COUNT(*) FROM checkpoints GROUP BY success").fetchall()
+        counts = {True: 0, False: 0}
+        counts.update({bool(success): count for success, count in rows})
+        return counts
+
+    def failed(self) -> Iterator[tuple[str, str]]:
+        """(key, reason) for every key recorded as failed"""
+        self.commit()
+        with self._lock:
+            rows = self._connection.execute("SELECT key, reason FROM checkpoints WHERE success = 0").fetchall()
+        yield from rows
+
+    def resume(self, items: Iterable[T], key: Callable[[T], str], retry_failed: bool = False) -> Iterator[T]:
+        """
+        Skip items that were processed by an earlier run
+        :param items: Every item the job would process
+        :param key: Gets an item's checkpoint key, e.g. lambda asset: asset["id"]
+        :param retry_failed: Also yield items whose earlier attempt failed
+        :return: A generator of the items still to process
+        """
+        skip = set(self._loaded_keys_snapshot())
+        if retry_failed:
+            skip.difference_update(failed_key for failed_key, _ in self.failed())
+        print(f"Resuming from {self.file_path}: skipping {len(skip)} processed keys")
+        for item in items:
+            if str(key(item)) not in skip:
+                yield item
+
+    def _loaded_keys_snapshot(self) -> set[str]:
+        with self._lock:
+            return set(self._loaded_keys())
+
+
+if __name__ == "__main__":
+    # Example usage
+    with CheckpointStore("output/example_checkpoints.sqlite") as _checkpoints:
+        for _id in _checkpoints.resume(range(10), key=str):
+            _checkpoints.record(str(_id), success=_id % 3 != 0, reason="" if _id % 3 else "Divisible by 3")
+        print(_checkpoints.counts())
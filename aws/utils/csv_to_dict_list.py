@@ -1,31 +1,153 @@
 import csv
 import json
+import re
+from datetime import date, datetime
+from typing import Any, Callable, Iterable, Iterator
 
+from dateutil import parser as date_parser
 
-def csv_to_dict_list(file_path: str, is_tsv: bool = False) -> list[dict]:
+# Cells that json.loads could turn into something other than a string - anything else is left as it is
+_JSON_NUMBER = re.compile(r"-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?")
+_JSON_LITERALS = {"true": True, "false": False, "null": None}
+PROP_REF_LENGTH = 8
+
+
+def decode_json_cell(cell: str) -> Any:
     """
-    Load a csv file into a list of dicts - one dict per row
+    The cell decoded as JSON if it looks like JSON, otherwise the cell unchanged
+    Only cells starting like an object, array, string, number or literal are passed to json.loads
+    """
+    if not cell:
+        return cell
+    if cell in _JSON_LITERALS:
+        return _JSON_LITERALS[cell]
+    first = cell[0]
+    if first in "{[\"":
+        try:
+            return json.loads(cell)
+        except json.JSONDecodeError:
+            return cell
+    if (first.isdigit() or first == "-") and _JSON_NUMBER.fullmatch(cell):
+        return json.loads(cell)
+    return cell
+
+
+def pad_prop_ref(prop_ref: Any) -> str:
+    """A property reference with spaces removed and zero padded to 8 characters, e.g. 1234 -> 00001234"""
+    return str(prop_ref).replace(" ", "").zfill(PROP_REF_LENGTH)
+
+
+def pad_prop_refs(prop_refs: Iterable[Any]) -> list[str]:
+    """pad_prop_ref for a whole column in one pass"""
+    # str methods in a comprehension, as numpy's np.char.zfill and np.char.replace are far slower for this
+    return [str(prop_ref).replace(" ", "").zfill(PROP_REF_LENGTH) for prop_ref in prop_refs]
+
+
+def _parse_int(cell: str) -> int | None:
+    return int(cell) if cell.strip() else None
+
+
+def _parse_date(cell: str) -> date | None:
+    if not cell.strip():
+        return None
+    try:
+        return date.fromisoformat(cell)
+    except ValueError:
+        return date_parser.parse(cell, dayfirst=True).date()
+
+
+def _parse_json(cell: str) -> Any:
+    return json.loads(cell) if cell.strip() else None
+
+
+COLUMN_TYPES: dict[str, Callable[[str], Any]] = {
+    "str": str,
+    "int": _parse_int,
+    "json": _parse_json,
+    "date": _parse_date,
+    "prop_ref": pad_prop_ref,
+}
+
+
+def _column_parsers(schema: dict[str, str | Callable[[str], Any]]) -> dict[str, Callable[[str], Any]]:
+    parsers = {}
+    for column, column_type in schema.items():
+        if callable(column_type):
+            parsers[column] = column_type
+        elif column_type in COLUMN_TYPES:
+            parsers[column] = COLUMN_TYPES[column_type]
+        else:
+            raise ValueError(f"Unknown type {column_type} for column {column} - valid types are {list(COLUMN_TYPES)}")
+    return parsers
+
+
+def iter_csv_rows(file_path: str, is_tsv: bool = False, schema: dict[str, str | Callable[[str], Any]] | None = None,
+                  decode_json: bool = True) -> Iterator[dict]:
+    """
+    Read a csv file one row at a time - one dict per row
     Assumes that the first row of the csv file is a header row
-    Tries to decode any json into lists or dicts
     :param file_path: Path to csv file to load
     :param is_tsv: If True, treat file as TSV (tab-separated values) instead of CSV
-    :return: list of a dict for each row in the csv file
+    :param schema: Column name -> type to parse it as, one of COLUMN_TYPES or a function taking the cell string
+        Empty int, date and json cells become None
+    :param decode_json: Decode cells in columns not in the schema if they look like JSON, as csv_to_dict_list does
+    :return: An iterator of a dict for each row in the csv file
     """
-    result_list = []
-    with open(file_path) as file_obj:
+    parsers = _column_parsers(schema or {})
+    with open(file_path, newline="") as file_obj:
         delimiter = "\t" if is_tsv else ","
-        reader = csv.DictReader(file_obj, delimiter=delimiter)
+        reader = csv.reader(file_obj, delimiter=delimiter)
+        headers = next(reader, None)
+        if headers is None:
+            return
+        column_parsers = [parsers.get(header, decode_json_cell if decode_json else None) for header in headers]
         for row in reader:
-            result_list.append(dict(row))
+            if not row:
+                continue
+            if len(row) < len(headers):
+                row += [""] * (len(headers) - len(row))
+            yield {
+                header: (parse(cell) if parse is not None else cell)
+                for header, parse, cell in zip(headers, column_parsers, row)
+            }
+
+
+def count_csv_rows(file_path: str, is_tsv: bool = False) -> int:
+    """Number of rows after the header row, without parsing any cells - e.g. for a progress bar total"""
+    with open(file_path, newline="") as file_obj:
+        reader = csv.reader(file_obj, delimiter="\t" if is_tsv else ",")
+        return max(sum(1 for row in reader if row) - 1, 0)
+
+
+def load_csv_rows(file_path: str, is_tsv: bool = False, schema: dict[str, str | Callable[[str], Any]] | None = None,
+                  decode_json: bool = True) -> list[dict]:
+    """
+    Read a whole csv file into a list of dicts, parsing cells as iter_csv_rows does
+    prop_ref columns are padded a whole column at a time with pad_prop_refs once every row is read
+    """
+    schema = dict(schema or {})
+    prop_ref_columns = [column for column, column_type in schema.items() if column_type == "prop_ref"]
+    for column in prop_ref_columns:
+        schema[column] = "str"
+    rows = list(iter_csv_rows(file_path, is_tsv=is_tsv, schema=schema, decode_json=decode_json))
+    for column in prop_ref_columns:
+        if rows and column in rows[0]:
+            for row, prop_ref in zip(rows, pad_prop_refs(row[column] for row in rows)):
+                row[column] = prop_ref
+    return rows
 
-    for result in result_list:
-        for key in result.keys():
-            try:
-                result[key] = json.loads(result[key])
-            except json.JSONDecodeError:
-                pass
 
-    return result_list
+def csv_to_dict_list(file_path: str, is_tsv: bool = False) -> list[dict]:
+    """
+    Load a csv file into a list of dicts - one dict per row
+    Assumes that the first row of the csv file is a header row
+    Tries to decode any json into lists or dicts
+    Prefer iter_csv_rows for large files - this keeps every row in memory
+    :param file_path: Path to csv file to load
+    :param is_tsv: If True, treat file as TSV (tab-separated values) instead of CSV
+    :return: list of a dict for each row in the csv file
+    """
+    return load_csv_rows(file_path, is_tsv=is_tsv)
 
 
 def dict_list_to_csv_rows(
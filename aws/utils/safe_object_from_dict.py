@@ -1,11 +1,30 @@
-from typing import TypeVar
+from typing import Any, Callable, TypeVar
 
 T = TypeVar("T")
 
+# One generated constructor per class, so the field names are only looked up once
+_constructors: dict[type, Callable[[dict], Any]] = {}
+
+
+def _object_constructor(object_type: type[T]) -> Callable[[dict], T]:
+    """
+    A function that creates an object_type from a dict, passing each field as a keyword argument
+    Fields missing from the dict are passed as None and keys that aren't fields are ignored
+    """
+    constructor = _constructors.get(object_type)
+    if constructor is None:
+        arguments = ", ".join(f"{name}=get({name!r})" for name in object_type.__annotations__)
+        source = f"def construct(data):\n    get = data.get\n    return object_type({arguments})\n"
+        namespace = {"object_type": object_type}
+        exec(source, namespace)
+        constructor = _constructors[object_type] = namespace["construct"]
+    return constructor
+
 
 def safe_object_from_dict(object_type: type[T], data: dict | T) -> T:
     """
     Safely creates an object of the given type from the given dictionary.
+    Keys that aren't fields of the type are ignored and missing fields are set to None - the dictionary isn't changed.
     :param object_type: The type of object to create.
     :param data: The dictionary containing the data to use for creating the object.
     :return: An object of the given type, created from the given dictionary.
@@ -17,14 +36,4 @@ def safe_object_from_dict(object_type: type[T], data: dict | T) -> T:
     if isinstance(data, object_type):
         return data
 
-    for key in list(data.keys()):
-        if key not in object_type.__annotations__.keys():
-            # print(f"WARNING: {key} not in class {object_type.__name__}")
-            del data[key]
-
-    for key in object_type.__annotations__.keys():
-        if key not in data.keys():
-            # print(f"WARNING: {key} from class {object_type.__name__} not in data")
-            data[key] = None
-
-    return object_type(**data)
+    return _object_constructor(object_type)(data)
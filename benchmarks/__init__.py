@@ -0,0 +1,5 @@
+"""
+Benchmarks for the data handling helpers - not used by the scripts
+
+Run one from the repository root, e.g. python -m benchmarks.domain_objects
+"""
@@ -0,0 +1,36 @@
+"""Benchmark deserialize_item against boto3's TypeDeserializer on a synthetic Assets export"""
+
+import json
+import time
+
+from boto3.dynamodb.types import TypeDeserializer
+
+from aws.database.dynamodb.utils.deserializer import deserialize_item
+from benchmarks.synthetic_assets import synthetic_asset_lines
+
+
+def main():
+    type_deserializer = TypeDeserializer()
+    items = [json.loads(line)["Item"] for line in synthetic_asset_lines(20000)]
+
+    start = time.perf_counter()
+    expected = [{key: type_deserializer.deserialize(value) for key, value in item.items()} for item in items]
+    boto3_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = [deserialize_item(item) for item in items]
+    fast_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    _ = [deserialize_item(item, int_numbers=True) for item in items]
+    int_seconds = time.perf_counter() - start
+
+    assert actual == expected, "Deserialised items differ from TypeDeserializer"
+    print(f"{len(items)} assets")
+    print(f"TypeDeserializer:            {boto3_seconds:.2f}s")
+    print(f"deserialize_item:            {fast_seconds:.2f}s ({boto3_seconds / fast_seconds:.1f}x)")
+    print(f"deserialize_item (int):      {int_seconds:.2f}s ({boto3_seconds / int_seconds:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
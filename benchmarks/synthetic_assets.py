@@ -0,0 +1,67 @@
+"""Synthetic DynamoDB export data for the benchmarks"""
+
+import json
+import random
+import uuid
+from decimal import Decimal
+
+from boto3.dynamodb.types import TypeSerializer
+
+
+def synthetic_asset_lines(count: int) -> list[str]:
+    """Export lines shaped like the Assets table - the same lines every time"""
+    serializer = TypeSerializer()
+    rng = random.Random(0)
+    lines = []
+    for i in range(count):
+        asset = {
+            "id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "assetId": f"{i:08d}",
+            "assetType": rng.choice(["Dwelling", "Block", "LettableNonDwelling"]),
+            "rootAsset": "ROOT",
+            "isActive": rng.choice([True, False]),
+            "parentAssetIds": f"ROOT#{rng.randint(0, 99999):08d}",
+            "rentGroup": None,
+            "versionNumber": rng.randint(0, 10),
+            "assetAddress": {
+                "uprn": str(rng.randint(10 ** 10, 10 ** 11)),
+                "addressLine1": f"{rng.randint(1, 200)} Example Road",
+                "addressLine2": "Hackney",
+                "addressLine3": "London",
+                "addressLine4": "",
+                "postCode": "E8 1DY",
+                "postPreamble": "",
+            },
+            "assetCharacteristics": {
+                "numberOfBedrooms": rng.randint(0, 5),
+                "numberOfLifts": 0,
+                "numberOfLivingRooms": 1,
+                "yearConstructed": str(rng.randint(1900, 2020)),
+                "windowType": "DBL",
+                "totalBlockFloors": Decimal("4.5"),
+            },
+            "assetManagement": {
+                "agent": "Hackney Homes",
+                "areaOfficeName": "Area 1",
+                "isCouncilProperty": True,
+                "managingOrganisation": "London Borough of Hackney",
+                "isTMOManaged": False,
+                "propertyOccupiedStatus": "Occupied",
+            },
+            "assetLocation": {
+                "floorNo": str(rng.randint(0, 20)),
+                "totalBlockFloors": rng.randint(1, 20),
+                "parentAssets": [{"id": str(uuid.UUID(int=rng.getrandbits(128))), "name": "Block",
+                                  "type": "Block"}],
+            },
+            "tenure": {
+                "id": str(uuid.UUID(int=rng.getrandbits(128))),
+                "paymentReference": str(rng.randint(10 ** 9, 10 ** 10)),
+                "startOfTenureDate": "2010-01-01T00:00:00",
+                "endOfTenureDate": None,
+                "type": "Secure",
+            },
+        }
+        item = {key: serializer.serialize(value) for key, value in asset.items()}
+        lines.append(json.dumps({"Item": item}))
+    return lines
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from aws.database.dynamodb.utils.asset_frame import IS_ACTIVE_ABSENT, IS_ACTIVE_NULL, AssetFrame
+
+TODAY = np.datetime64("2024-06-15", "D")
+
+
+def asset(asset_id: str, tenure: dict | None, **attributes) -> dict:
+    return {"id": asset_id, "assetType": "Dwelling", "tenure": tenure, **attributes}
+
+
+def is_active(*assets: dict) -> list[bool]:
+    return AssetFrame.from_items(assets).compute_is_active(TODAY).tolist()
+
+
+def test_assets_without_a_tenure_are_inactive():
+    assert is_active(asset("1", None), {"id": "2"}) == [False, False]
+
+
+def test_open_tenures_are_active():
+    assert is_active(asset("1", {"id": "t1"}), asset("2", {"id": "t2", "endOfTenureDate": None})) == [True, True]
+
+
+def test_tenures_ending_before_today_are_inactive():
+    assets = [
+        asset("1", {"id": "t1", "endOfTenureDate": "2024-06-14"}),
+        asset("2", {"id": "t2", "endOfTenureDate": "2024-06-15T00:00:00Z"}),
+        asset("3", {"id": "t3", "endOfTenureDate": "2030-01-01"}),
+    ]
+
+    assert is_active(*assets) == [False, True, True]
+
+
+def test_unparseable_end_dates_are_compared_as_text():
+    assets = [
+        asset("1", {"id": "t1", "endOfTenureDate": ""}),
+        asset("2", {"id": "t2", "endOfTenureDate": "2024-02-30"}),
+        asset("3", {"id": "t3", "endOfTenureDate": "9999-99-99"}),
+        asset("4", {"id": "t4", "endOfTenureDate": "not a date"}),
+        asset("5", {"id": "t5", "endOfTenureDate": 20300101}),
+    ]
+
+    assert is_active(*assets) == [False, False, True, True, False]
+
+
+def test_changed_rows_include_missing_is_active_values():
+    assets = [
+        asset("1", {"id": "t1"}, isActive=True),
+        asset("2", {"id": "t2"}, isActive=False),
+        asset("3", None, isActive=None),
+        asset("4", None),
+    ]
+    frame = AssetFrame.from_items(assets)
+
+    assert frame["isActive"].tolist() == [1, 0, IS_ACTIVE_NULL, IS_ACTIVE_ABSENT]
+    assert frame.ids(frame.changed_rows("isActive", frame.compute_is_active(TODAY))) == ["2", "3", "4"]
+
+
+def test_keep_items_predicate_only_keeps_matching_items():
+    assets = [asset("1", {"id": "t1"}), asset("2", None), asset("3", {"id": "t3"})]
+    frame = AssetFrame.from_items(assets, keep_items=lambda item: item["tenure"] is not None)
+
+    assert frame.items(np.array([0, 2])) == [assets[0], assets[2]]
+    with pytest.raises(ValueError, match="Items weren't kept for 1 of the rows"):
+        frame.items(np.array([1]))
+
+
+def test_items_needs_keep_items():
+    frame = AssetFrame.from_items([asset("1", None)])
+
+    with pytest.raises(ValueError, match="build the frame with keep_items"):
+        frame.items(np.array([0]))
+
+
+def test_category_mask_matches_values_and_missing():
+    frame = AssetFrame.from_items([asset("1", None), {"id": "2", "assetType": "Block"}, {"id": "3"}])
+
+    assert frame.category_mask("assetType", "Block", None).tolist() == [False, True, True]
+    assert frame.decode("assetType") == ["Dwelling", "Block", None]
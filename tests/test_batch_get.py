@@ -0,0 +1,89 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+from botocore.exceptions import ClientError
+
+from aws.database.dynamodb.utils.batch_get import batch_get
+
+
+class StubClient:
+    """Serves items from a dict, leaving the last unprocessed_per_call[i] keys of call i in UnprocessedKeys"""
+
+    def __init__(self, items: dict[str, dict], unprocessed_per_call: list[int] | None = None,
+                 throttle_calls: int = 0):
+        self.items = items
+        self.unprocessed_per_call = list(unprocessed_per_call or [])
+        self.throttle_calls = throttle_calls
+        self.calls: list[dict] = []
+        self._lock = threading.Lock()
+
+    def batch_get_item(self, RequestItems: dict, **kwargs):
+        (table_name, request), = RequestItems.items()
+        with self._lock:
+            self.calls.append(request)
+            if self.throttle_calls:
+                self.throttle_calls -= 1
+                raise ClientError({"Error": {"Code": "ThrottlingException"}}, "BatchGetItem")
+            unprocessed_count = self.unprocessed_per_call.pop(0) if self.unprocessed_per_call else 0
+        keys = request["Keys"]
+        processed, unprocessed = keys[:len(keys) - unprocessed_count], keys[len(keys) - unprocessed_count:]
+        response = {"Responses": {table_name: [self.items[key["id"]] for key in processed if key["id"] in self.items]}}
+        if unprocessed:
+            response["UnprocessedKeys"] = {table_name: dict(request, Keys=unprocessed)}
+        return response
+
+
+def stub_table(client: StubClient):
+    return SimpleNamespace(name="Assets", key_schema=[{"AttributeName": "id"}], meta=SimpleNamespace(client=client))
+
+
+def test_unprocessed_keys_are_retried():
+    items = {str(i): {"id": str(i)} for i in range(5)}
+    client = StubClient(items, unprocessed_per_call=[3, 1])
+
+    results = batch_get(stub_table(client), [{"id": str(i)} for i in range(5)], base_delay=0)
+
+    assert results == items
+    assert [len(call["Keys"]) for call in client.calls] == [5, 3, 1]
+
+
+def test_throttled_requests_are_retried():
+    client = StubClient({"a": {"id": "a"}}, throttle_calls=2)
+
+    assert batch_get(stub_table(client), [{"id": "a"}], base_delay=0) == {"a": {"id": "a"}}
+    assert len(client.calls) == 3
+
+
+def test_keys_still_unprocessed_after_max_retries_raise():
+    client = StubClient({"a": {"id": "a"}}, unprocessed_per_call=[1, 1, 1])
+
+    with pytest.raises(RuntimeError, match="1 keys from Assets still unprocessed after 2 retries"):
+        batch_get(stub_table(client), [{"id": "a"}], max_retries=2, base_delay=0)
+
+
+def test_missing_keys_are_left_out_and_duplicates_fetched_once():
+    client = StubClient({"a": {"id": "a"}})
+
+    results = batch_get(stub_table(client), [{"id": "a"}, {"id": "a"}, {"id": "missing"}])
+
+    assert results == {"a": {"id": "a"}}
+    assert client.calls[0]["Keys"] == [{"id": "a"}, {"id": "missing"}]
+
+
+def test_keys_are_split_into_batches_of_100():
+    client = StubClient({str(i): {"id": str(i)} for i in range(250)})
+
+    results = batch_get(stub_table(client), [{"id": str(i)} for i in range(250)])
+
+    assert len(results) == 250
+    assert sorted(len(call["Keys"]) for call in client.calls) == [50, 100, 100]
+
+
+def test_projection_always_includes_the_key():
+    client = StubClient({"a": {"id": "a"}})
+
+    batch_get(stub_table(client), [{"id": "a"}], projection_expression="#t", expression_attribute_names={"#t": "type"})
+
+    assert client.calls[0]["ProjectionExpression"] == "#t, #batch_get_key0"
+    assert client.calls[0]["ExpressionAttributeNames"] == {"#t": "type", "#batch_get_key0": "id"}
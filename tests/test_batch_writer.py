@@ -0,0 +1,102 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+from botocore.exceptions import ClientError
+
+from aws.database.dynamodb.utils.batch_writer import BatchWriter
+
+
+class StubClient:
+    """Returns the first unprocessed_per_call[i] requests of call i as UnprocessedItems"""
+
+    def __init__(self, unprocessed_per_call: list[int] | None = None, throttle_calls: int = 0):
+        self.unprocessed_per_call = list(unprocessed_per_call or [])
+        self.throttle_calls = throttle_calls
+        self.calls: list[list[dict]] = []
+        self._lock = threading.Lock()
+
+    def batch_write_item(self, RequestItems: dict, **kwargs):
+        (table_name, requests), = RequestItems.items()
+        with self._lock:
+            self.calls.append(requests)
+            if self.throttle_calls:
+                self.throttle_calls -= 1
+                raise ClientError({"Error": {"Code": "ProvisionedThroughputExceededException"}}, "BatchWriteItem")
+            unprocessed_count = self.unprocessed_per_call.pop(0) if self.unprocessed_per_call else 0
+        if not unprocessed_count:
+            return {"UnprocessedItems": {}}
+        return {"UnprocessedItems": {table_name: requests[:unprocessed_count]}}
+
+
+def stub_table(client: StubClient):
+    return SimpleNamespace(name="Assets", key_schema=[{"AttributeName": "id"}], meta=SimpleNamespace(client=client))
+
+
+def written_ids(client: StubClient) -> list[str]:
+    return [request["PutRequest"]["Item"]["id"] for requests in client.calls for request in requests]
+
+
+def test_unprocessed_items_are_retried_until_written():
+    client = StubClient(unprocessed_per_call=[3, 1])
+    reports = []
+
+    with BatchWriter(stub_table(client), on_batch=lambda keys, success, reason: reports.append((keys, success)),
+                     max_workers=1, base_delay=0) as writer:
+        for i in range(5):
+            writer.put({"id": str(i)})
+
+    assert [len(requests) for requests in client.calls] == [5, 3, 1]
+    assert client.calls[2] == client.calls[0][:1]
+    assert writer.written_count == 5
+    assert writer.failed_count == 0
+    assert all(success for _, success in reports)
+    assert sorted(key["id"] for keys, _ in reports for key in keys) == ["0", "1", "2", "3", "4"]
+
+
+def test_items_still_unprocessed_after_max_retries_are_reported_as_failed():
+    client = StubClient(unprocessed_per_call=[2, 2, 2])
+    failures = []
+
+    with BatchWriter(stub_table(client), max_workers=1, max_retries=2, base_delay=0,
+                     on_batch=lambda keys, success, reason: failures.extend(keys) if not success else None) as writer:
+        for i in range(4):
+            writer.put({"id": str(i)})
+
+    assert len(client.calls) == 3
+    assert writer.written_count == 2
+    assert writer.failed_count == 2
+    assert failures == [{"id": "0"}, {"id": "1"}]
+
+
+def test_throttled_batches_are_resubmitted():
+    client = StubClient(throttle_calls=2)
+
+    with BatchWriter(stub_table(client), max_workers=1, base_delay=0) as writer:
+        writer.put({"id": "a"})
+
+    assert written_ids(client) == ["a", "a", "a"]
+    assert writer.written_count == 1
+
+
+def test_only_the_latest_request_per_key_is_written():
+    client = StubClient()
+
+    with BatchWriter(stub_table(client), max_workers=1) as writer:
+        writer.put({"id": "a", "value": 1})
+        writer.put({"id": "a", "value": 2})
+
+    assert client.calls == [[{"PutRequest": {"Item": {"id": "a", "value": 2}}}]]
+
+
+def test_flush_raises_an_error_from_on_batch():
+    def on_batch(keys, success, reason):
+        raise RuntimeError("Callback failed")
+
+    writer = BatchWriter(stub_table(StubClient()), on_batch=on_batch, max_workers=1)
+    writer.put({"id": "a"})
+
+    with pytest.raises(RuntimeError, match="Callback failed"):
+        writer.flush()
+    # The error is only raised once
+    writer.close()
@@ -0,0 +1,47 @@
+import pytest
+
+from aws.utils.checkpoint_store import CheckpointStore
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    return str(tmp_path / "checkpoints" / "processed_ids.sqlite")
+
+
+def test_resume_skips_keys_recorded_by_an_earlier_run(store_path):
+    with CheckpointStore(store_path) as checkpoints:
+        checkpoints.record("a", True)
+        checkpoints.record("b", False, "Has no root asset")
+
+    with CheckpointStore(store_path) as checkpoints:
+        remaining = list(checkpoints.resume([{"id": "a"}, {"id": "b"}, {"id": "c"}], key=lambda item: item["id"]))
+
+    assert remaining == [{"id": "c"}]
+
+
+def test_resume_can_retry_failed_keys(store_path):
+    with CheckpointStore(store_path) as checkpoints:
+        checkpoints.record("a", True)
+        checkpoints.record("b", False, "Throttled")
+        remaining = list(checkpoints.resume(["a", "b", "c"], key=str, retry_failed=True))
+
+    assert remaining == ["b", "c"]
+
+
+def test_resume_sees_records_that_are_not_committed_yet(store_path):
+    with CheckpointStore(store_path, commit_every=1000) as checkpoints:
+        checkpoints.record("1", True)
+        assert list(checkpoints.resume([1, 2], key=str)) == [2]
+
+
+def test_resume_imports_a_legacy_csv_once(store_path, tmp_path):
+    legacy_csv = tmp_path / "processed_ids.csv"
+    legacy_csv.write_text("\na, True, \nb, False, Has no root asset - required field\n")
+
+    with CheckpointStore(store_path, legacy_csv=str(legacy_csv)) as checkpoints:
+        assert list(checkpoints.resume(["a", "b", "c"], key=str)) == ["c"]
+        assert checkpoints.status("b") == (False, "Has no root asset - required field")
+        checkpoints.record("b", True)
+
+    with CheckpointStore(store_path, legacy_csv=str(legacy_csv)) as checkpoints:
+        assert checkpoints.status("b") == (True, "")
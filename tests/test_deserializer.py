@@ -0,0 +1,51 @@
+from decimal import Decimal
+
+from boto3.dynamodb.types import Binary, TypeDeserializer
+
+from aws.database.dynamodb.utils.deserializer import deserialize_item, deserialize_value
+
+ASSET_ITEM = {
+    "id": {"S": "656feda1-b2b5-4f7a-a8b5-2f5a9e7c0b7a"},
+    "assetId": {"S": "00012345"},
+    "versionNumber": {"N": "3"},
+    "isActive": {"BOOL": True},
+    "parentAssetIds": {"NULL": True},
+    "assetLocation": {"M": {"floorNo": {"S": "2"}, "totalBlockFloors": {"N": "12"}, "parentAssets": {"L": []}}},
+    "assetCharacteristics": {"M": {"numberOfBedrooms": {"N": "2"}, "areaSquareMetres": {"N": "54.5"}}},
+    "legacyReferences": {"L": [{"M": {"name": {"S": "uh_tag_ref"}, "value": {"S": "00012345"}}}]},
+    "tags": {"SS": ["a", "b"]},
+    "floors": {"NS": ["1", "2.5"]},
+    "thumbnail": {"B": b"\x00\x01"},
+}
+
+
+def test_matches_type_deserializer():
+    type_deserializer = TypeDeserializer()
+
+    assert deserialize_item(ASSET_ITEM) == {key: type_deserializer.deserialize(value)
+                                            for key, value in ASSET_ITEM.items()}
+
+
+def test_sets_and_binary_nested_in_maps_and_lists_fall_back_to_type_deserializer():
+    value = {"L": [{"M": {"tags": {"SS": ["a"]}, "data": {"BS": [b"\x01"]}}}]}
+
+    assert deserialize_value(value) == [{"tags": {"a"}, "data": {Binary(b"\x01")}}]
+
+
+def test_numbers_are_decimal_by_default():
+    number = deserialize_value({"N": "3"})
+
+    assert number == Decimal("3")
+    assert isinstance(number, Decimal)
+
+
+def test_int_numbers_returns_whole_numbers_as_int():
+    item = deserialize_item(ASSET_ITEM, int_numbers=True)
+
+    assert item["versionNumber"] == 3
+    assert type(item["versionNumber"]) is int
+    assert type(item["assetLocation"]["totalBlockFloors"]) is int
+    assert item["assetCharacteristics"]["areaSquareMetres"] == Decimal("54.5")
+    assert deserialize_value({"N": "1E+2"}, int_numbers=True) == Decimal("1E+2")
+    # Sets are left to TypeDeserializer, so their numbers stay Decimal
+    assert item["floors"] == {Decimal("1"), Decimal("2.5")}
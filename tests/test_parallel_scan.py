@@ -0,0 +1,93 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from aws.database.dynamodb.utils.parallel_scan import ParallelScanner, parallel_scan
+
+
+class StubTable:
+    """Splits items across segments by index, serving each segment's items page_size at a time"""
+
+    def __init__(self, items: list[dict], page_size: int = 2, failing_segment: int | None = None):
+        self.name = "Assets"
+        self.items = items
+        self.page_size = page_size
+        self.failing_segment = failing_segment
+        self.calls: list[dict] = []
+        self._lock = threading.Lock()
+
+    def scan(self, **kwargs):
+        with self._lock:
+            self.calls.append(kwargs)
+        segment, total_segments = kwargs["Segment"], kwargs["TotalSegments"]
+        if segment == self.failing_segment:
+            raise RuntimeError(f"Segment {segment} failed")
+        segment_items = self.items[segment::total_segments]
+        start = kwargs.get("ExclusiveStartKey", {}).get("index", 0)
+        page = segment_items[start:start + self.page_size]
+        response = {"Items": page}
+        if start + self.page_size < len(segment_items):
+            response["LastEvaluatedKey"] = {"index": start + self.page_size}
+        return response
+
+
+def quiet_logger():
+    return SimpleNamespace(log=lambda message: None)
+
+
+def test_every_item_is_scanned_once_across_segments():
+    items = [{"id": str(i)} for i in range(11)]
+    table = StubTable(items)
+
+    scanned = list(parallel_scan(table, total_segments=3, logger=quiet_logger(), ProjectionExpression="id"))
+
+    assert sorted(item["id"] for item in scanned) == sorted(item["id"] for item in items)
+    assert {call["TotalSegments"] for call in table.calls} == {3}
+    assert {call["Segment"] for call in table.calls} == {0, 1, 2}
+    assert all(call["ProjectionExpression"] == "id" for call in table.calls)
+
+
+def test_each_segment_pages_with_its_own_last_evaluated_key():
+    table = StubTable([{"id": str(i)} for i in range(10)], page_size=2)
+    scanner = ParallelScanner(table, total_segments=2, logger=quiet_logger())
+
+    pages = list(scanner.pages())
+
+    # 5 items per segment in pages of 2
+    assert sorted(len(items) for _, items in pages) == [1, 1, 2, 2, 2, 2]
+    for segment in (0, 1):
+        start_keys = [call.get("ExclusiveStartKey") for call in table.calls if call["Segment"] == segment]
+        assert start_keys == [None, {"index": 2}, {"index": 4}]
+        assert scanner.stats[segment].items == 5
+        assert scanner.stats[segment].pages == 3
+        assert scanner.stats[segment].finished is not None
+
+
+def test_pages_are_tagged_with_their_segment():
+    items = [{"id": str(i)} for i in range(6)]
+    scanner = ParallelScanner(StubTable(items, page_size=10), total_segments=3, logger=quiet_logger())
+
+    pages = dict(scanner.pages())
+
+    assert pages == {segment: items[segment::3] for segment in range(3)}
+
+
+def test_page_limit_is_passed_as_limit():
+    table = StubTable([{"id": "a"}])
+
+    list(parallel_scan(table, total_segments=1, page_limit=50, logger=quiet_logger()))
+
+    assert table.calls[0]["Limit"] == 50
+
+
+def test_a_failing_segment_raises_from_the_consumer():
+    table = StubTable([{"id": str(i)} for i in range(4)], failing_segment=1)
+
+    with pytest.raises(RuntimeError, match="Segment 1 failed"):
+        list(parallel_scan(table, total_segments=2, logger=quiet_logger()))
+
+
+def test_total_segments_must_be_positive():
+    with pytest.raises(ValueError):
+        ParallelScanner(StubTable([]), total_segments=0)
@@ -0,0 +1,65 @@
+import pytest
+
+from aws.database.dynamodb.utils.partial_update import build_partial_update
+
+
+def test_unchanged_item_has_no_update():
+    item = {"id": "1", "versionNumber": 3, "tenure": {"id": "t1"}}
+    assert build_partial_update(item, {"id": "1", "versionNumber": 3, "tenure": {"id": "t1"}}) is None
+
+
+def test_nested_changes_set_and_remove_only_the_changed_paths():
+    original = {"id": "1", "versionNumber": 3, "tenure": {"id": "t1", "endOfTenureDate": "2020-01-01", "type": "S"}}
+    modified = {"id": "1", "versionNumber": 3, "tenure": {"id": "t2", "type": "S"}}
+
+    update = build_partial_update(original, modified)
+
+    names = update["ExpressionAttributeNames"]
+    values = update["ExpressionAttributeValues"]
+    set_part, remove_part = update["UpdateExpression"].split(" REMOVE ")
+    set_actions = dict(action.split(" = ") for action in set_part.removeprefix("SET ").split(", "))
+    resolved = {".".join(names[name] for name in path.split(".")): values[value] for path, value in set_actions.items()}
+    assert resolved == {"tenure.id": "t2", "versionNumber": 4}
+    assert ".".join(names[name] for name in remove_part.split(".")) == "tenure.endOfTenureDate"
+
+
+def test_lists_are_replaced_whole():
+    original = {"id": "1", "legacyReferences": [{"name": "uh_tag_ref", "value": "a"}]}
+    modified = {"id": "1", "legacyReferences": [{"name": "uh_tag_ref", "value": "b"}]}
+
+    update = build_partial_update(original, modified, version_attribute=None)
+
+    assert update["UpdateExpression"] == "SET #n0 = :v0"
+    assert update["ExpressionAttributeNames"] == {"#n0": "legacyReferences"}
+    assert update["ExpressionAttributeValues"] == {":v0": modified["legacyReferences"]}
+    assert "ConditionExpression" not in update
+
+
+def test_version_condition_matches_the_original_version():
+    update = build_partial_update({"id": "1", "versionNumber": 7, "a": 1}, {"id": "1", "versionNumber": 7, "a": 2})
+
+    version = next(name for name, attribute in update["ExpressionAttributeNames"].items()
+                   if attribute == "versionNumber")
+    assert update["ConditionExpression"] == f"{version} = :original_version"
+    assert update["ExpressionAttributeValues"][":original_version"] == 7
+    assert f"{version} = " in update["UpdateExpression"]
+
+
+def test_version_condition_allows_a_missing_or_null_version():
+    update = build_partial_update({"id": "1", "a": 1}, {"id": "1", "a": 2})
+
+    assert update["ConditionExpression"] == "attribute_not_exists(#n1) OR #n1 = :null_version"
+    assert update["ExpressionAttributeNames"]["#n1"] == "versionNumber"
+    assert update["ExpressionAttributeValues"][":null_version"] is None
+
+
+def test_version_set_by_the_modified_item_is_not_incremented_again():
+    update = build_partial_update({"id": "1", "versionNumber": 1, "a": 1}, {"id": "1", "versionNumber": 5, "a": 1})
+
+    assert list(update["ExpressionAttributeValues"].values()).count(5) == 1
+    assert 2 not in update["ExpressionAttributeValues"].values()
+
+
+def test_changing_the_key_raises():
+    with pytest.raises(ValueError):
+        build_partial_update({"id": "1"}, {"id": "2"})
@@ -0,0 +1,64 @@
+import json
+import math
+from decimal import Decimal
+
+from aws.database.domain.dynamo_domain_objects import TenuredAsset
+from aws.database.domain.dynamo_views import AssetView
+from aws.database.domain.sanitise_item import sanitise_for_dynamodb, sanitise_for_elasticsearch
+
+
+def test_none_values_are_removed_from_maps_and_lists():
+    item = {"id": "1", "endOfTenureDate": None, "tenure": {"id": None, "type": "S"}, "refs": ["a", None]}
+
+    assert sanitise_for_dynamodb(item) == {"id": "1", "tenure": {"type": "S"}, "refs": ["a"]}
+
+
+def test_boolean_strings_become_booleans_in_any_case():
+    item = {"a": "true", "b": "FALSE", "c": "True", "d": "truest", "e": "yes"}
+
+    assert sanitise_for_dynamodb(item) == {"a": True, "b": False, "c": True, "d": "truest", "e": "yes"}
+
+
+def test_floats_become_decimals_for_dynamodb():
+    sanitised = sanitise_for_dynamodb({"area": 54.5, "count": 2, "flag": True, "rate": Decimal("0.1")})
+
+    assert sanitised == {"area": Decimal("54.5"), "count": 2, "flag": True, "rate": Decimal("0.1")}
+    assert type(sanitised["count"]) is int
+    assert type(sanitised["flag"]) is bool
+
+
+def test_decimals_become_ints_or_floats_for_elasticsearch():
+    sanitised = sanitise_for_elasticsearch({"versionNumber": Decimal("3"), "area": Decimal("54.5"), "ratio": 0.5})
+
+    assert sanitised == {"versionNumber": 3, "area": 54.5, "ratio": 0.5}
+    assert type(sanitised["versionNumber"]) is int
+    json.dumps(sanitised)
+
+
+def test_infinite_and_nan_decimals_become_floats():
+    sanitised = sanitise_for_elasticsearch({"high": Decimal("Infinity"), "low": Decimal("-Infinity"),
+                                            "unknown": Decimal("NaN")})
+
+    assert sanitised["high"] == math.inf
+    assert sanitised["low"] == -math.inf
+    assert math.isnan(sanitised["unknown"])
+
+
+def test_tuples_and_sets_are_sanitised():
+    assert sanitise_for_dynamodb({"t": (1.5, None), "s": {"false", "x"}}) == {"t": [Decimal("1.5")], "s": {False, "x"}}
+
+
+def test_dataclasses_become_dicts_without_none_fields():
+    asset = TenuredAsset(id="1", fullAddress="1 Street", propertyReference=None, uprn="true", type=None)
+
+    assert sanitise_for_dynamodb({"tenuredAsset": asset}) == {"tenuredAsset": {"id": "1", "fullAddress": "1 Street",
+                                                                               "uprn": True}}
+
+
+def test_views_are_sanitised_from_their_raw_item_which_is_left_unchanged():
+    raw = {"id": "1", "assetId": "00012345", "parentAssetIds": None, "assetLocation": {"floorNo": 2.0}}
+    view = AssetView(raw)
+
+    assert sanitise_for_dynamodb(view) == {"id": "1", "assetId": "00012345",
+                                           "assetLocation": {"floorNo": Decimal("2.0")}}
+    assert raw == {"id": "1", "assetId": "00012345", "parentAssetIds": None, "assetLocation": {"floorNo": 2.0}}